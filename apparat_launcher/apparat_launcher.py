@@ -17,34 +17,48 @@ if sys.version_info >= (3, 0):
     sys.exit(1)
 
 else: # python 2.x
+    import startup_profiler             # --profile-startup: timestamps the startup phases
+
+    ## remote control client - forward --toggle/--show/--query to a running instance before loading wx & co
+    import remote_control
+    if remote_control.run_client(sys.argv):
+        sys.exit(0)
+    startup_profiler.mark('remote control client')
+
     ## general
-    import difflib                      # for intelligent list sort
     import fnmatch                      # for searching applications
     import os                           # for searching applications
     import platform                     # check platform & linux distribution
     import webbrowser                   # for opening urls (example: github project page)
-    import subprocess                   # for checking if cmd_exists
+    startup_profiler.mark('import stdlib modules')
     import wx                           # for all the WX GUI items
-    import xdg                          # for icon & icon-theme handling
-    import xdg.IconTheme                # for icon & icon-theme handling
+    startup_profiler.mark('import wx')
+    import psutil                       # process table (used by process_index) - imported here to profile it separately # pylint:disable=unused-import
+    startup_profiler.mark('import psutil')
 
     ## apparat
+    import bitmap_cache                 # decoded bitmaps (gfx assets & app icons)
     import constants                    # contains some constants
+    import desktop_index                # in-memory catalogue of all applications (.desktop files)
+    import executable_index             # in-memory index of all executables in $PATH
+    import icon_resolver                # in-memory index of the icon theme
     import ini                          # ini file handling
-    import prefs                        # preference window
-    import plugin_core
-    import plugin_kill
-    import plugin_misc
-    import plugin_nautilus
-    import plugin_passwordgen
-    import plugin_screenshot
-    import plugin_search_internet
-    import plugin_search_local
-    import plugin_session
-    import plugin_shell
+    import launch_history               # frecency of executed commands
+    import latency_stats                # per-keystroke latency histograms
+    import launcher                     # starts & reaps the launched programs
+    import process_index                # snapshot of the process table
+    import query_learning               # learned query -> result associations
+    import plugin_dispatcher            # routes user input to the plugins
+    import plugin_registry              # plugin manifest - plugins are imported on first use
+    import scoring                      # ranking of search results
+    import search_cache                 # memoizes recent search results
+    import search_scheduler             # debounced background search
     import tools                        # contains helper-tools
+    import trigram_index                # substring index (short queries match word starts)
     import tray_icon                    # tray icon and menu
+    import usage_statistics             # statistics counters
     import version                      # defines the appat version
+    startup_profiler.mark('import apparat modules')
 
 
 # -----------------------------------------------------------------------------------------------
@@ -53,6 +67,7 @@ else: # python 2.x
 is_combobox_open = 0
 is_resetted = True
 icon_size = 128
+PATH_PARAMETER_PLUGINS = ('Plugin: Content Search', 'Plugin: Local Search', 'Plugin: Misc (Open)', 'Plugin: Nautilus (GoTo)') # their parameter is a single path (might contain spaces)
 
 # -----------------------------------------------------------------------------------------------
 # MAIN
@@ -67,13 +82,28 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
 
     def __init__(self, parent, title): # pylint:disable=too-many-statements
         """Initialize the MainWindow"""
-        ## Update Statistics (ini) - Apparat launched
-        tools.debug_output(__name__, '__init__', 'Updating statistics (apparat_started)', 1)
-        cur_app_start_count = ini.read_single_ini_value('Statistics', 'apparat_started') # get current value from ini
-        ini.write_single_ini_value('Statistics', 'apparat_started', int(cur_app_start_count)+1) # update ini +1
+        ## Update Statistics - Apparat launched (kept in memory, written to ini in batches)
+        usage_statistics.increment('apparat_started')
+        usage_statistics.start_flush_timer()
+
+        ## keep the executable index fresh in the background
+        executable_index.start_watcher()
+        desktop_index.start_watcher()
+        process_index.refresh_in_background() # first snapshot for the "already running" check
+        remote_control.start_server(lambda command, argument: wx.CallAfter(self.on_remote_command, command, argument))
+        icon_resolver.start_watcher(int(ini.read_single_ini_value('General', 'icon_size'))) # builds the icon index in the background
+        self.executable_search_session = search_cache.QuerySession(min_narrow_length=trigram_index.GRAM_LENGTH) # shorter queries match word starts only - no narrowing
+        self.executable_query = '' # query of the last executable search - the user's choice gets learned for it
+        self.chosen_result = None # result picked from the dropdown - searching it keeps the typed query in executable_query
+        self.keystroke_time = None # timer value of the last search-changing keystroke - for the end-to-end latency
+
+        ## searches run debounced on a worker thread - the UI thread only applies the latest result
+        self.search_scheduler = search_scheduler.SearchScheduler(ini.read_int_ini_value('General', 'search_debounce'))
+        startup_profiler.mark('frame: background services')
 
         global icon_size
         icon_size = ini.read_single_ini_value('General', 'icon_size') # update preference value
+        ini.register_change_callback(self.on_ini_value_changed) # keep cached preference values up-to-date
 
         ## Define the style of the frame
         main_ui_style = (wx.MINIMIZE_BOX | wx.CLIP_CHILDREN | wx.NO_BORDER | wx.FRAME_SHAPED | wx.FRAME_NO_TASKBAR) # wx.NO_BORDER = no window decoration & not moveable
@@ -89,17 +119,18 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
 
         # color of main window
         self.SetBackgroundColour(wx.Colour(237, 237, 237))
+        startup_profiler.mark('frame: wx.Frame & tray icon')
 
         ## Define UI Elements
         ##
         ## Some general bitmaps which might be needed for some button states
-        self.ui__bt_img_search = wx.Bitmap('gfx/core/'+icon_size+'/search.png', wx.BITMAP_TYPE_PNG)
-        self.ui__bt_img_blank = wx.Bitmap('gfx/core/'+icon_size+'/blank.png', wx.BITMAP_TYPE_PNG)
-        self.ui__bt_img_execute_black = wx.Bitmap('gfx/core/'+icon_size+'/execute_black.png', wx.BITMAP_TYPE_PNG)
-        self.ui__bt_img_appicon = wx.Bitmap('gfx/core/'+icon_size+'/appIcon.png', wx.BITMAP_TYPE_PNG)
+        self.ui__bt_img_search = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/search.png')
+        self.ui__bt_img_blank = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/blank.png')
+        self.ui__bt_img_execute_black = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute_black.png')
+        self.ui__bt_img_appicon = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/appIcon.png')
 
         ## Button: status
-        self.ui__bt_status_img = wx.Bitmap('gfx/core/16/blank.png', wx.BITMAP_TYPE_PNG)
+        self.ui__bt_status_img = bitmap_cache.get_bitmap('gfx/core/16/blank.png')
         self.ui__bt_status = wx.BitmapButton(self, id=wx.ID_ANY, style=wx.NO_BORDER, bitmap=self.ui__bt_status_img, size=(self.ui__bt_status_img.GetWidth()+16, self.ui__bt_status_img.GetHeight()+16))
         self.ui__bt_status.SetBitmapFocus(wx.NullBitmap)
         self.ui__bt_status.SetBitmapHover(wx.NullBitmap)
@@ -116,8 +147,8 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         self.ui__txt_plugin_information.SetBackgroundColour(wx.Colour(237, 237, 237))
 
         ## Button: Preferences
-        self.ui__bt_prefs_img = wx.Bitmap('gfx/core/16/prefs.png', wx.BITMAP_TYPE_PNG)
-        self.ui__bt_prefs_img_focus = wx.Bitmap('gfx/core/16/prefs_black.png', wx.BITMAP_TYPE_PNG) # #c0392b
+        self.ui__bt_prefs_img = bitmap_cache.get_bitmap('gfx/core/16/prefs.png')
+        self.ui__bt_prefs_img_focus = bitmap_cache.get_bitmap('gfx/core/16/prefs_black.png') # #c0392b
         self.ui__bt_prefs = wx.BitmapButton(self, id=wx.ID_ANY, style=wx.NO_BORDER, bitmap=self.ui__bt_prefs_img, size=(self.ui__bt_prefs_img.GetWidth()+16, self.ui__bt_prefs_img.GetHeight()+16))
         self.ui__bt_prefs.SetBitmapFocus(self.ui__bt_prefs_img_focus)
         self.ui__bt_prefs.SetBitmapHover(self.ui__bt_prefs_img_focus)
@@ -142,21 +173,21 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         self.ui__cb_search.SetLabel('Search')
 
         ## Button: command
-        self.ui__bt_command_img = wx.Image('gfx/core/'+icon_size+'/blank.png', wx.BITMAP_TYPE_PNG)
+        self.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/blank.png')
         self.ui__bt_command = wx.BitmapButton(self, wx.ID_ANY, wx.NullBitmap, wx.DefaultPosition, wx.Size(300, 300), wx.BU_AUTODRAW)
         self.ui__bt_command.SetBitmapHover(wx.NullBitmap)
         self.ui__bt_command.SetBitmapDisabled(self.ui__bt_img_appicon)
-        self.ui__bt_command.SetBitmap(self.ui__bt_command_img.ConvertToBitmap())
+        self.ui__bt_command.SetBitmap(self.ui__bt_command_img)
         self.ui__bt_command.SetLabel('Applications')
         self.ui__bt_command.Enable(False)
 
         ## Button: parameter
-        self.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/blank.png', wx.BITMAP_TYPE_PNG)
+        self.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/blank.png')
         self.ui__bt_parameter = wx.BitmapButton(self, wx.ID_ANY, wx.NullBitmap, wx.DefaultPosition, wx.Size(300, 300), wx.BU_AUTODRAW)
         self.ui__bt_parameter.SetBitmapFocus(self.ui__bt_img_execute_black) # image when in focus
         self.ui__bt_parameter.SetBitmapHover(wx.NullBitmap) # image on hover
         self.ui__bt_parameter.SetBitmapDisabled(self.ui__bt_img_search)
-        self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img.ConvertToBitmap())
+        self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img)
         self.ui__bt_parameter.SetLabel('Options')
         self.ui__bt_parameter.Enable(False)
 
@@ -182,6 +213,7 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         self.ui__txt_version_information = wx.StaticText(self, wx.ID_ANY, ' v'+version.APP_VERSION, wx.DefaultPosition, wx.DefaultSize, 0)
         self.ui__txt_version_information.SetFont(wx.Font(8, wx.MODERN, wx.NORMAL, wx.NORMAL, False, u'Sans'))
         self.ui__txt_version_information.SetForegroundColour(wx.SystemSettings.GetColour(wx.SYS_COLOUR_GRAYTEXT))
+        startup_profiler.mark('frame: widgets')
 
         ## Layout/Sizer
         b_sizer = wx.BoxSizer(wx.VERTICAL) # define layout container
@@ -250,11 +282,12 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         #wx.EVT_LEAVE_WINDOW(self, self.OnLeave)
 
         ## Finish setting up the main UI & show it
-        transparency = ini.read_single_ini_value('General', 'transparency') # get preference value
-        self.SetTransparent(int(transparency))       # 0-255
+        transparency = ini.read_int_ini_value('General', 'transparency') # get preference value
+        self.SetTransparent(transparency)       # 0-255
         self.ui__cb_search.SetFocus()     # set focus to search
         self.Center()                   # open window centered
         self.Show(True)                 # show main UI
+        startup_profiler.mark('frame: layout, bindings & show')
 
 
     def on_key_down(self, event):
@@ -300,9 +333,56 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
             tools.debug_output(__name__, 'on_key_down', 'Set focus back to search.', 1)
 
 
+    def on_ini_value_changed(self, section_name, key_name, value):
+        """Callback for ini changes (preference window or external edits of the ini file)"""
+        global icon_size
+        if section_name is None: # ini got modified from outside - re-read everything we keep in memory
+            icon_size = ini.read_single_ini_value('General', 'icon_size')
+            self.search_scheduler.set_debounce(ini.read_int_ini_value('General', 'search_debounce'))
+        elif section_name == 'General' and key_name == 'icon_size':
+            tools.debug_output(__name__, 'on_ini_value_changed', 'Icon size changed to: '+value, 1)
+            icon_size = value
+        elif section_name == 'General' and key_name == 'search_debounce':
+            tools.debug_output(__name__, 'on_ini_value_changed', 'Search debounce changed to: '+value+'ms', 1)
+            self.search_scheduler.set_debounce(int(value))
+
+
+    def on_remote_command(self, command, argument):
+        """Handles a command of a remote control client (i.e. the hotkey script)"""
+        tools.debug_output(__name__, 'on_remote_command', 'Command: '+command+' - Argument: '+argument, 1)
+        if command == 'toggle' and self.IsActive() and not self.IsIconized():
+            self.tbicon.execute_tray_icon_left_click() # hide main window
+            return
+
+        ## show the main window & focus the search
+        if self.IsIconized():
+            self.Iconize(False)
+        self.Show(True)
+        self.Raise()
+        self.ui__cb_search.SetFocus()
+
+        if command == 'query':
+            self.ui__cb_search.SetValue(argument)
+            self.ui__cb_search.SetInsertionPointEnd() # set cursor to end of string
+            self.parse_user_input(argument.lower())
+
+
     def on_close_application(self, event):
         """Method to close the app"""
         tools.debug_output(__name__, 'on_close_application', 'starting with event: '+str(event), 1)
+        ini.unregister_change_callback(self.on_ini_value_changed)
+        remote_control.stop_server()
+        usage_statistics.stop_flush_timer()
+        executable_index.stop_watcher()
+        desktop_index.stop_watcher()
+        icon_resolver.stop_watcher()
+        for backend in ('file_index', 'content_index'): # imported by their plugins on first use
+            if backend in sys.modules:
+                sys.modules[backend].stop_watcher()
+        self.search_scheduler.stop()
+        usage_statistics.flush() # write pending statistics before leaving
+        launch_history.flush()
+        query_learning.flush()
         self.tbicon.RemoveIcon()
         self.tbicon.Destroy()
         self.Destroy()
@@ -328,10 +408,11 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
 
 
     # method exists in apprat_launcher & tray_icon right now - Baustelle
-    def open_preference_window(self):
+    def open_preference_window(self, page=0):
         """Opens the preference window"""
         tools.debug_output(__name__, 'open_preference_window', 'starting', 1)
-        self.prefWindow = prefs.PreferenceWindow(parent=None, idd=-1)
+        import prefs # not needed for the startup
+        self.prefWindow = prefs.PreferenceWindow(parent=None, idd=-1, page=page)
         self.prefWindow.Show()
 
 
@@ -370,12 +451,16 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
     def on_combobox_select_item(self, event):
         """If an item of the result-list was selected"""
         tools.debug_output(__name__, 'on_combobox_select_item', 'starting with event: '+str(event), 1)
+        self.search_scheduler.cancel() # the user picked a result - a pending search must not replace the list
 
-        if(self.ui__txt_plugin_information.GetValue() == 'Plugin: Local Search'): # Local search is always using xdg open - special case
+        if self.ui__txt_plugin_information.GetValue() in ('Plugin: Content Search', 'Plugin: Local Search'): # Local & content search are always using xdg open - special case
             self.ui__txt_parameter.SetValue(self.ui__cb_search.GetValue().lower()) # write command to command text field
         else: ## default-case
             self.ui__txt_command.SetValue(self.ui__cb_search.GetValue().lower()) # write command to command text field
             self.get_icon(self.ui__cb_search.GetValue().lower()) # get icon for selected executable
+            if self.ui__txt_plugin_information.GetValue() == '': # picked an executable
+                chosen = self.chosen_result = self.ui__cb_search.GetValue().lower()
+                query_learning.learn(self.executable_query, desktop_index.resolve_name(chosen) or chosen, query_learning.WEIGHT_SELECTED)
 
         self.ui__cb_search.SetInsertionPointEnd() # set cursor to end of string
         tools.debug_output(__name__, 'on_combobox_select_item', 'finished', 1)
@@ -390,7 +475,7 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         ## select the first item from list
         self.ui__cb_search.SetSelection(0) # is default
         if 'Ubuntu' in platform.linux_distribution():
-            subprocess.Popen(["xdotool", "key", "Down"]) # simulate key press to highlight the choosen value as well
+            launcher.launch('xdotool', 'key Down') # simulate key press to highlight the choosen value as well
         tools.debug_output(__name__, 'on_combobox_popup_open', 'finished', 1)
 
 
@@ -423,6 +508,7 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
 
         elif current_keycode == wx.WXK_BACK: # Key: Backspace
             tools.debug_output(__name__, 'on_combobox_key_press', 'Pressed Backspace', 1)
+            self.keystroke_time = latency_stats.timer()
             current_search_string = self.ui__cb_search.GetValue().lower()
             if(current_search_string.startswith('!')) and (self.ui__txt_result_counter.GetValue() != '0'): # if user is correcting a wrong input - dont autocomplete again
                 self.get_enabled_plugin_trigger(current_search_string, autocomplete=False) # False to prevent re-autocomplete after user tried to revert the former autocomplete
@@ -448,6 +534,7 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
             is_combobox_open = 0
 
         else:
+            self.keystroke_time = latency_stats.timer()
             current_search_string = self.ui__cb_search.GetValue().lower()
             if (current_search_string) == "":
                 tools.debug_output(__name__, 'on_combobox_key_press', 'Searchstring: <empty>. Trigger reset_ui method', 1)
@@ -457,6 +544,7 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
                 self.parse_user_input(current_search_string)
 
 
+    @latency_stats.timed('icon resolution')
     def get_icon(self, full_executable_name): # pylint:disable=too-many-branches,too-many-statements
         """Tries to get an icon for an executable by name"""
         tools.debug_output(__name__, 'get_icon', 'Starting icon search for: '+full_executable_name, 1)
@@ -466,35 +554,28 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
             tools.debug_output(__name__, 'get_icon', 'Aborted as everything points into plugin direction', 2)
             return
 
-        global icon_size
-        icon_size = ini.read_single_ini_value('General', 'icon_size') # update preference value
-
-        # detect users current icontheme-name
-        theme = os.popen('gsettings get org.gnome.desktop.interface icon-theme').read() # via: https://ubuntuforums.org/showthread.php?t=2100795
-        theme = theme.partition("'")[-1].rpartition("'")[0] # build substring
-
-        if theme is None: # fallback to hicolor icon theme if none was detected
-            theme = xdg.Config.icon_theme # hicolor
-            tools.debug_output(__name__, 'get_icon', 'Using fallback icon theme hicolor', 2)
+        ## lookup in the icon index of the users current icon theme (png only) - prefer the Icon= value of the application
+        icon = None
+        icon_value = desktop_index.get_icon_name(full_executable_name)
+        if icon_value is not None:
+            icon = icon_resolver.get_icon_path_for_value(icon_value, int(icon_size))
+        if icon is None:
+            icon = icon_resolver.get_icon_path(desktop_index.get_program(full_executable_name), int(icon_size))
 
-        tools.debug_output(__name__, 'get_icon', 'Using icon theme: '+theme, 1)
-        icon = xdg.IconTheme.getIconPath(full_executable_name, size=int(icon_size), theme=theme, extensions=['png'])
-
-        if(icon is None) or (icon is "") or '.svg' in icon: # use default icon
-            new_app_icon = wx.Image('gfx/core/'+icon_size+'/missingAppIcon.png', wx.BITMAP_TYPE_PNG)
+        if icon is None: # use default icon
+            new_app_icon = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/missingAppIcon.png')
             tools.debug_output(__name__, 'get_icon', 'Selected icon: DEFAULT', 2)
         else:
             tools.debug_output(__name__, 'get_icon', 'Selected icon: '+icon, 1)
-            new_app_icon = wx.Image(icon, wx.BITMAP_TYPE_ANY)    # define new image
-            new_app_icon.Rescale(int(icon_size), int(icon_size)) # rescale image
+            new_app_icon = bitmap_cache.get_bitmap(icon, int(icon_size)) # rescaled to the icon size
 
         ## command button
-        self.ui__bt_command.SetBitmap(new_app_icon.ConvertToBitmap()) # set icon to button
+        self.ui__bt_command.SetBitmap(new_app_icon) # set icon to button
         self.ui__bt_command.Enable(True) # Enable the button
 
         ## parameter button
-        self.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-        self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img.ConvertToBitmap())
+        self.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+        self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img)
         self.ui__bt_parameter.Enable(True) # Enable parameter button
         self.ui__bt_parameter.SetToolTipString('Launch') # set tooltip
 
@@ -513,12 +594,12 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
             self.status_notification_got_distinct_result()
         else:
             ## command button
-            self.ui__bt_command.SetBitmap(self.ui__bt_command_img.ConvertToBitmap())
+            self.ui__bt_command.SetBitmap(self.ui__bt_command_img)
             self.ui__bt_command.Enable(False)
 
             ## parameter button
-            self.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/blank.png', wx.BITMAP_TYPE_PNG)
-            self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img.ConvertToBitmap())
+            self.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/blank.png')
+            self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img)
             self.ui__bt_parameter.SetToolTipString('')
             self.ui__bt_parameter.Enable(False) # Enable parameter button
 
@@ -538,17 +619,7 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         tools.debug_output(__name__, 'get_enabled_plugin_trigger', 'starting', 1)
 
         ## collect all plugin commands from the enabled plugins and add them to the dropdown
-        plugin_commands = plugin_core.TRIGGER # add core commands
-
-        for current_plugin in plugin_core.PLUGINS:
-            if current_plugin != 'plugin_search_local': # plugin_search_local gets ignored
-                ## check if plugin is currently enabled
-                tools.debug_output(__name__, 'get_enabled_plugin_trigger', 'Checking if '+current_plugin+' is enabled', 1)
-                ini_value_for_current_plugin = ini.read_single_ini_value('Plugins', current_plugin) # get current value from ini
-                ## if plugin is enabled - add plugin commands/trigger to tuple
-                if ini_value_for_current_plugin == 'True':
-                    tools.debug_output(__name__, 'get_enabled_plugin_trigger', 'Adding commands of '+current_plugin+' to enabled plugin command list', 1)
-                    plugin_commands = plugin_commands + eval(current_plugin).TRIGGER # add plugin commands to plugin_commands tuple
+        plugin_commands = plugin_dispatcher.get_enabled_triggers() # core commands + commands of enabled plugins
 
         tools.debug_output(__name__, 'get_enabled_plugin_trigger', 'Got '+str(len(plugin_commands))+' enabled plugin commands', 1)
 
@@ -564,9 +635,9 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         self.ui__txt_result_counter.SetValue(str(len(plugin_commands))) # update result count
 
         ## update command
-        self.ui__bt_command_img = wx.Image('gfx/core/'+icon_size+'/plugins.png', wx.BITMAP_TYPE_PNG)
+        self.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/plugins.png')
         self.ui__bt_command.Enable(True)
-        self.ui__bt_command.SetBitmap(self.ui__bt_command_img.ConvertToBitmap())
+        self.ui__bt_command.SetBitmap(self.ui__bt_command_img)
         self.ui__bt_command.SetToolTipString("Plugin-Search") # set tooltip
         self.ui__txt_command.SetValue('') # set command
 
@@ -590,10 +661,14 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         tools.debug_output(__name__, 'get_enabled_plugin_trigger', 'found '+str(len(plugin_commands))+' plugin trigger for current user input: '+current_search_string, 1)
 
 
+    @latency_stats.timed('dispatch')
     def parse_user_input(self, current_search_string): # pylint:disable=too-many-return-statements, too-many-branches, too-many-statements
         """Takes the current user input and parses it for matching plugins or general application search"""
         tools.debug_output(__name__, 'parse_user_input', 'starting', 1)
 
+        ## results of a pending search for the previous input are outdated now
+        self.search_scheduler.cancel()
+
         current_search_string = self.ui__cb_search.GetValue().lower()
 
         if current_search_string != '': # if there is a search string
@@ -610,75 +685,12 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
                     tools.debug_output(__name__, 'parse_user_input', 'Case: !', 1)
                     self.plugin__update_general_ui_information('')
 
-                ## Plugin: Core (can not be disabled)
-                if  current_search_string.startswith(plugin_core.TRIGGER):
-                    plugin_core.parse(current_search_string, self)
+                ## Plugins: single lookup in the precompiled trigger table of the enabled plugins
+                plugin_handler = plugin_dispatcher.route(current_search_string)
+                if plugin_handler is not None:
+                    plugin_handler(current_search_string, self)
                     return
 
-                ## Plugin: Kill
-                cur_ini_value_for_plugin_kill = ini.read_single_ini_value('Plugins', 'plugin_kill') # get current value from ini
-                if cur_ini_value_for_plugin_kill == 'True':
-                    if current_search_string in plugin_kill.TRIGGER:
-                        plugin_kill.parse(self)
-                        return
-
-                ## Plugin: Misc
-                cur_ini_value_for_plugin_misc = ini.read_single_ini_value('Plugins', 'plugin_misc') # get current value from ini
-                if cur_ini_value_for_plugin_misc == 'True':
-                    if current_search_string.startswith(plugin_misc.TRIGGER):
-                        plugin_misc.parse(current_search_string, self)
-                        return
-
-                ## Plugin: Nautilus
-                cur_ini_value_for_plugin_nautilus = ini.read_single_ini_value('Plugins', 'plugin_nautilus') # get current value from ini
-                if cur_ini_value_for_plugin_nautilus == 'True':
-                    if current_search_string in plugin_nautilus.TRIGGER or current_search_string.startswith('!goto'): # goto = special case as it accepts parameter
-                        plugin_nautilus.parse(current_search_string, self)
-                        return
-
-                ## Plugin: PasswordGen
-                cur_ini_value_for_plugin_passwordgen = ini.read_single_ini_value('Plugins', 'plugin_passwordgen') # get current value from ini
-                if cur_ini_value_for_plugin_passwordgen == 'True':
-                    if current_search_string in plugin_passwordgen.TRIGGER:
-                        plugin_passwordgen.parse(current_search_string, self)
-                        return
-
-                ## Plugin: Screenshot
-                cur_ini_value_for_plugin_screenshot = ini.read_single_ini_value('Plugins', 'plugin_screenshot') # get current value from ini
-                if cur_ini_value_for_plugin_screenshot == 'True':
-                    if current_search_string in plugin_screenshot.TRIGGER:
-                        plugin_screenshot.parse(current_search_string, self)
-                        return
-
-                ## Plugin: Internet-Search
-                cur_ini_value_for_plugin_internet_search = ini.read_single_ini_value('Plugins', 'plugin_search_internet') # get current value from ini
-                if cur_ini_value_for_plugin_internet_search == 'True':
-                    if current_search_string[0:3] in plugin_search_internet.TRIGGER:
-                        plugin_search_internet.parse(self, current_search_string)
-                        return
-
-                ## Plugin: Local Search
-                cur_ini_value_for_plugin_local_search = ini.read_single_ini_value('Plugins', 'plugin_search_local') # get current value from ini
-                if cur_ini_value_for_plugin_local_search == 'True':
-                    if current_search_string.startswith(plugin_search_local.TRIGGER):
-                        plugin_search_local.search_user_files(self, current_search_string)
-                        return
-
-                ## Plugin: Session
-                cur_ini_value_for_plugin_session = ini.read_single_ini_value('Plugins', 'plugin_session') # get current value from ini
-                if cur_ini_value_for_plugin_session == 'True':
-                    if current_search_string in plugin_session.TRIGGER:
-                        plugin_session.parse(current_search_string, self)
-                        return
-
-                ## Plugin: Shell
-                cur_ini_value_for_plugin_shell = ini.read_single_ini_value('Plugins', 'plugin_shell') # get current value from ini
-                if cur_ini_value_for_plugin_shell == 'True':
-                    if  current_search_string.startswith(plugin_shell.TRIGGER):
-                        plugin_shell.parse(current_search_string, self)
-                        return
-
-
                 ## Most likely a wrong plugin command as nothing matches so far in this case
                 tools.debug_output(__name__, 'parse_user_input', 'User input didnt match any plugin trigger', 2)
 
@@ -721,27 +733,69 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         self.plugin__update_general_ui_information('') # get rid of all plugin UI-artefacts
 
         tools.debug_output(__name__, 'search_executables', 'Searching executables for the following string: '+current_search_string, 1)
-        search_results = fnmatch.filter(os.listdir('/usr/bin'), '*'+current_search_string+'*')     # search for executables matching users searchstring
-        search_results = sorted(search_results, key=lambda x: difflib.SequenceMatcher(None, x, current_search_string).ratio(), reverse=True) # better sorting
-
-        self.ui__txt_result_counter.SetValue(str(len(search_results))) # update result count
+        if current_search_string != self.chosen_result: # closing the dropdown searches the chosen result - its launch is learned for the typed query
+            self.executable_query = current_search_string
+            self.chosen_result = None
+        self.search_scheduler.schedule(
+            'search_executables',
+            lambda: self.compute_executable_search(current_search_string),
+            lambda result: self.show_executable_search_results(current_search_string, *result))
+
+
+    @latency_stats.timed('search')
+    def compute_executable_search(self, current_search_string):
+        """Searches executables & applications matching users searchstring (in-memory indexes) & keeps only the best ranked results. Runs on the search worker - no UI access"""
+        def full_search(query):
+            """Executables in $PATH by name & applications (display names) by names, program and keywords - executables an application starts as they are are listed as the application"""
+            return list((set(executable_index.filter_names(query)) - desktop_index.get_shadowed_executables()) | set(desktop_index.filter_names(query)))
+
+        def rank(query, candidates):
+            """Rank by names, program and keywords of the application - frequently & recently launched ones first"""
+            with latency_stats.measure('ranking'):
+                return scoring.top_k(query, candidates, key=desktop_index.get_search_text, bonus=launch_history.get_bonus)
+
+        ## choices the user made for exactly this query before come first (dictionary lookup) - uninstalled ones get forgotten
+        learned = []
+        for choice in query_learning.get_choices(current_search_string):
+            if executable_index.get_directory(choice) is not None or desktop_index.has_application(choice):
+                learned.append(choice)
+            else:
+                query_learning.forget(current_search_string, choice)
+
+        ## the session narrows the candidates of shorter queries and memoizes recent results (backspace)
+        search_results, match_count = self.executable_search_session.search(
+            current_search_string,
+            full_search,
+            desktop_index.filter_names,
+            rank,
+            generation=(executable_index.get_generation(), desktop_index.get_generation(), launch_history.get_generation()))
+        if learned:
+            match_count += len([choice for choice in learned if choice not in search_results])
+            search_results = learned + [result for result in search_results if result not in learned]
+        return search_results[:scoring.DEFAULT_LIMIT], match_count
+
+
+    @latency_stats.timed('widget update')
+    def show_executable_search_results(self, current_search_string, search_results, match_count): # pylint:disable=too-many-statements
+        """Updates the UI with the results of an executable search"""
+        self.ui__txt_result_counter.SetValue(str(match_count)) # update result count
         self.ui__cb_search.SetItems(search_results) # update combobox
 
-        tools.debug_output(__name__, 'search_executables', 'Found '+str(len(search_results))+' matching application', 1)
+        tools.debug_output(__name__, 'search_executables', 'Found '+str(match_count)+' matching application', 1)
         if len(search_results) == 0: # 0 results
             ## update status button
             self.status_notification_display_error('No executables found')
 
             ## update command button & txt
             self.ui__bt_command.Enable(False)
-            self.ui__bt_command_img = wx.Image('gfx/core/'+icon_size+'/blank.png', wx.BITMAP_TYPE_PNG)
-            self.ui__bt_command.SetBitmap(self.ui__bt_command_img.ConvertToBitmap())
+            self.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/blank.png')
+            self.ui__bt_command.SetBitmap(self.ui__bt_command_img)
             self.ui__bt_command.SetToolTipString("") # set tooltip
             self.ui__txt_command.SetValue('') # set command
 
             ## update parameter button & txt
-            self.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/blank.png', wx.BITMAP_TYPE_PNG)
-            self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img.ConvertToBitmap())
+            self.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/blank.png')
+            self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img)
             self.ui__txt_parameter.SetValue('') # set parameter
 
         elif len(search_results) == 1: # 1 result
@@ -757,16 +811,16 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
             self.colorize_txt_command(current_search_string, search_results[0])
 
             ## parameter button & txt
-            self.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-            self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img.ConvertToBitmap()) # change button image
+            self.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+            self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img) # change button image
             self.ui__bt_parameter.Enable(True) # Enable parameter button
             self.ui__bt_parameter.SetToolTipString('Launch') # set tooltip
             self.ui__txt_parameter.SetValue('') # update parameter txt
 
-            self.get_icon(str(search_results[0])) ## Icon search
+            self.get_icon(search_results[0]) ## Icon search
 
             ## check if application is already running - should offer an option to change to this instance besides starting a new one
-            tools.check_running_processes_by_name(search_results[0])
+            tools.check_running_processes_by_name(desktop_index.get_program(search_results[0]))
 
         else: # > 1 results
             self.status_notification_reset() # reset status
@@ -780,25 +834,34 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
             self.colorize_txt_command(current_search_string, search_results[0])
 
             ## parameter button & txt
-            self.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-            self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img.ConvertToBitmap())
+            self.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+            self.ui__bt_parameter.SetBitmap(self.ui__bt_parameter_img)
             self.ui__bt_parameter.Enable(True) # Enable parameter button
             self.ui__bt_parameter.SetToolTipString('Launch')
             self.ui__txt_parameter.SetValue('')             ## update parameter
 
             ## check if application is already running - should offer an option to change to this instance besides starting a new one
-            tools.check_running_processes_by_name(search_results[0])
+            tools.check_running_processes_by_name(desktop_index.get_program(search_results[0]))
+
+        ## end-to-end: keystroke -> results on screen (includes the debounce delay)
+        if self.keystroke_time is not None:
+            latency_stats.record_since('keystroke to results', self.keystroke_time)
+            self.keystroke_time = None
 
 
     def colorize_txt_command(self, current_search_string, primary_result):
         """Colorize or highlight the current search string (substring) in the currently selected search result/command"""
-        highlightStartPos = primary_result.find(current_search_string) # start position
+        highlightStartPos = primary_result.lower().find(current_search_string) # start position - results might be application names
+        if highlightStartPos < 0: # matched by application name or keyword - nothing to highlight
+            return
         highlightLength = highlightStartPos + len(current_search_string) # length
         self.ui__txt_command.SetStyle(highlightStartPos, highlightLength, wx.TextAttr(wx.BLACK, wx.Colour(38, 156, 88)))
 
 
     def do_execute(self): # pylint:disable=too-many-branches, too-many-statements
         """Launches the actual task"""
+        self.search_scheduler.flush() # apply a search which is still within the debounce window - command & parameter must match the input
+
         command = self.ui__txt_command.GetValue() ## get command
         parameter = self.ui__txt_parameter.GetValue() ## get parameter
 
@@ -829,46 +892,49 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
                     return
 
         ## Plugin: PasswordGen
-        if command in plugin_passwordgen.TRIGGER or command == '!pa':
-            plugin_passwordgen.execute_password_generation(self)
+        if command in plugin_registry.get_triggers('plugin_passwordgen') or command == '!pa':
+            self.record_launch(command)
+            plugin_registry.load('plugin_passwordgen').execute_password_generation(self)
             return
 
         ## Plugin: Internet-Search
-        if command in plugin_search_internet.TRIGGER:
-            plugin_search_internet.execute_internet_search(self, command, parameter)
+        if command in plugin_registry.get_triggers('plugin_search_internet'):
+            self.record_launch(command)
+            plugin_registry.load('plugin_search_internet').execute_internet_search(self, command, parameter)
             return
 
         ## Plugin: Session/Screenshot/Nautilus/Shell/X/Y OR normal application/executable
         if command is not None: # Check if the dropdown contains something at all or not
             tools.debug_output(__name__, 'do_execute', 'Should execute: "'+command+'" with parameter: "'+parameter+'"', 1)
 
-            ## check if name exists and is executable
-            executable_exists = tools.cmd_exists(command)
-            if executable_exists is True:
+            ## applications start their Exec= line (field codes removed), executables are started by name
+            fixed_arguments = []
+            if self.ui__txt_plugin_information.GetValue() == '' and desktop_index.has_application(command):
+                command = desktop_index.resolve_name(command) # display name - as ranked & learned
+                fixed_arguments = desktop_index.get_command(command)
+                program = fixed_arguments.pop(0)
+            else:
+                program = command
+
+            ## check if name exists and is executable - resolved in-process via the $PATH index (no shell)
+            executable_path = tools.which(program)
+            if executable_path is not None:
                 tools.debug_output(__name__, 'do_execute', 'Executable: "'+command+'" exists', 1)
 
                 ## usage-statistics: commands executed
-                tools.debug_output(__name__, 'do_execute', 'Updating statistics (command_executed)', 1)
-                current_commands_executed_count = ini.read_single_ini_value('Statistics', 'command_executed')          # get current value from ini
-                ini.write_single_ini_value('Statistics', 'command_executed', int(current_commands_executed_count)+1) # update ini +1
+                usage_statistics.increment('command_executed')
 
                 ## usage-statistics: plugin execution count
-                if self.ui__txt_plugin_information != '':
-                    tools.debug_output(__name__, 'do_execute', 'Updating statistics (plugins_executed)', 1)
-                    current_plugin_executed_count = ini.read_single_ini_value('Statistics', 'plugin_executed')          # get current value from ini
-                    ini.write_single_ini_value('Statistics', 'plugin_executed', int(current_plugin_executed_count)+1) # update ini +1
-
-                ## Start subprocess
-                if parameter == '':
-                    subprocess.Popen([command])
-                    tools.debug_output(__name__, 'do_execute', 'Executed: "'+command+'"', 1)
-                else: # there is at least 1 parameter
-                    if(' ' in parameter): # if parameter contains at least 1 space, there are most likely several parameters
-                        subprocess.Popen([command+" "+parameter], shell=True) # using shell=True as hack for handling several parameters (i.e. for !fs)
-                        tools.debug_output(__name__, 'do_execute', 'Executed: "'+command+'" with parameter: "'+parameter+'" (with shell=True)', 1)
-                    else: # assuming: single parameter
-                        subprocess.Popen([command, parameter])
-                        tools.debug_output(__name__, 'do_execute', 'Executed: "'+command+'" with parameter: "'+parameter+'"', 1)
+                if self.ui__txt_plugin_information.GetValue() != '':
+                    usage_statistics.increment('plugin_executed')
+
+                ## launch history (frecency ranking)
+                self.record_launch(command)
+
+                ## Start subprocess - detached, parameters are tokenised like a shell would do it (i.e. for !fs). Paths are passed as a single parameter
+                single_parameter = self.ui__txt_plugin_information.GetValue() in PATH_PARAMETER_PLUGINS
+                launcher.launch(executable_path, parameter, single_parameter, fixed_arguments)
+                tools.debug_output(__name__, 'do_execute', 'Executed: "'+command+'" with parameter: "'+parameter+'"', 1)
 
                 self.reset_ui()
 
@@ -878,7 +944,7 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
                     tools.debug_output(__name__, 'do_execute', 'Hide Main UI after executing a command', 1)
                     self.tbicon.execute_tray_icon_left_click()
             else:
-                tools.debug_output(__name__, 'do_execute', 'ERROR >> Checking the "'+command+'" executable failed', 3)
+                tools.debug_output(__name__, 'do_execute', 'ERROR >> Checking the "'+program+'" executable failed', 3)
                 self.status_notification_display_error('Checking the executable failed')
         else:
             tools.debug_output(__name__, 'do_execute', 'WARNING >> command is "None", aborting now', 3)
@@ -889,7 +955,17 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         tools.debug_output(__name__, 'status_notification_display_error', 'Error: '+error_string, 3)
         self.ui__bt_status.Enable(True)
         self.ui__bt_status.SetToolTipString(error_string)
-        self.ui__bt_status_img = wx.Bitmap('gfx/core/16/status_error_red.png', wx.BITMAP_TYPE_PNG)
+        self.ui__bt_status_img = bitmap_cache.get_bitmap('gfx/core/16/status_error_red.png')
+        self.ui__bt_status.SetBitmap(self.ui__bt_status_img)
+        self.Refresh()
+
+
+    def status_notification_display_info(self, info_string):
+        """displays an info string and the neutral app symbol in the status area (no error)"""
+        tools.debug_output(__name__, 'status_notification_display_info', 'Info: '+info_string, 1)
+        self.ui__bt_status.Enable(True)
+        self.ui__bt_status.SetToolTipString(info_string)
+        self.ui__bt_status_img = bitmap_cache.get_bitmap('gfx/core/16/appIcon.png')
         self.ui__bt_status.SetBitmap(self.ui__bt_status_img)
         self.Refresh()
 
@@ -899,7 +975,7 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         tools.debug_output(__name__, 'status_notification_reset', 'Reset notification area back to blank', 1)
         self.ui__bt_status.Enable(False)
         self.ui__bt_status.SetToolTipString('')
-        self.ui__bt_status_img = wx.Bitmap('gfx/core/16/blank.png', wx.BITMAP_TYPE_PNG)
+        self.ui__bt_status_img = bitmap_cache.get_bitmap('gfx/core/16/blank.png')
         self.ui__bt_status.SetBitmap(self.ui__bt_status_img)
 
 
@@ -908,7 +984,7 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         tools.debug_output(__name__, 'status_notification_got_distinct_result', 'Got 1 distinct result - show green status', 1)
         self.ui__bt_status.Enable(True)
         self.ui__bt_status.SetToolTipString('Valid command')
-        self.ui__bt_status_img = wx.Bitmap('gfx/core/16/status_ok_green.png', wx.BITMAP_TYPE_PNG)
+        self.ui__bt_status_img = bitmap_cache.get_bitmap('gfx/core/16/status_ok_green.png')
         self.ui__bt_status.SetBitmap(self.ui__bt_status_img)
         self.Refresh()
 
@@ -919,9 +995,22 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         webbrowser.open(constants.APP_URL+'#top')  # Go to github
 
 
+    def record_launch(self, command):
+        """Adds a launch to the launch history - plugins by their trigger, executables by name"""
+        if self.ui__txt_plugin_information.GetValue() != '':
+            launch_history.record(self.ui__cb_search.GetValue().partition(' ')[0], launch_history.KIND_PLUGIN)
+        else:
+            launch_history.record(command)
+            query_learning.learn(self.executable_query, command)
+
+
     def reset_ui(self):
         """Method to reset the User-Interface of the Apps main-window"""
         tools.debug_output(__name__, 'reset_ui', 'Starting UI reset', 1)
+        self.search_scheduler.cancel() # drop results of pending searches
+        self.executable_query = ''
+        self.chosen_result = None
+        self.keystroke_time = None
 
         global icon_size
         icon_size = ini.read_single_ini_value('General', 'icon_size') # update preference value
@@ -930,10 +1019,10 @@ class MyFrame(wx.Frame): # pylint:disable=too-many-instance-attributes,too-many-
         is_resetted = True
 
         ## Some general bitmaps which might be needed for some button states
-        self.ui__bt_img_search = wx.Bitmap('gfx/core/'+icon_size+'/search.png', wx.BITMAP_TYPE_PNG)
-        self.ui__bt_img_blank = wx.Bitmap('gfx/core/'+icon_size+'/blank.png', wx.BITMAP_TYPE_PNG)
-        self.ui__bt_img_execute_black = wx.Bitmap('gfx/core/'+icon_size+'/execute_black.png', wx.BITMAP_TYPE_PNG)
-        self.ui__bt_img_appicon = wx.Bitmap('gfx/core/'+icon_size+'/appIcon.png', wx.BITMAP_TYPE_PNG)
+        self.ui__bt_img_search = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/search.png')
+        self.ui__bt_img_blank = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/blank.png')
+        self.ui__bt_img_execute_black = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute_black.png')
+        self.ui__bt_img_appicon = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/appIcon.png')
 
         ## reset the combobox
         self.ui__cb_search.Clear() # clear all list values
@@ -978,6 +1067,11 @@ class App(wx.App):
     def OnInit(self): # pylint:disable=invalid-name
         """While starting the app (checks for already running instances)"""
         if self.apparat_instance.IsAnotherRunning(): # allow only 1 instance of apparat
+            ## forward the request to the running instance
+            request = remote_control.get_startup_command() or ('show', '')
+            if remote_control.send_command(*request):
+                tools.debug_output(__name__, 'OnInit', 'An instance is already running. Forwarded: '+request[0], 1)
+                return False
             tools.debug_output(__name__, 'OnInit', 'An instance is already running. Aborting', 3)
             wx.MessageBox(constants.APP_NAME+' is already running. Aborting startup', 'Error', wx.OK | wx.ICON_WARNING)
             return False
@@ -990,13 +1084,29 @@ class App(wx.App):
 def main():
     """main"""
     app = App(False)
+    startup_profiler.mark('wx.App')
     tools.check_arguments() # check launch parameter / arguments
+    startup_profiler.mark('check_arguments')
     tools.check_platform() # Check if platform is supported at all, otherwise abort
+    startup_profiler.mark('check_platform')
     tools.check_general_requirements() # check if needed linux packages are available/installed
+    startup_profiler.mark('check_general_requirements')
     ini.validate() # validate ini file
+    startup_profiler.mark('ini.validate')
+    executable_index.load() # executable index (from cache if possible)
+    startup_profiler.mark('executable_index.load')
+    desktop_index.load() # application catalogue (from cache if possible)
+    startup_profiler.mark('desktop_index.load')
 
+    launcher.install_reaper() # launched programs must not become zombies
     frame = MyFrame(None, constants.APP_NAME) # Main UI window
     tools.debug_output(__name__, 'main', 'Frame: '+str(frame), 1)
+
+    ## started via remote control without a running instance (i.e. --query TEXT)
+    startup_command = remote_control.get_startup_command()
+    if startup_command is not None:
+        wx.CallAfter(frame.on_remote_command, *startup_command)
+    wx.CallAfter(lambda: startup_profiler.finish(['Plugins imported during startup: '+(', '.join(plugin_registry.get_loaded_plugins()) or 'none')])) # first main loop iteration - the UI is up
     app.MainLoop()
 
 if __name__ == '__main__':
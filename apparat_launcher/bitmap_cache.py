@@ -0,0 +1,79 @@
+#!/usr/bin/python
+"""Shared LRU cache for decoded bitmaps (bundled gfx assets and app icons)"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import collections
+import wx
+
+## apparat
+import ini
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+MAX_BYTES = 32 * 1024 * 1024 # upper bound for the decoded pixel data of all cached bitmaps
+BYTES_PER_PIXEL = 4 # RGBA
+
+_BITMAPS = collections.OrderedDict() # (path, size): (bitmap, bytes)
+_BYTES = 0 # decoded pixel data of all cached bitmaps
+_HITS = 0
+_MISSES = 0
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def load_bitmap(path, size=None):
+    """Decodes an image file - rescaled to size x size if size is given"""
+    if size is None:
+        return wx.Bitmap(path, wx.BITMAP_TYPE_ANY)
+    image = wx.Image(path, wx.BITMAP_TYPE_ANY)
+    if image.GetWidth() != size or image.GetHeight() != size:
+        image.Rescale(size, size) # rescale image
+    return image.ConvertToBitmap()
+
+
+def get_bitmap(path, size=None):
+    """Returns the bitmap for path (rescaled to size x size if size is given) - decodes the file only on the first request"""
+    global _BYTES, _HITS, _MISSES # pylint:disable=global-statement
+    key = (path, size)
+    entry = _BITMAPS.pop(key, None)
+    if entry is not None:
+        _HITS += 1
+        _BITMAPS[key] = entry # re-insert as most recently used
+        return entry[0]
+
+    _MISSES += 1
+    bitmap = load_bitmap(path, size)
+    size_in_bytes = bitmap.GetWidth() * bitmap.GetHeight() * BYTES_PER_PIXEL
+    _BITMAPS[key] = (bitmap, size_in_bytes)
+    _BYTES += size_in_bytes
+
+    ## drop least recently used bitmaps - but always keep the new one
+    while _BYTES > MAX_BYTES and len(_BITMAPS) > 1:
+        _, (_, dropped_bytes) = _BITMAPS.popitem(last=False)
+        _BYTES -= dropped_bytes
+    return bitmap
+
+
+def clear():
+    """Drops all cached bitmaps"""
+    global _BYTES # pylint:disable=global-statement
+    tools.debug_output(__name__, 'clear', 'Dropping '+str(len(_BITMAPS))+' bitmaps ('+str(_BYTES / 1024)+' KB) - hits: '+str(_HITS)+' misses: '+str(_MISSES), 1)
+    _BITMAPS.clear()
+    _BYTES = 0
+
+
+def on_ini_value_changed(section_name, key_name, value): # pylint:disable=unused-argument
+    """Drop the bitmaps of the old icon size if the icon size changed"""
+    if section_name is None or (section_name == 'General' and key_name == 'icon_size'):
+        wx.CallAfter(clear) # bitmaps belong to the UI thread
+
+
+ini.register_change_callback(on_ini_value_changed)
@@ -0,0 +1,351 @@
+#!/usr/bin/python
+"""Inverted index of the text files in the home directory (full-text search, tf-idf ranking) - persisted, updated incrementally by file mtime & size (as recorded by the file index)"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import array
+import bisect
+import collections
+import json
+import math
+import os
+import re
+import threading
+
+## apparat
+import constants
+import file_index
+import tools
+import trigram_index
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+CACHE_PATH = constants.APP_INI_FOLDER+'content.index'
+CACHE_VERSION = 1
+REFRESH_INTERVAL = 300 # seconds between two incremental updates
+MAX_FILE_SIZE = 1024 * 1024 # bytes - larger files are not indexed
+SNIFF_SIZE = 8192 # bytes checked for NUL bytes & magic numbers
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 64
+MAX_PREFIX_TERMS = 50 # terms the last (incomplete) query word expands to
+DEFAULT_LIMIT = 20
+
+## file types (by extension) & their tokenizer - other files are not indexed
+TEXT_EXTENSIONS = set(['txt', 'md', 'rst', 'tex', 'csv', 'log', 'org', 'ini', 'cfg', 'conf', 'json', 'yml', 'yaml', 'toml'])
+CODE_EXTENSIONS = set(['py', 'c', 'h', 'cpp', 'hpp', 'cc', 'java', 'js', 'ts', 'go', 'rs', 'rb', 'php', 'pl', 'sh', 'bash', 'lua', 'sql', 'cs', 'swift', 'kt', 'scala', 'css'])
+MARKUP_EXTENSIONS = set(['html', 'htm', 'xml', 'xhtml', 'svg'])
+
+## binary formats which might pass the NUL check in their first bytes
+BINARY_MAGIC = (b'%PDF', b'\x89PNG', b'GIF8', b'\xff\xd8\xff', b'PK\x03\x04', b'\x1f\x8b', b'\x7fELF', b'BZh', b'\xfd7zXZ', b'7z\xbc\xaf')
+
+WORD = re.compile(r'[^\W_]+', re.UNICODE) # letters & digits
+IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+IDENTIFIER_PART = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+') # camelCase & snake_case parts
+MARKUP_TAG = re.compile(r'<[^>]*>')
+
+_LOCK = threading.Lock()
+_UPDATE_LOCK = threading.Lock() # one update at a time (initial update & watcher)
+_DOCUMENTS = [] # document id: [path, mtime, size, token count] - None = removed
+_DOCUMENT_IDS = {} # path: document id
+_POSTINGS = collections.defaultdict(dict) # term: {document id: term frequency}
+_TERMS = None # sorted terms (for prefix queries) - None = outdated
+_GENERATION = 0 # increases whenever the index changes
+_LOADED = False
+_UPDATER = None # thread of the initial update
+_WATCHER = None
+
+
+# -----------------------------------------------------------------------------------------------
+# TOKENIZERS
+# -----------------------------------------------------------------------------------------------
+def tokenize_text(text):
+    """Plain text: lower case words"""
+    return [word.lower() for word in WORD.findall(text)]
+
+
+def tokenize_code(text):
+    """Source code: whole identifiers plus their camelCase & snake_case parts (getUserName -> getusername, get, user, name)"""
+    tokens = []
+    for identifier in IDENTIFIER.findall(text):
+        tokens.append(identifier.lower())
+        parts = IDENTIFIER_PART.findall(identifier)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    tokens.extend(word for word in tokenize_text(text) if word.isdigit())
+    return tokens
+
+
+def tokenize_markup(text):
+    """HTML & XML: text without the tags"""
+    return tokenize_text(MARKUP_TAG.sub(' ', text))
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def get_tokenizer(path):
+    """Returns the tokenizer for the file type of path (or None if the file type is not indexed)"""
+    extension = os.path.splitext(path)[1][1:].lower()
+    if extension in TEXT_EXTENSIONS:
+        return tokenize_text
+    if extension in CODE_EXTENSIONS:
+        return tokenize_code
+    if extension in MARKUP_EXTENSIONS:
+        return tokenize_markup
+    return None
+
+
+def is_binary(head):
+    """Checks the first bytes of a file for NUL bytes & known binary magic numbers"""
+    return b'\0' in head or head.startswith(BINARY_MAGIC)
+
+
+def read_text(path, size):
+    """Returns the text of a file (or None if it is too big, binary or not readable)"""
+    if size > MAX_FILE_SIZE:
+        return None
+    try:
+        with open(path, 'rb') as text_file:
+            content = text_file.read(MAX_FILE_SIZE + 1)
+    except (IOError, OSError):
+        return None
+    if is_binary(content[:SNIFF_SIZE]):
+        return None
+    return content.decode('utf-8', 'replace')
+
+
+def get_terms(path, size):
+    """Returns {term: frequency} of a file (or None if it can not be indexed)"""
+    tokenizer = get_tokenizer(path)
+    text = read_text(path, size) if tokenizer is not None else None
+    if text is None:
+        return None
+    terms = collections.Counter(token for token in tokenizer(text) if MIN_TOKEN_LENGTH <= len(token) <= MAX_TOKEN_LENGTH)
+    return dict(terms)
+
+
+def remove_documents(document_ids):
+    """Drops documents from the postings - one pass over all terms (call with _LOCK held)"""
+    if not document_ids:
+        return
+    for term in list(_POSTINGS):
+        postings = _POSTINGS[term]
+        for document_id in document_ids.intersection(postings):
+            del postings[document_id]
+        if not postings:
+            del _POSTINGS[term]
+    for document_id in document_ids:
+        del _DOCUMENT_IDS[_DOCUMENTS[document_id][0]]
+        _DOCUMENTS[document_id] = None
+
+
+def add_document(path, mtime, size, terms):
+    """Adds a document to the postings (call with _LOCK held)"""
+    document_id = len(_DOCUMENTS)
+    _DOCUMENTS.append([path, mtime, size, sum(terms.values())])
+    _DOCUMENT_IDS[path] = document_id
+    for term, frequency in terms.items():
+        _POSTINGS[term][document_id] = frequency
+
+
+def to_native_path(path):
+    """Returns path as str - json returns unicode on python 2, the file index has byte paths"""
+    if not isinstance(path, str):
+        return path.encode('utf-8')
+    return path
+
+
+def is_storable(path):
+    """Checks if a path can be stored in the json cache - byte paths (python 2) have to be utf-8"""
+    if isinstance(path, bytes):
+        try:
+            path.decode('utf-8')
+        except UnicodeDecodeError:
+            return False
+    return True
+
+
+def load_cache():
+    """Loads the index from the on-disk cache. Returns True on success"""
+    global _DOCUMENTS, _DOCUMENT_IDS, _POSTINGS # pylint:disable=global-statement
+    try:
+        with open(CACHE_PATH, 'r') as cache_file:
+            cache = json.load(cache_file)
+    except (IOError, ValueError):
+        return False
+    if cache.get('version') != CACHE_VERSION:
+        return False
+
+    postings = collections.defaultdict(dict)
+    for term, (document_ids, frequencies) in cache['postings'].items():
+        postings[term] = dict(zip(trigram_index.decode_array(document_ids), trigram_index.decode_array(frequencies)))
+    _DOCUMENTS = [[to_native_path(document[0])] + document[1:] for document in cache['documents']]
+    _DOCUMENT_IDS = dict((document[0], document_id) for document_id, document in enumerate(_DOCUMENTS))
+    _POSTINGS = postings
+    return True
+
+
+def save_cache():
+    """Writes the documents & the postings (document ids & frequencies as typed arrays) to the on-disk cache - removed documents get renumbered (write & rename).
+    Documents whose path is no utf-8 are left out - they get indexed again after the next start"""
+    with _LOCK:
+        new_ids = {}
+        documents = []
+        for document_id, document in enumerate(_DOCUMENTS):
+            if document is not None and is_storable(document[0]):
+                new_ids[document_id] = len(documents)
+                documents.append(document)
+        postings = {}
+        for term, term_postings in _POSTINGS.items():
+            document_ids = sorted(document_id for document_id in term_postings if document_id in new_ids)
+            if not document_ids:
+                continue
+            postings[term] = [
+                trigram_index.encode_array(array.array(trigram_index.TYPECODE, [new_ids[document_id] for document_id in document_ids])),
+                trigram_index.encode_array(array.array(trigram_index.TYPECODE, [term_postings[document_id] for document_id in document_ids])),
+            ]
+
+    temp_path = CACHE_PATH+'.tmp'
+    try:
+        with open(temp_path, 'w') as cache_file:
+            json.dump({'version': CACHE_VERSION, 'documents': documents, 'postings': postings}, cache_file, separators=(',', ':'))
+        os.rename(temp_path, CACHE_PATH)
+    except (IOError, OSError, ValueError):
+        tools.debug_output(__name__, 'save_cache', 'Unable to write '+CACHE_PATH, 3)
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def update():
+    """Indexes new & changed text files of the file index (by the mtime & size in its metadata columns - no stat), drops removed ones. Returns True if the index changed"""
+    if not _UPDATE_LOCK.acquire(False): # already running
+        return False
+    try:
+        return run_update()
+    finally:
+        _UPDATE_LOCK.release()
+
+
+def run_update():
+    """See update"""
+    global _LOADED, _TERMS, _GENERATION # pylint:disable=global-statement
+    if not _LOADED:
+        with _LOCK:
+            if not _LOADED and load_cache():
+                tools.debug_output(__name__, 'update', 'Loaded content index from cache ('+CACHE_PATH+', '+str(len(_DOCUMENT_IDS))+' documents)', 1)
+            _LOADED = True
+
+    file_index.load()
+    seen = set()
+    changes = [] # (path, mtime, size, terms or None)
+    for path, size, mtime in file_index.get_files():
+        if get_tokenizer(path) is None:
+            continue
+        seen.add(path)
+        document_id = _DOCUMENT_IDS.get(path)
+        if document_id is not None and _DOCUMENTS[document_id][1:3] == [mtime, size]:
+            continue
+        changes.append((path, mtime, size, get_terms(path, size)))
+    removed = [path for path in _DOCUMENT_IDS if path not in seen]
+    if not changes and not removed:
+        return False
+
+    with _LOCK:
+        remove_documents(set(_DOCUMENT_IDS[path] for path in removed) | set(_DOCUMENT_IDS[change[0]] for change in changes if change[0] in _DOCUMENT_IDS))
+        for path, mtime, size, terms in changes:
+            add_document(path, mtime, size, terms or {}) # unreadable & binary files are kept (without terms) - not read again until they change
+        _TERMS = None
+        _GENERATION += 1
+    save_cache()
+    tools.debug_output(__name__, 'update', 'Indexed '+str(len(changes))+' changed & dropped '+str(len(removed))+' removed files ('+str(len(_DOCUMENT_IDS))+' documents)', 1)
+    return True
+
+
+def update_in_background():
+    """Runs the first update on a daemon thread (unless it is running or done already)"""
+    global _UPDATER # pylint:disable=global-statement
+    if _UPDATER is None:
+        _UPDATER = threading.Thread(target=update, name='content_index')
+        _UPDATER.daemon = True
+        _UPDATER.start()
+
+
+def start_watcher(interval=REFRESH_INTERVAL):
+    """Builds the index in the background & keeps it fresh"""
+    global _WATCHER # pylint:disable=global-statement
+    update_in_background()
+    if _WATCHER is None:
+        _WATCHER = tools.start_background_task('content_index', interval, update)
+
+
+def stop_watcher():
+    """Stops the background updates"""
+    global _WATCHER # pylint:disable=global-statement
+    if _WATCHER is not None:
+        _WATCHER.set()
+        _WATCHER = None
+
+
+def is_updating():
+    """Checks if the first update is still running (results are incomplete)"""
+    return _UPDATER is not None and _UPDATER.is_alive()
+
+
+def get_generation():
+    """Returns a number which changes whenever the index got updated (for dependent caches)"""
+    return _GENERATION
+
+
+def expand_prefix(prefix):
+    """Returns the terms starting with prefix (call with _LOCK held)"""
+    global _TERMS # pylint:disable=global-statement
+    if _TERMS is None:
+        _TERMS = sorted(_POSTINGS)
+    position = bisect.bisect_left(_TERMS, prefix)
+    terms = []
+    while position < len(_TERMS) and _TERMS[position].startswith(prefix) and len(terms) < MAX_PREFIX_TERMS:
+        terms.append(_TERMS[position])
+        position += 1
+    return terms
+
+
+def search(query, limit=DEFAULT_LIMIT):
+    """Returns (paths of the best limit documents containing all query words - best first, amount of matching documents). Memory only.
+    The last word also matches as prefix (typing), documents are ranked by tf-idf normalized by their length"""
+    if isinstance(query, bytes): # python 2 str - the terms are unicode
+        query = query.decode('utf-8', 'replace')
+    words = [word for word in tokenize_text(query) if len(word) >= MIN_TOKEN_LENGTH]
+    if not words:
+        return [], 0
+
+    with _LOCK:
+        document_count = max(len(_DOCUMENT_IDS), 1)
+        word_postings = []
+        for position, word in enumerate(words):
+            terms = expand_prefix(word) if position == len(words) - 1 else [word]
+            word_postings.append([_POSTINGS[term] for term in terms if term in _POSTINGS])
+        word_postings.sort(key=lambda postings_list: sum(len(postings) for postings in postings_list)) # rarest word first - the candidates shrink fastest
+
+        scores = None
+        for postings_list in word_postings:
+            word_scores = {}
+            for postings in postings_list:
+                idf = math.log(1.0 + document_count / float(len(postings)))
+                for document_id, frequency in postings.items():
+                    if scores is None or document_id in scores:
+                        word_scores[document_id] = word_scores.get(document_id, 0.0) + (1.0 + math.log(frequency)) * idf
+            if scores is not None:
+                word_scores = dict((document_id, scores[document_id] + word_score) for document_id, word_score in word_scores.items())
+            scores = word_scores
+            if not scores:
+                return [], 0
+
+        ranked = sorted(scores, key=lambda document_id: -scores[document_id] / math.sqrt(max(_DOCUMENTS[document_id][3], 1)))
+        return [_DOCUMENTS[document_id][0] for document_id in ranked[:limit]], len(scores)
@@ -0,0 +1,400 @@
+#!/usr/bin/python
+"""Keeps an in-memory catalogue of all applications (XDG .desktop files) - persisted for a fast warm start"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import io
+import json
+import os
+import re
+import threading
+
+## apparat
+import constants
+import tools
+import trigram_index
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+CACHE_PATH = constants.APP_INI_FOLDER+'applications.cache'
+CACHE_VERSION = 3
+REFRESH_INTERVAL = 30 # seconds between two checks of the application directory mtimes
+
+## fields of an entry (compact list instead of dict - smaller cache)
+NAME, LOCALIZED_NAME, GENERIC_NAME, KEYWORDS, EXEC, ICON, NO_DISPLAY = range(7) # EXEC: list of arguments (field codes removed)
+
+FIELD_CODE = re.compile('%(.)') # %f, %U, %i, ... - %% is a literal %
+
+_LOCK = threading.Lock()
+_DIRECTORIES = None # list of [directory, desktop id prefix, mtime, {filename: [mtime, entry]}] in lookup order - None = not loaded yet
+_APPLICATIONS = {} # display name: (desktop id, search text, icon, [Exec= arguments])
+_LOWER_NAMES = {} # lower case display name: display name (the UI lower cases the chosen result)
+_SHADOWED = frozenset() # executables which are started by an application without arguments - listed as that application only
+_NAMES = [] # sorted display names of all visible applications
+_TRIGRAMS = trigram_index.TrigramIndex() # substring index of the search texts of _NAMES
+_GENERATION = 0 # increases whenever the catalogue changes
+_WATCHER = None
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def get_application_directories():
+    """Returns the application directories in lookup order (user directory first)"""
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(os.environ['HOME'], '.local/share')
+    data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+    directories = []
+    for data_dir in [data_home] + data_dirs.split(':'):
+        if data_dir:
+            directory = os.path.join(data_dir, 'applications')
+            if directory not in directories:
+                directories.append(directory)
+    return directories
+
+
+def get_locale_keys():
+    """Returns the locale suffixes to look for (i.e. Name[de_DE], Name[de]) - most specific first"""
+    locale = os.environ.get('LC_ALL') or os.environ.get('LC_MESSAGES') or os.environ.get('LANG') or ''
+    locale, _, modifier = locale.partition('@')
+    locale = locale.partition('.')[0] # strip encoding
+    language = locale.partition('_')[0]
+    keys = []
+    for key in (locale+'@'+modifier if modifier else None, locale, language+'@'+modifier if modifier else None, language):
+        if key and key not in ('C', 'POSIX') and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def get_mtime(path):
+    """Returns the mtime of path or None if it does not exist"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def split_exec(exec_value):
+    """Returns the arguments of an Exec= value - quotes & escapes resolved, field codes (%f, %U, ...) removed (no shlex: it can not handle unicode in python 2)"""
+    arguments = []
+    argument = None # None = between two arguments
+    quoted = False
+    characters = iter(exec_value.strip())
+    for char in characters:
+        if quoted:
+            if char == '"':
+                quoted = False
+            elif char == '\\':
+                argument += next(characters, '')
+            else:
+                argument += char
+        elif char == '"':
+            quoted = True
+            argument = argument or ''
+        elif char.isspace():
+            if argument is not None:
+                arguments.append(argument)
+                argument = None
+        else:
+            argument = (argument or '') + char
+    if argument is not None:
+        arguments.append(argument)
+
+    result = []
+    for argument in arguments:
+        stripped = FIELD_CODE.sub(lambda match: '%' if match.group(1) == '%' else '', argument)
+        if stripped or argument == '': # drop arguments which consisted of field codes only
+            result.append(stripped)
+    return result
+
+
+def get_exec_program(arguments):
+    """Returns the name of the program started by Exec= arguments (without path and env prefix)"""
+    for argument in arguments:
+        if argument == 'env' or '=' in argument: # env VAR=value program
+            continue
+        return os.path.basename(argument)
+    return ''
+
+
+def parse_desktop_file(path, locale_keys):
+    """Parses the [Desktop Entry] group of a .desktop file. Returns the entry or None if it is no launchable application"""
+    values = {}
+    in_entry_group = False
+    try:
+        with io.open(path, 'r', encoding='utf-8', errors='replace') as desktop_file:
+            for line in desktop_file:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if line.startswith('['):
+                    if in_entry_group:
+                        break # only the first group is of interest
+                    in_entry_group = line == '[Desktop Entry]'
+                    continue
+                if in_entry_group:
+                    key, _, value = line.partition('=')
+                    values[key.strip()] = value.strip()
+    except (IOError, OSError):
+        return None
+
+    if values.get('Type') != 'Application' or values.get('Hidden') == 'true' or not values.get('Exec'):
+        return None
+
+    def get_localized(key):
+        """Returns the value of key in the users language (or None)"""
+        for locale_key in locale_keys:
+            if key+'['+locale_key+']' in values:
+                return values[key+'['+locale_key+']']
+        return None
+
+    keywords = values.get('Keywords', '')+';'+(get_localized('Keywords') or '')
+    return [
+        values.get('Name', ''),
+        get_localized('Name'),
+        get_localized('GenericName') or values.get('GenericName', ''),
+        ' '.join(keyword for keyword in keywords.split(';') if keyword),
+        split_exec(values['Exec']),
+        values.get('Icon', ''),
+        values.get('NoDisplay') == 'true',
+    ]
+
+
+def scan_directory(directory, prefix, old_files, locale_keys):
+    """Returns ({filename: [mtime, entry]}, [subdirectories]) - re-parses only files whose mtime changed"""
+    files = {}
+    subdirectories = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return files, subdirectories
+
+    for name in names:
+        path = os.path.join(directory, name)
+        if name.endswith('.desktop'):
+            mtime = get_mtime(path)
+            old_file = old_files.get(name)
+            if old_file is not None and old_file[0] == mtime:
+                files[name] = old_file
+            else:
+                files[name] = [mtime, parse_desktop_file(path, locale_keys)]
+        elif os.path.isdir(path):
+            subdirectories.append((path, prefix+name+'-')) # desktop id of sub/foo.desktop is sub-foo.desktop
+    return files, subdirectories
+
+
+def scan(old_directories, locale_keys):
+    """Returns the directory table - re-scans only those directories whose mtime changed. Returns (directories, changed)"""
+    old_directories = old_directories or []
+    old_entries = dict((d[0], d) for d in old_directories)
+    directories = []
+    changed = False
+    pending = [(directory, '') for directory in get_application_directories()]
+    while pending:
+        directory, prefix = pending.pop(0)
+        mtime = get_mtime(directory)
+        old_entry = old_entries.get(directory)
+        if old_entry is not None and old_entry[2] == mtime:
+            directories.append(old_entry)
+            subdirectories = [(d[0], d[1]) for d in old_directories if os.path.dirname(d[0]) == directory] # i.e. kde4/
+        else:
+            files, subdirectories = scan_directory(directory, prefix, old_entry[3] if old_entry else {}, locale_keys)
+            directories.append([directory, prefix, mtime, files])
+            changed = True
+        pending = subdirectories + pending
+    if len(directories) != len(old_entries):
+        changed = True
+    return directories, changed
+
+
+def build_lookup_tables(directories, trigrams=None):
+    """Updates the display name->application map and its trigram index (unless a deserialized one is given) from the directory table"""
+    global _DIRECTORIES, _APPLICATIONS, _LOWER_NAMES, _SHADOWED, _NAMES, _TRIGRAMS, _GENERATION # pylint:disable=global-statement
+    seen = set()
+    applications = {}
+    lower_names = {}
+    shadowed = set()
+    for _, prefix, _, files in directories:
+        for filename in sorted(files):
+            entry = files[filename][1]
+            desktop_id = prefix+filename
+            if desktop_id in seen: # the first directory wins (user overrides)
+                continue
+            seen.add(desktop_id)
+            if entry is None or entry[NO_DISPLAY] or not entry[EXEC]:
+                continue
+
+            ## applications are keyed by their (unique) display name - i.e. LibreOffice Writer & Calc share an executable, all flatpaks share one
+            desktop_name = desktop_id[:-len('.desktop')]
+            name = entry[LOCALIZED_NAME] or entry[NAME] or desktop_name
+            if name.lower() in lower_names:
+                name = name+' ('+desktop_name+')'
+            program = get_exec_program(entry[EXEC])
+            search_text = ' '.join(text for text in [name, program, desktop_name] + entry[NAME:KEYWORDS+1] if text).lower() # names, program & keywords
+            applications[name] = (desktop_id, search_text, entry[ICON], entry[EXEC])
+            lower_names[name.lower()] = name
+            if len(entry[EXEC]) == 1:
+                shadowed.add(program)
+    names = sorted(applications)
+    search_texts = [applications[name][1] for name in names]
+    if trigrams is None or trigrams.texts != search_texts:
+        trigrams = trigram_index.TrigramIndex(search_texts)
+
+    ## swap in one go
+    _DIRECTORIES = directories
+    _APPLICATIONS = applications
+    _LOWER_NAMES = lower_names
+    _SHADOWED = frozenset(shadowed)
+    _NAMES = names
+    _TRIGRAMS = trigrams
+    _GENERATION += 1
+
+
+def load_cache(locale_keys):
+    """Returns (directory table, trigram index) from the on-disk cache (or None)"""
+    try:
+        with open(CACHE_PATH, 'r') as cache_file:
+            cache = json.load(cache_file)
+    except (IOError, ValueError):
+        return None
+
+    if cache.get('version') != CACHE_VERSION or cache.get('locale') != locale_keys:
+        return None
+    return cache['directories'], trigram_index.TrigramIndex.from_dict(cache['trigrams'])
+
+
+def save_cache(directories, locale_keys):
+    """Writes the directory table & the trigram index to the on-disk cache (write & rename)"""
+    temp_path = CACHE_PATH+'.tmp'
+    try:
+        with open(temp_path, 'w') as cache_file:
+            json.dump({'version': CACHE_VERSION, 'locale': locale_keys, 'directories': directories, 'trigrams': _TRIGRAMS.to_dict()}, cache_file, separators=(',', ':'))
+        os.rename(temp_path, CACHE_PATH)
+    except (IOError, OSError):
+        tools.debug_output(__name__, 'save_cache', 'Unable to write '+CACHE_PATH, 3)
+
+
+def load():
+    """Loads the catalogue - from the on-disk cache (re-scanning changed directories only) or by parsing all .desktop files"""
+    with _LOCK:
+        if _DIRECTORIES is not None:
+            return
+
+        locale_keys = get_locale_keys()
+        cache = load_cache(locale_keys)
+        directories, changed = scan(cache[0] if cache else None, locale_keys)
+        build_lookup_tables(directories, None if changed else cache[1])
+        if changed:
+            save_cache(directories, locale_keys)
+        tools.debug_output(__name__, 'load', 'Indexed '+str(len(_NAMES))+' applications', 1)
+
+
+def refresh_if_stale():
+    """Re-scans only those application directories whose mtime changed. Returns True if the catalogue changed"""
+    load()
+    with _LOCK:
+        locale_keys = get_locale_keys()
+        directories, changed = scan(_DIRECTORIES, locale_keys)
+        if not changed:
+            return False
+        tools.debug_output(__name__, 'refresh_if_stale', 'Application directories changed', 1)
+        build_lookup_tables(directories)
+        save_cache(directories, locale_keys)
+        return True
+
+
+def start_watcher(interval=REFRESH_INTERVAL):
+    """Keeps the catalogue fresh by checking the application directory mtimes in the background"""
+    global _WATCHER # pylint:disable=global-statement
+    if _WATCHER is None:
+        _WATCHER = tools.start_background_task('desktop_index', interval, refresh_if_stale)
+
+
+def stop_watcher():
+    """Stops the background freshness check"""
+    global _WATCHER # pylint:disable=global-statement
+    if _WATCHER is not None:
+        _WATCHER.set()
+        _WATCHER = None
+
+
+def get_names():
+    """Returns the sorted display names of all visible applications (memory only)"""
+    if _DIRECTORIES is None:
+        load()
+    return _NAMES
+
+
+def get_application(name):
+    """Returns (desktop id, search text, icon, [Exec= arguments]) of the application with the display name (case insensitive) or None"""
+    if _DIRECTORIES is None:
+        load()
+    application = _APPLICATIONS.get(name)
+    if application is None:
+        application = _APPLICATIONS.get(_LOWER_NAMES.get(name.lower()))
+    return application
+
+
+def resolve_name(name):
+    """Returns the display name of the application called name (case insensitive) or None"""
+    if _DIRECTORIES is None:
+        load()
+    return name if name in _APPLICATIONS else _LOWER_NAMES.get(name.lower())
+
+
+def get_search_text(name):
+    """Returns the lower case names, program & keywords of the application with the display name (or name itself in lower case)"""
+    application = _APPLICATIONS.get(name)
+    return name.lower() if application is None else application[1]
+
+
+def has_application(name):
+    """Checks if name is the display name of a visible application"""
+    return get_application(name) is not None
+
+
+def get_command(name):
+    """Returns the Exec= arguments (field codes removed) of the application with the display name (or None)"""
+    application = get_application(name)
+    return None if application is None else list(application[3])
+
+
+def get_program(name):
+    """Returns the program started by the application with the display name (or name itself) - i.e. to look for running instances"""
+    application = get_application(name)
+    return name if application is None else get_exec_program(application[3])
+
+
+def get_icon_name(name):
+    """Returns the Icon= value of the application with the display name (or None)"""
+    application = get_application(name)
+    if application is None or application[2] == '':
+        return None
+    return application[2]
+
+
+def get_shadowed_executables():
+    """Returns the executables which are started by an application without any arguments - they are listed as that application only"""
+    if _DIRECTORIES is None:
+        load()
+    return _SHADOWED
+
+
+def get_generation():
+    """Returns a number which changes whenever the catalogue got updated (for dependent caches)"""
+    return _GENERATION
+
+
+def filter_names(query, names=None):
+    """Returns the display names of all applications (or all of the given names) whose names, program or keywords contain query (lower case).
+    All applications are looked up via the trigram index - queries shorter than 3 chars match word starts only"""
+    if names is None:
+        if _DIRECTORIES is None:
+            load()
+        names, trigrams = _NAMES, _TRIGRAMS
+        return [names[name_id] for name_id in trigrams.search(query)]
+    return [name for name in names if query in get_search_text(name)]
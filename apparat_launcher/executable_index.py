@@ -0,0 +1,223 @@
+#!/usr/bin/python
+"""Keeps an in-memory index of all executables in $PATH (persisted for a fast warm start)"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import json
+import os
+import stat
+import threading
+
+## apparat
+import constants
+import tools
+import trigram_index
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+CACHE_PATH = constants.APP_INI_FOLDER+'executables.cache'
+CACHE_VERSION = 2
+REFRESH_INTERVAL = 10 # seconds between two checks of the $PATH directory mtimes
+
+_LOCK = threading.Lock()
+_DIRECTORIES = None # list of [directory, mtime, [names]] in $PATH order - None = not loaded yet
+_EXECUTABLES = {} # name: directory (the first directory in $PATH wins)
+_NAMES = [] # sorted executable names
+_TRIGRAMS = trigram_index.TrigramIndex() # substring index of _NAMES
+_GENERATION = 0 # increases whenever the index changes
+_WATCHER = None
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def get_path_directories():
+    """Returns the directories of $PATH in order (without duplicates)"""
+    directories = []
+    for directory in os.environ.get('PATH', '').split(os.pathsep):
+        directory = os.path.expanduser(directory.strip('"'))
+        if directory and directory not in directories:
+            directories.append(directory)
+    return directories
+
+
+def get_directory_mtime(directory):
+    """Returns the mtime of a directory or None if it does not exist"""
+    try:
+        return os.stat(directory).st_mtime
+    except OSError:
+        return None
+
+
+def scan_directory(directory):
+    """Returns all regular files with executable bit in directory"""
+    names = []
+    try:
+        entries = os.listdir(directory)
+    except OSError:
+        return names
+
+    for name in entries:
+        try:
+            mode = os.stat(os.path.join(directory, name)).st_mode # follows symlinks
+        except OSError: # dangling symlink
+            continue
+        if stat.S_ISREG(mode) and mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH):
+            names.append(name)
+    names.sort()
+    return names
+
+
+def build_lookup_tables(directories, trigrams=None):
+    """Updates the name->directory map, the sorted name list and its trigram index (unless a deserialized one is given) from the directory table"""
+    global _DIRECTORIES, _EXECUTABLES, _NAMES, _TRIGRAMS, _GENERATION # pylint:disable=global-statement
+    executables = {}
+    for directory, _, names in directories:
+        for name in names:
+            if name not in executables: # honour $PATH precedence
+                executables[name] = directory
+    names = sorted(executables)
+    if trigrams is None or trigrams.texts != [name.lower() for name in names]:
+        trigrams = trigram_index.TrigramIndex(names)
+
+    ## swap in one go - readers never see a half-built index
+    _DIRECTORIES = directories
+    _EXECUTABLES = executables
+    _NAMES = names
+    _TRIGRAMS = trigrams
+    _GENERATION += 1
+
+
+def load_cache():
+    """Returns (directory table, trigram index) from the on-disk cache (or None)"""
+    try:
+        with open(CACHE_PATH, 'r') as cache_file:
+            cache = json.load(cache_file)
+    except (IOError, ValueError):
+        return None
+
+    if cache.get('version') != CACHE_VERSION:
+        return None
+    return [[directory, mtime, names] for directory, mtime, names in cache['directories']], trigram_index.TrigramIndex.from_dict(cache['trigrams'])
+
+
+def save_cache(directories):
+    """Writes the directory table & the trigram index to the on-disk cache (write & rename)"""
+    temp_path = CACHE_PATH+'.tmp'
+    try:
+        with open(temp_path, 'w') as cache_file:
+            json.dump({'version': CACHE_VERSION, 'directories': directories, 'trigrams': _TRIGRAMS.to_dict()}, cache_file, separators=(',', ':'))
+        os.rename(temp_path, CACHE_PATH)
+    except (IOError, OSError):
+        tools.debug_output(__name__, 'save_cache', 'Unable to write '+CACHE_PATH, 3)
+
+
+def load():
+    """Loads the index - from the on-disk cache if possible, otherwise by scanning $PATH"""
+    with _LOCK:
+        if _DIRECTORIES is not None:
+            return
+
+        cache = load_cache()
+        if cache is not None and [d[0] for d in cache[0]] == get_path_directories():
+            tools.debug_output(__name__, 'load', 'Loaded executable index from cache ('+CACHE_PATH+')', 1)
+            build_lookup_tables(*cache)
+            return
+
+        tools.debug_output(__name__, 'load', 'Scanning all $PATH directories', 1)
+        directories = [[d, get_directory_mtime(d), scan_directory(d)] for d in get_path_directories()]
+        build_lookup_tables(directories)
+        save_cache(directories)
+        tools.debug_output(__name__, 'load', 'Indexed '+str(len(_NAMES))+' executables', 1)
+
+
+def refresh_if_stale():
+    """Re-scans only those $PATH directories whose mtime changed. Returns True if the index changed"""
+    load()
+    with _LOCK:
+        old_directories = dict((d[0], d) for d in _DIRECTORIES)
+        directories = []
+        changed = False
+        for directory in get_path_directories():
+            mtime = get_directory_mtime(directory)
+            old_entry = old_directories.get(directory)
+            if old_entry is not None and old_entry[1] == mtime:
+                directories.append(old_entry)
+            else:
+                tools.debug_output(__name__, 'refresh_if_stale', 'Re-scanning '+directory, 1)
+                directories.append([directory, mtime, scan_directory(directory)])
+                changed = True
+
+        if changed is False and len(directories) == len(old_directories):
+            return False
+
+        build_lookup_tables(directories)
+        save_cache(directories)
+        return True
+
+
+def start_watcher(interval=REFRESH_INTERVAL):
+    """Keeps the index fresh by checking the $PATH directory mtimes in the background"""
+    global _WATCHER # pylint:disable=global-statement
+    if _WATCHER is None:
+        _WATCHER = tools.start_background_task('executable_index', interval, refresh_if_stale)
+
+
+def stop_watcher():
+    """Stops the background freshness check"""
+    global _WATCHER # pylint:disable=global-statement
+    if _WATCHER is not None:
+        _WATCHER.set()
+        _WATCHER = None
+
+
+def get_names():
+    """Returns the sorted list of all known executable names (memory only)"""
+    if _DIRECTORIES is None:
+        load()
+    return _NAMES
+
+
+def get_directory(name):
+    """Returns the $PATH directory which provides the executable name (or None)"""
+    if _DIRECTORIES is None:
+        load()
+    return _EXECUTABLES.get(name)
+
+
+def resolve(name):
+    """Returns the absolute path of the executable name (or None) - replaces forking a shell for 'type' and scanning $PATH per lookup.
+    A miss re-checks the $PATH directory mtimes first (the executable might have been installed since the last refresh)"""
+    if os.sep in name: # a path - check it directly
+        path = os.path.abspath(os.path.expanduser(name))
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+        return None
+    directory = get_directory(name)
+    if directory is None and refresh_if_stale():
+        directory = get_directory(name)
+    if directory is None:
+        return None
+    return os.path.join(directory, name)
+
+
+def get_generation():
+    """Returns a number which changes whenever the index got updated (for dependent caches)"""
+    return _GENERATION
+
+
+def filter_names(query, names=None):
+    """Returns all executable names (or all of the given names) containing query (case insensitive).
+    All names are looked up via the trigram index - queries shorter than 3 chars match word starts only"""
+    if names is None:
+        if _DIRECTORIES is None:
+            load()
+        names, trigrams = _NAMES, _TRIGRAMS
+        return [names[name_id] for name_id in trigrams.search(query)]
+    query = query.lower()
+    return [name for name in names if query in name.lower()]
@@ -0,0 +1,177 @@
+#!/usr/bin/python
+"""Parallel directory crawler - readdir with d_type (scandir) on a thread pool, directories with an unchanged mtime are not listed again.
+Only files of listed directories get an lstat (their size & mtime are metadata columns of the file index) - unchanged directories only if the caller asks for it (restat)"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import os
+import stat
+import threading
+import time
+
+try:
+    import Queue as queue # python 2
+except ImportError:
+    import queue
+
+try:
+    from os import scandir # python >= 3.5
+except ImportError:
+    try:
+        from scandir import scandir # optional backport for python 2
+    except ImportError:
+        scandir = None # listdir & lstat of every entry
+
+## apparat
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+WORKERS = 8 # readdir is I/O bound (SSD queue depth, NFS round trips) - threads overlap it despite the GIL
+QUEUE_SIZE = 1024 # pending directories - a worker lists subdirectories itself if the queue is full
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def get_directory_mtime(directory):
+    """Returns the mtime of a directory or None if it does not exist (or is no directory)"""
+    try:
+        status = os.lstat(directory)
+    except OSError:
+        return None
+    if not stat.S_ISDIR(status.st_mode):
+        return None
+    return status.st_mtime
+
+
+def list_directory(directory):
+    """Returns ([subdirectory names], [file names], [file sizes], [file mtimes]) of directory - symlinks are files, they are not followed.
+    Uses the file type of the directory entry (d_type) if scandir is available - subdirectories need no stat"""
+    subdirectories = []
+    files = [] # (name, size, mtime)
+    try:
+        if scandir is not None:
+            for entry in scandir(directory):
+                try:
+                    if entry.is_dir(follow_symlinks=False): # stats only if the filesystem reports no d_type
+                        subdirectories.append(entry.name)
+                        continue
+                    status = entry.stat(follow_symlinks=False)
+                except OSError: # removed in the meantime
+                    continue
+                files.append((entry.name, status.st_size, status.st_mtime))
+        else:
+            for name in os.listdir(directory):
+                try:
+                    status = os.lstat(os.path.join(directory, name))
+                except OSError: # removed in the meantime
+                    continue
+                if stat.S_ISDIR(status.st_mode):
+                    subdirectories.append(name)
+                else:
+                    files.append((name, status.st_size, status.st_mtime))
+    except OSError:
+        return [], [], [], []
+    subdirectories.sort()
+    files.sort()
+    return subdirectories, [name for name, _, _ in files], [size for _, size, _ in files], [mtime for _, _, mtime in files]
+
+
+def get_file_metadata(directory, files):
+    """Returns ([file sizes], [file mtimes]) of the files of a directory (lstat, no readdir) or None if one of them is gone"""
+    sizes = []
+    mtimes = []
+    for name in files:
+        try:
+            status = os.lstat(os.path.join(directory, name))
+        except OSError:
+            return None
+        sizes.append(status.st_size)
+        mtimes.append(status.st_mtime)
+    return sizes, mtimes
+
+
+def crawl(root, old_directories, is_excluded, workers=WORKERS, on_visit=None, restat=None):
+    """Crawls root on a pool of worker threads. Directories whose mtime did not change since old_directories keep their entries (a stat instead of a listing),
+    is_excluded(path) skips a directory with everything below it, on_visit(directory, entry) gets called (on a worker thread) for every visited directory.
+    restat(directory) selects unchanged directories whose files get an lstat (files written in place keep the directory mtime).
+    Returns (directory table {directory: [mtime, [subdirectory names], [file names], [file sizes], [file mtimes]]}, set of changed directories - listed or with changed files)"""
+    directories = {}
+    changed = set()
+    counter_lock = threading.Lock()
+    counters = {'listed': 0, 'updated': 0, 'files': 0}
+    pending = queue.Queue(maxsize=QUEUE_SIZE)
+    start = time.time()
+
+    def visit(directory):
+        """Adds directory to the table & returns the paths of its subdirectories"""
+        mtime = get_directory_mtime(directory)
+        if mtime is None:
+            return []
+        entry = old_directories.get(directory)
+        listed = entry is None or entry[0] != mtime # entries got added, removed or renamed
+        updated = False
+        if not listed and restat is not None and restat(directory): # a file written in place does not change the directory mtime - refresh the size & mtime of the files
+            metadata = get_file_metadata(directory, entry[2])
+            if metadata is None:
+                listed = True
+            elif metadata[0] != entry[3] or metadata[1] != entry[4]:
+                entry = entry[:3] + list(metadata) # new entry - the old table stays untouched
+                updated = True
+        if listed:
+            entry = [mtime] + list(list_directory(directory))
+        directories[directory] = entry # single dict assignment - atomic
+        if on_visit is not None:
+            on_visit(directory, entry)
+        with counter_lock:
+            counters['listed'] += listed
+            counters['updated'] += updated
+            counters['files'] += len(entry[2])
+            if listed or updated:
+                changed.add(directory)
+        return [os.path.join(directory, name) for name in entry[1]]
+
+    def run_worker():
+        """Takes directories from the queue until it gets None. Subdirectories go to the queue - or are visited right away if it is full"""
+        while True:
+            directory = pending.get()
+            if directory is None:
+                pending.task_done()
+                return
+            try:
+                local = [directory]
+                while local:
+                    for subdirectory in visit(local.pop()):
+                        if is_excluded(subdirectory):
+                            continue
+                        try:
+                            pending.put_nowait(subdirectory)
+                        except queue.Full: # a blocking put could deadlock the pool
+                            local.append(subdirectory)
+            except Exception as error: # pylint:disable=broad-except
+                tools.debug_output(__name__, 'crawl', 'Crawling below '+directory+' failed: '+str(error), 3)
+            finally:
+                pending.task_done()
+
+    threads = [threading.Thread(target=run_worker, name='file_crawler') for _ in range(max(workers, 1))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    pending.put(root)
+    pending.join() # all directories visited
+    for _ in threads:
+        pending.put(None)
+    for thread in threads:
+        thread.join()
+
+    duration = max(time.time() - start, 0.001)
+    tools.debug_output(__name__, 'crawl', 'Crawled '+str(len(directories))+' directories ('+str(counters['listed'])+' listed, '+str(counters['updated'])+' with changed files) & '+str(counters['files'])+' files in '+str(round(duration, 2))+'s: '
+                       + str(int(len(directories) / duration))+' directories/s, '+str(int(counters['files'] / duration))+' files/s ('+str(len(threads))+' threads, '+('scandir' if scandir is not None else 'listdir')+')', 1)
+    return directories, changed
@@ -0,0 +1,401 @@
+#!/usr/bin/python
+"""Locate-style index of all files & directories in the home directory (persisted as a front-coded path table, kept fresh by incremental rescans).
+Size, mtime, extension & type of every path are kept in typed columns - metadata filters never stat.
+Rescans patch the changed directories in as a small delta index (their rows of the base index are masked) - the base index & its cache get rebuilt at most every REBUILD_INTERVAL"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import array
+import os
+import threading
+import time
+
+## apparat
+import constants
+import file_crawler
+import ini
+import tools
+import trigram_index
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+CACHE_PATH = constants.APP_INI_FOLDER+'files.index'
+CACHE_HEADER = 'apparat file index 2' # first line of the cache - change it if the format changes
+REFRESH_INTERVAL = 60 # seconds between two incremental rescans
+REBUILD_INTERVAL = 1800 # seconds between two full rebuilds (& cache writes) caused by rescans - changes in between go to the delta index
+DELTA_LIMIT = 50000 # paths in the delta index which trigger an early rebuild
+METADATA_SLICE = 20000 # files of unchanged directories which get an lstat per rescan (written in place) - all of them within file count / METADATA_SLICE rescans (1M files: 50 minutes)
+STREAM_FIRST_BATCH = 0.05 # seconds until the first matches of a search during the initial crawl are handed out
+STREAM_BATCH_INTERVAL = 0.2 # seconds between the following batches
+STREAM_POLL_INTERVAL = 0.01 # seconds between two looks at the crawl progress
+
+COLUMNS = {'size': 'd', 'mtime': 'd', 'extension': 'I', 'is_dir': 'B'} # metadata column: array typecode (sizes as double - exact up to 8 PB on every platform)
+FILTER_ORDER = ('extension', 'is_dir', 'size', 'mtime') # cheapest & usually most selective first
+
+EXCLUDE = set(['.cache', '.dbus', '.dropbox', '.dropbox-dist', '.local/share/Trash']) # directory names or paths relative to the home directory
+
+_LOCK = threading.Lock()
+_DIRECTORIES = None # directory path: [mtime, [subdirectory names], [file names], [file sizes], [file mtimes]] - None = not loaded yet
+_FILES = (None, None, frozenset()) # (base part, delta part, directories whose rows of the base part are masked) - swapped as one tuple, parts see build_part
+_PENDING = set() # directories changed or removed since the last full rebuild - their current rows are in the delta part
+_REBUILT = 0 # time of the last full rebuild
+_GENERATION = 0 # increases whenever the index changes
+_WATCHER = None
+_LOADER = None # thread loading the index in the background
+_LOADER_LOCK = threading.Lock() # _LOCK is held during the whole load
+_CRAWLED = None # (directory, [subdirectory & file names]) visited so far by the initial crawl - None = no initial crawl running
+_RESCANS = 0 # rescans so far - selects the slice of unchanged directories whose files get an lstat
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def get_home_directory():
+    """Returns the root of the index"""
+    return os.environ['HOME']
+
+
+def get_excludes(home_directory):
+    """Returns the directory names & paths (relative to home) which are not indexed - EXCLUDE plus the comma separated search_local_exclude preference"""
+    excludes = set(EXCLUDE)
+    for exclude in ini.read_single_ini_value('General', 'search_local_exclude').split(','):
+        exclude = exclude.strip().rstrip(os.sep)
+        if exclude.startswith('~') or exclude.startswith(os.sep): # absolute path
+            exclude = os.path.relpath(os.path.expanduser(exclude), home_directory)
+        if exclude:
+            excludes.add(exclude)
+    return excludes
+
+
+def is_excluded(home_directory, excludes, path):
+    """Checks if a directory is on the exclude list (by name or by its path relative to home) - or is the apparat config folder (the index itself lives there)"""
+    return os.path.basename(path) in excludes or os.path.relpath(path, home_directory) in excludes or path == constants.APP_INI_FOLDER.rstrip(os.sep)
+
+
+def scan(old_directories, on_visit=None, restat=None):
+    """Crawls the home directory. Directories whose mtime did not change since old_directories keep their entries (the files of those selected by restat(directory) get an lstat),
+    on_visit(directory, entry) sees every directory. Returns (directory table, number of changed directories)"""
+    home_directory = get_home_directory()
+    excludes = get_excludes(home_directory)
+    return file_crawler.crawl(home_directory, old_directories, lambda path: is_excluded(home_directory, excludes, path), on_visit=on_visit, restat=restat)
+
+
+def get_restat_slice(file_count):
+    """Returns restat(directory) for the next rescan - a rotating slice of the directories with about METADATA_SLICE files, every directory once per file count / METADATA_SLICE rescans"""
+    global _RESCANS # pylint:disable=global-statement
+    _RESCANS += 1
+    slices = max(1, file_count // METADATA_SLICE)
+    current = _RESCANS % slices
+    return lambda directory: hash(directory) % slices == current
+
+
+def get_extension(name):
+    """Returns the lowercase extension of a file name without the dot ('' if there is none)"""
+    return os.path.splitext(name)[1][1:].lower()
+
+
+def build_part(directories, keys):
+    """Returns (paths - each directory followed by its files, trigram index of the names, metadata columns {column: array} aligned with the paths, extension: id,
+    owner directory of every path) for the directories keys of the directory table. A directory row belongs to the directory itself, file rows to their directory"""
+    paths = []
+    names = []
+    owners = []
+    values = dict((column, []) for column in COLUMNS)
+    extension_ids = {'': 0}
+    for directory in sorted(keys):
+        mtime, _, files, sizes, mtimes = directories[directory]
+        if os.path.dirname(directory) in directories: # not the root of the index
+            paths.append(directory)
+            names.append(os.path.basename(directory))
+            owners.append(directory)
+            values['size'].append(0)
+            values['mtime'].append(mtime)
+            values['extension'].append(0)
+            values['is_dir'].append(1)
+        for filename, size, file_mtime in zip(files, sizes, mtimes):
+            paths.append(os.path.join(directory, filename))
+            names.append(filename)
+            owners.append(directory)
+            values['size'].append(size)
+            values['mtime'].append(file_mtime)
+            values['extension'].append(extension_ids.setdefault(get_extension(filename), len(extension_ids)))
+            values['is_dir'].append(0)
+    columns = dict((column, array.array(typecode, values[column])) for column, typecode in COLUMNS.items())
+    return paths, trigram_index.TrigramIndex(names), columns, extension_ids, owners
+
+
+def build_lookup_tables(directories):
+    """Rebuilds the path list, the trigram index of the names & the metadata columns from the directory table (empty delta part)"""
+    global _DIRECTORIES, _FILES, _GENERATION, _PENDING, _REBUILT # pylint:disable=global-statement
+    base = build_part(directories, directories)
+
+    ## swap in one go - readers never see a half-built index
+    _FILES = (base, build_part(directories, []), frozenset())
+    _PENDING = set()
+    _REBUILT = time.time()
+    _DIRECTORIES = directories # last - marks the index as loaded
+    _GENERATION += 1
+
+
+def update_lookup_tables(directories, changed):
+    """Patches the changed (or removed) directories in: their base rows get masked, their current rows go to the delta part (rebuilt from all pending directories)"""
+    global _DIRECTORIES, _FILES, _GENERATION # pylint:disable=global-statement
+    _PENDING.update(changed)
+    delta = build_part(directories, [directory for directory in _PENDING if directory in directories])
+    _FILES = (_FILES[0], delta, frozenset(_PENDING))
+    _DIRECTORIES = directories
+    _GENERATION += 1
+
+
+def get_path_count():
+    """Returns the number of indexed paths (files & directories)"""
+    base, delta, _ = _FILES
+    return len(base[0]) + len(delta[0]) if base is not None else 0
+
+
+def is_storable(path):
+    """Checks if a path can be stored in the line based cache"""
+    return '\n' not in path and '\t' not in path
+
+
+def iter_front_coded(paths):
+    """Yields (path, length of the prefix shared with the previous path, rest of the path) for sorted paths"""
+    previous = ''
+    for path in paths:
+        shared = 0
+        limit = min(len(path), len(previous))
+        while shared < limit and path[shared] == previous[shared]:
+            shared += 1
+        yield path, shared, path[shared:]
+        previous = path
+
+
+def load_cache():
+    """Returns the directory table from the on-disk cache (or None)"""
+    directories = {}
+    previous = ''
+    try:
+        with open(CACHE_PATH, 'r') as cache_file:
+            if cache_file.readline().rstrip('\n') != CACHE_HEADER:
+                return None
+            for line in cache_file:
+                fields = line.rstrip('\n').split('\t')
+                path = previous[:int(fields[0])] + fields[1]
+                previous = path
+                if path.endswith(os.sep): # directory: carries its mtime
+                    directory = os.path.dirname(path)
+                    directories[directory] = [float(fields[2]), [], [], [], []]
+                    parent = directories.get(os.path.dirname(directory))
+                    if parent is not None and directory != os.path.dirname(directory):
+                        parent[1].append(os.path.basename(directory))
+                else: # file: carries its size & mtime
+                    entry = directories[os.path.dirname(path)]
+                    entry[2].append(os.path.basename(path))
+                    entry[3].append(int(fields[2]))
+                    entry[4].append(float(fields[3]))
+    except (IOError, ValueError, IndexError, KeyError):
+        tools.debug_output(__name__, 'load_cache', 'Unable to read '+CACHE_PATH, 2)
+        return None
+    return directories
+
+
+def save_cache(directories):
+    """Writes the directory table as sorted, front-coded path list (directories end with a separator & carry their mtime, files their size & mtime) - write & rename"""
+    fields = {} # path: fields after the path
+    for directory, (mtime, subdirectories, files, sizes, mtimes) in directories.items():
+        if not is_storable(directory):
+            continue
+        if not all(is_storable(name) for name in subdirectories + files):
+            mtime = 0 # names which can not be stored - the directory gets re-scanned after the next load
+        fields[os.path.join(directory, '')] = repr(mtime)
+        for filename, size, file_mtime in zip(files, sizes, mtimes):
+            if is_storable(filename):
+                fields[os.path.join(directory, filename)] = str(size)+'\t'+repr(file_mtime)
+
+    temp_path = CACHE_PATH+'.tmp'
+    try:
+        with open(temp_path, 'w') as cache_file:
+            cache_file.write(CACHE_HEADER+'\n')
+            for path, shared, rest in iter_front_coded(sorted(fields)):
+                cache_file.write(str(shared)+'\t'+rest+'\t'+fields[path]+'\n')
+        os.rename(temp_path, CACHE_PATH)
+    except (IOError, OSError):
+        tools.debug_output(__name__, 'save_cache', 'Unable to write '+CACHE_PATH, 3)
+
+
+def load():
+    """Loads the index - from the on-disk cache if possible, otherwise by walking the home directory (its progress is visible in _CRAWLED)"""
+    global _CRAWLED # pylint:disable=global-statement
+    if _DIRECTORIES is not None:
+        return
+    with _LOCK:
+        if _DIRECTORIES is not None:
+            return
+
+        directories = load_cache()
+        if directories is not None and get_home_directory() in directories:
+            build_lookup_tables(directories)
+            tools.debug_output(__name__, 'load', 'Loaded file index from cache ('+CACHE_PATH+', '+str(get_path_count())+' paths)', 1)
+            return
+
+        tools.debug_output(__name__, 'load', 'Indexing the home directory', 1)
+        crawled = _CRAWLED = []
+        try:
+            directories, _ = scan({}, lambda directory, entry: crawled.append((directory, entry[1] + entry[2]))) # list.append is atomic
+            build_lookup_tables(directories)
+        finally:
+            _CRAWLED = None
+        save_cache(directories)
+        tools.debug_output(__name__, 'load', 'Indexed '+str(get_path_count())+' paths in '+str(len(directories))+' directories', 1)
+
+
+def load_in_background():
+    """Loads the index on a daemon thread (unless it is loaded or being loaded already). Returns the loader thread (or None)"""
+    global _LOADER # pylint:disable=global-statement
+    if _DIRECTORIES is not None:
+        return None
+    with _LOADER_LOCK:
+        if _LOADER is None or not _LOADER.is_alive():
+            _LOADER = threading.Thread(target=load, name='file_index')
+            _LOADER.daemon = True
+            _LOADER.start()
+        return _LOADER
+
+
+def refresh_if_stale():
+    """Re-lists only those directories whose mtime changed (all others get a stat, the files of a rotating slice of them too) & patches them into the delta part.
+    Rebuilds the whole index & rewrites the cache only every REBUILD_INTERVAL or if the delta part outgrows DELTA_LIMIT. Returns True if the index changed"""
+    load()
+    with _LOCK:
+        directories, changed = scan(_DIRECTORIES, restat=get_restat_slice(get_path_count()))
+        changed.update(directory for directory in _DIRECTORIES if directory not in directories) # removed
+        if not changed:
+            return False
+
+        tools.debug_output(__name__, 'refresh_if_stale', str(len(changed))+' directories changed', 1)
+        update_lookup_tables(directories, changed)
+        if time.time() - _REBUILT >= REBUILD_INTERVAL or len(_FILES[1][0]) > DELTA_LIMIT:
+            tools.debug_output(__name__, 'refresh_if_stale', 'Rebuilding the index ('+str(len(_PENDING))+' directories changed since the last rebuild)', 1)
+            build_lookup_tables(directories)
+            save_cache(directories) # until then a restart re-lists the changed directories - their mtime differs from the cache
+        return True
+
+
+def start_watcher(interval=REFRESH_INTERVAL):
+    """Keeps the index fresh by incremental rescans in the background"""
+    global _WATCHER # pylint:disable=global-statement
+    if _WATCHER is None:
+        _WATCHER = tools.start_background_task('file_index', interval, refresh_if_stale)
+
+
+def stop_watcher():
+    """Stops the background rescans"""
+    global _WATCHER # pylint:disable=global-statement
+    if _WATCHER is not None:
+        _WATCHER.set()
+        _WATCHER = None
+
+
+def get_generation():
+    """Returns a number which changes whenever the index got updated (for dependent caches)"""
+    return _GENERATION
+
+
+def get_files():
+    """Yields (path, size, mtime) of all indexed files - from the metadata columns, no stat (memory only)"""
+    if _DIRECTORIES is None:
+        load()
+    base, delta, masked = _FILES
+    for (paths, _, columns, _, owners), part_masked in ((base, masked), (delta, ())):
+        is_dir = columns['is_dir']
+        sizes = columns['size']
+        mtimes = columns['mtime']
+        for path_id, path in enumerate(paths):
+            if not is_dir[path_id] and owners[path_id] not in part_masked:
+                yield path, int(sizes[path_id]), mtimes[path_id]
+
+
+def filter_ids(path_ids, filters, columns, extension_ids):
+    """Returns the path ids which pass all filters - one pass over a typed column per filter.
+    filters: {'extension': set of extensions, 'is_dir': bool, 'size': (min, max), 'mtime': (min, max)} - every key is optional, a None bound is open"""
+    for column_name in FILTER_ORDER:
+        if column_name not in filters:
+            continue
+        column = columns[column_name]
+        if column_name == 'extension':
+            wanted = set(extension_ids[extension] for extension in filters['extension'] if extension in extension_ids)
+            path_ids = [path_id for path_id in path_ids if column[path_id] in wanted]
+        elif column_name == 'is_dir':
+            wanted = int(filters['is_dir'])
+            path_ids = [path_id for path_id in path_ids if column[path_id] == wanted]
+        else:
+            minimum, maximum = filters[column_name]
+            minimum = float('-inf') if minimum is None else minimum
+            maximum = float('inf') if maximum is None else maximum
+            path_ids = [path_id for path_id in path_ids if minimum <= column[path_id] <= maximum]
+    return path_ids
+
+
+def search(query, filters=None):
+    """Returns all indexed paths whose name contains query (case insensitive, '' = all) and which pass the metadata filters (see filter_ids).
+    Memory only, the filesystem is not touched"""
+    if _DIRECTORIES is None:
+        load()
+    base, delta, masked = _FILES
+    results = []
+    for (paths, trigrams, columns, extension_ids, owners), part_masked in ((base, masked), (delta, ())):
+        path_ids = trigrams.search(query)
+        if part_masked:
+            path_ids = [path_id for path_id in path_ids if owners[path_id] not in part_masked]
+        if filters:
+            path_ids = filter_ids(path_ids, filters, columns, extension_ids)
+        results.extend(paths[path_id] for path_id in path_ids)
+    return results
+
+
+def stream_search(query, is_cancelled=None, filters=None):
+    """Yields batches of indexed paths whose name matches query (like search).
+    While the index gets built for the first time, matches of the directories crawled so far are handed out: the first batch after STREAM_FIRST_BATCH seconds, then every STREAM_BATCH_INTERVAL.
+    Filtered searches need the metadata columns - they wait for the index & yield a single batch.
+    Stops as soon as is_cancelled() returns True - the crawl goes on, it builds the index"""
+    loader = load_in_background()
+    query = query.lower()
+    crawled = None
+    position = 0
+    matches = []
+    next_batch = time.time() + STREAM_FIRST_BATCH
+    while _DIRECTORIES is None and loader is not None and loader.is_alive():
+        if is_cancelled is not None and is_cancelled():
+            return
+        if crawled is None and not filters:
+            crawled = _CRAWLED # the loader might still read the cache
+        if crawled is not None:
+            end = len(crawled)
+            for directory, names in crawled[position:end]:
+                matches.extend(os.path.join(directory, name) for name in names if trigram_index.matches(query, name))
+            position = end
+        if matches and time.time() >= next_batch:
+            yield matches
+            matches = []
+            next_batch = time.time() + STREAM_BATCH_INTERVAL
+        time.sleep(STREAM_POLL_INTERVAL)
+
+    if _DIRECTORIES is None: # loading failed
+        return
+    if crawled is None: # loaded from the cache (or filtered) - a single complete batch
+        yield search(query, filters)
+        return
+    for directory, names in crawled[position:]: # the rest of the crawl
+        matches.extend(os.path.join(directory, name) for name in names if trigram_index.matches(query, name))
+    if matches:
+        yield matches
+
+
+def is_loaded():
+    """Checks if the index is in memory"""
+    return _DIRECTORIES is not None
@@ -0,0 +1,340 @@
+#!/usr/bin/python
+"""Resolves application icons via an in-memory name->path index over the icon theme chain (persisted for a fast warm start)"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import ConfigParser
+import json
+import os
+import subprocess
+import threading
+
+## apparat
+import constants
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+CACHE_PATH = constants.APP_INI_FOLDER+'icons.cache'
+CACHE_VERSION = 1
+REFRESH_INTERVAL = 60 # seconds between two checks of the icon directory mtimes
+FALLBACK_THEME = 'hicolor'
+EXTENSIONS = ('.png',) # wx can not handle svg
+GSETTINGS_KEY = ('org.gnome.desktop.interface', 'icon-theme')
+
+_LOCK = threading.RLock()
+_THEME = None # current icon theme name - None = not resolved yet
+_SIZE = None # icon size the index was built for
+_ICONS = {} # name: path
+_STAMPS = {} # directory or index.theme: mtime (for validating the index)
+_WATCHER = None
+_MONITOR = None # gsettings monitor process
+_LOADER = None # thread loading the index for a new icon size
+_LOADER_LOCK = threading.Lock() # _LOCK is held during the whole load
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def get_base_directories():
+    """Returns the icon base directories in lookup order (freedesktop icon theme spec)"""
+    data_dirs = os.environ.get('XDG_DATA_DIRS') or '/usr/local/share:/usr/share'
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(os.environ['HOME'], '.local/share')
+    base_directories = [os.path.join(os.environ['HOME'], '.icons'), os.path.join(data_home, 'icons')]
+    for data_dir in data_dirs.split(':'):
+        if data_dir:
+            base_directories.append(os.path.join(data_dir, 'icons'))
+    return base_directories
+
+
+def get_mtime(path):
+    """Returns the mtime of path or None if it does not exist"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def read_theme_setting():
+    """Reads the icon theme name of the user via gsettings (forks - only called on startup)"""
+    try:
+        theme = subprocess.check_output(['gsettings', 'get'] + list(GSETTINGS_KEY)) # via: https://ubuntuforums.org/showthread.php?t=2100795
+    except (OSError, subprocess.CalledProcessError):
+        theme = ''
+    theme = theme.partition("'")[-1].rpartition("'")[0] # build substring
+    if theme == '': # fallback to hicolor icon theme if none was detected
+        tools.debug_output(__name__, 'read_theme_setting', 'Using fallback icon theme '+FALLBACK_THEME, 2)
+        theme = FALLBACK_THEME
+    return theme
+
+
+def parse_theme(theme, stamps):
+    """Returns (inherited themes, [(directory, min size, max size)]) of a theme or None if it does not exist"""
+    for base_directory in get_base_directories():
+        index_path = os.path.join(base_directory, theme, 'index.theme')
+        if os.path.isfile(index_path):
+            break
+    else:
+        return None
+    stamps[index_path] = get_mtime(index_path)
+
+    parser = ConfigParser.RawConfigParser()
+    try:
+        parser.read(index_path)
+        inherits = [t.strip() for t in parser.get('Icon Theme', 'Inherits').split(',') if t.strip()] if parser.has_option('Icon Theme', 'Inherits') else []
+        subdirectories = [d.strip() for d in parser.get('Icon Theme', 'Directories').split(',') if d.strip()]
+    except ConfigParser.Error as error:
+        tools.debug_output(__name__, 'parse_theme', 'Unable to parse '+index_path+': '+str(error), 3)
+        return None
+
+    directories = []
+    for subdirectory in subdirectories:
+        if not parser.has_section(subdirectory):
+            continue
+
+        def get_option(name, default, section=subdirectory):
+            """Returns an option of the directory section"""
+            return parser.get(section, name) if parser.has_option(section, name) else default
+        try:
+            if int(get_option('Scale', 1)) != 1: # HiDPI directories
+                continue
+            size = int(get_option('Size', 0))
+            size_type = get_option('Type', 'Threshold')
+            min_size = int(get_option('MinSize', size))
+            max_size = int(get_option('MaxSize', size))
+            threshold = int(get_option('Threshold', 2))
+        except ValueError:
+            continue
+
+        if size_type == 'Fixed':
+            min_size = max_size = size
+        elif size_type != 'Scalable':
+            min_size, max_size = size - threshold, size + threshold
+        directories.append((subdirectory, min_size, max_size))
+    return inherits, directories
+
+
+def get_theme_chain(theme, stamps):
+    """Returns [(theme, directories)] for the theme, all inherited themes & hicolor"""
+    chain = []
+    pending = [theme]
+    visited = set()
+    while pending:
+        name = pending.pop(0)
+        if name in visited:
+            continue
+        visited.add(name)
+        parsed = parse_theme(name, stamps)
+        if parsed is None:
+            continue
+        inherits, directories = parsed
+        chain.append((name, directories))
+        pending = inherits + pending # depth first, as defined by the spec
+    if FALLBACK_THEME not in visited:
+        parsed = parse_theme(FALLBACK_THEME, stamps)
+        if parsed is not None:
+            chain.append((FALLBACK_THEME, parsed[1]))
+    return chain
+
+
+def list_icons(directory, stamps):
+    """Returns {name: path} of all icons in directory"""
+    stamps[directory] = get_mtime(directory)
+    icons = {}
+    try:
+        entries = os.listdir(directory)
+    except OSError:
+        return icons
+    for entry in entries:
+        name, extension = os.path.splitext(entry)
+        if extension in EXTENSIONS:
+            icons[name] = os.path.join(directory, entry)
+    return icons
+
+
+def build_index(theme, size):
+    """Scans the theme chain & pixmaps. Returns ({name: path}, stamps)"""
+    stamps = {}
+    icons = {}
+    base_directories = get_base_directories()
+
+    for theme_name, directories in get_theme_chain(theme, stamps):
+        ## per theme: exact size match wins, otherwise the closest size - first theme having the icon wins
+        theme_icons = {} # name: (distance, path)
+        for subdirectory, min_size, max_size in directories:
+            distance = 0 if min_size <= size <= max_size else min(abs(min_size - size), abs(max_size - size))
+            for base_directory in base_directories:
+                directory = os.path.join(base_directory, theme_name, subdirectory) # missing directories get stamped as well - they might show up later
+                for name, path in list_icons(directory, stamps).items():
+                    if name not in icons and (name not in theme_icons or distance < theme_icons[name][0]):
+                        theme_icons[name] = (distance, path)
+        for name, (_, path) in theme_icons.items():
+            icons[name] = path
+
+    ## unthemed icons
+    for directory in ['/usr/share/pixmaps'] + base_directories:
+        for name, path in list_icons(directory, stamps).items():
+            icons.setdefault(name, path)
+    return icons, stamps
+
+
+def is_valid(stamps):
+    """Checks if none of the scanned directories changed"""
+    for path, mtime in stamps.items():
+        if get_mtime(path) != mtime:
+            return False
+    return True
+
+
+def load_cache(theme, size):
+    """Returns (icons, stamps) from the on-disk cache (or None)"""
+    try:
+        with open(CACHE_PATH, 'r') as cache_file:
+            cache = json.load(cache_file)
+    except (IOError, ValueError):
+        return None
+
+    if cache.get('version') != CACHE_VERSION or cache.get('theme') != theme or cache.get('size') != size:
+        return None
+    return cache['icons'], cache['stamps']
+
+
+def save_cache(theme, size, icons, stamps):
+    """Writes the index to the on-disk cache (write & rename)"""
+    temp_path = CACHE_PATH+'.tmp'
+    try:
+        with open(temp_path, 'w') as cache_file:
+            json.dump({'version': CACHE_VERSION, 'theme': theme, 'size': size, 'icons': icons, 'stamps': stamps}, cache_file, separators=(',', ':'))
+        os.rename(temp_path, CACHE_PATH)
+    except (IOError, OSError):
+        tools.debug_output(__name__, 'save_cache', 'Unable to write '+CACHE_PATH, 3)
+
+
+def load(size, force_rebuild=False):
+    """Loads the index for size - from the on-disk cache if still valid, otherwise by scanning the theme chain"""
+    global _THEME, _SIZE, _ICONS, _STAMPS # pylint:disable=global-statement
+    with _LOCK:
+        if _SIZE == size and not force_rebuild: # loaded meanwhile by another thread
+            return
+        if _THEME is None:
+            _THEME = read_theme_setting()
+        theme = _THEME
+
+        cache = None if force_rebuild else load_cache(theme, size)
+        if cache is not None and is_valid(cache[1]):
+            tools.debug_output(__name__, 'load', 'Loaded icon index for theme '+theme+' from cache ('+CACHE_PATH+')', 1)
+            icons, stamps = cache
+        else:
+            tools.debug_output(__name__, 'load', 'Indexing icon theme '+theme+' (size: '+str(size)+')', 1)
+            icons, stamps = build_index(theme, size)
+            save_cache(theme, size, icons, stamps)
+            tools.debug_output(__name__, 'load', 'Indexed '+str(len(icons))+' icons', 1)
+
+        ## swap in one go
+        _ICONS = icons
+        _STAMPS = stamps
+        _SIZE = size
+
+
+def load_in_background(size):
+    """Loads the index for size on a daemon thread (unless it is being loaded already)"""
+    global _LOADER # pylint:disable=global-statement
+    with _LOADER_LOCK:
+        if _LOADER is None or not _LOADER.is_alive():
+            _LOADER = threading.Thread(target=load, args=(size,), name='icon_resolver')
+            _LOADER.daemon = True
+            _LOADER.start()
+
+
+def refresh_if_stale():
+    """Rebuilds the index if an icon directory changed (i.e. a new application got installed)"""
+    with _LOCK:
+        if _SIZE is not None and not is_valid(_STAMPS):
+            tools.debug_output(__name__, 'refresh_if_stale', 'Icon directories changed', 1)
+            load(_SIZE, force_rebuild=True)
+
+
+def on_theme_changed(theme):
+    """Switches to a new icon theme"""
+    global _THEME # pylint:disable=global-statement
+    with _LOCK:
+        if theme == _THEME:
+            return
+        tools.debug_output(__name__, 'on_theme_changed', 'Icon theme changed to: '+theme, 1)
+        _THEME = theme
+        if _SIZE is not None:
+            load(_SIZE, force_rebuild=True)
+
+
+def monitor_theme_setting():
+    """Follows changes of the icon theme setting (gsettings monitor) - runs in its own thread"""
+    global _MONITOR # pylint:disable=global-statement
+    try:
+        _MONITOR = subprocess.Popen(['gsettings', 'monitor'] + list(GSETTINGS_KEY), stdout=subprocess.PIPE)
+    except OSError:
+        tools.debug_output(__name__, 'monitor_theme_setting', 'Unable to monitor the icon theme setting', 2)
+        return
+
+    for line in iter(_MONITOR.stdout.readline, ''): # output: icon-theme: 'name'
+        theme = line.partition("'")[-1].rpartition("'")[0] or FALLBACK_THEME
+        try:
+            on_theme_changed(theme)
+        except Exception as error: # pylint:disable=broad-except
+            tools.debug_output(__name__, 'monitor_theme_setting', 'Switching icon theme failed: '+str(error), 3)
+
+
+def start_watcher(size, interval=REFRESH_INTERVAL):
+    """Loads the index in the background & keeps it fresh (theme setting and icon directories)"""
+    global _WATCHER # pylint:disable=global-statement
+    if _WATCHER is not None:
+        return
+    _WATCHER = tools.start_background_task('icon_resolver', interval, refresh_if_stale)
+
+    def initial_load():
+        """Load the index & follow the theme setting"""
+        load(size)
+        monitor_theme_setting()
+
+    monitor_thread = threading.Thread(target=initial_load, name='icon_resolver_monitor')
+    monitor_thread.daemon = True
+    monitor_thread.start()
+
+
+def stop_watcher():
+    """Stops the background tasks"""
+    global _WATCHER, _MONITOR # pylint:disable=global-statement
+    if _WATCHER is not None:
+        _WATCHER.set()
+        _WATCHER = None
+    if _MONITOR is not None:
+        try:
+            _MONITOR.terminate()
+        except OSError:
+            pass
+        _MONITOR = None
+
+
+def get_icon_path_for_value(icon_value, size):
+    """Returns the icon path for the Icon= value of a .desktop file - an absolute path or a theme icon name (or None)"""
+    if os.path.isabs(icon_value):
+        if os.path.splitext(icon_value)[1] in EXTENSIONS and os.path.isfile(icon_value):
+            return icon_value
+        return None
+    name, extension = os.path.splitext(icon_value)
+    if extension not in ('.png', '.svg', '.xpm'): # legacy values contain an extension
+        name = icon_value
+    return get_icon_path(name, size)
+
+
+def get_icon_path(name, size):
+    """Returns the path of the icon for name in the current theme (or None) - a dictionary lookup.
+    Returns None (the fallback icon) while the index for size is not loaded yet - the theme chain scan must not block the UI thread"""
+    if _SIZE != size:
+        load_in_background(size) # icon size changed (or the first lookup without a watcher) - the initial load might hold _LOCK already
+        return None
+    return _ICONS.get(name)
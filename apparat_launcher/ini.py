@@ -8,6 +8,9 @@
 
 # general
 import os
+import tempfile # for atomic writes of the ini file
+import threading # to guard the cached config object
+import time
 import ConfigParser # to handle .ini/configuration files
 
 ## apparat
@@ -16,14 +19,113 @@ import tools
 
 
 
+# -----------------------------------------------------------------------------------------------
+# CONFIG CACHE
+# -----------------------------------------------------------------------------------------------
+CONFIG_CHECK_INTERVAL = 1.0 # seconds - how often the ini file is stat()ed for external changes
+
+_CONFIG = None # process-wide ConfigParser object
+_CONFIG_STAMP = None # (inode, mtime, size) of the ini file when it was parsed
+_CONFIG_LAST_CHECK = 0 # timestamp of the last stat() call
+_CONFIG_LOCK = threading.RLock()
+_CHANGE_CALLBACKS = []
+
+
 # -----------------------------------------------------------------------------------------------
 # FUNCTIONS
 # -----------------------------------------------------------------------------------------------
+def get_ini_stamp():
+    """Returns a tuple which changes whenever the ini file gets replaced or modified"""
+    try:
+        stat = os.stat(constants.APP_INI_PATH)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime, stat.st_size)
+
+
+def get_config():
+    """Returns the cached config object. The ini file is parsed again only if its inode, mtime or size changed"""
+    global _CONFIG, _CONFIG_STAMP, _CONFIG_LAST_CHECK # pylint:disable=global-statement
+    with _CONFIG_LOCK:
+        now = time.time()
+        if _CONFIG is not None and (now - _CONFIG_LAST_CHECK) < CONFIG_CHECK_INTERVAL:
+            return _CONFIG # checked recently - serve from memory
+
+        _CONFIG_LAST_CHECK = now
+        stamp = get_ini_stamp()
+        if _CONFIG is not None and stamp == _CONFIG_STAMP:
+            return _CONFIG
+
+        reloaded = _CONFIG is not None
+        config = ConfigParser.ConfigParser()
+        config.read(constants.APP_INI_PATH)
+        _CONFIG = config
+        _CONFIG_STAMP = stamp
+        tools.debug_output(__name__, 'get_config', 'Parsed ini ('+constants.APP_INI_PATH+')', 1)
+
+    if reloaded is True: # ini was changed from outside - everything might have changed
+        notify_change(None, None, None)
+    return config
+
+
+def write_config(config):
+    """Writes the given config object to the ini file and marks the cache as up-to-date.
+    Writes to a temporary file and renames it afterwards - a crash mid-write can not truncate the ini. The ini keeps its file mode"""
+    global _CONFIG, _CONFIG_STAMP, _CONFIG_LAST_CHECK # pylint:disable=global-statement
+    with _CONFIG_LOCK:
+        file_descriptor, temp_path = tempfile.mkstemp(prefix='.'+constants.APP_NAME+'.', suffix='.tmp', dir=constants.APP_INI_FOLDER)
+        try:
+            with os.fdopen(file_descriptor, 'wb') as configfile:
+                config.write(configfile)
+                configfile.flush()
+                os.fsync(configfile.fileno())
+            if os.path.exists(constants.APP_INI_PATH): # mkstemp creates the file with mode 0600
+                os.chmod(temp_path, os.stat(constants.APP_INI_PATH).st_mode & 0o7777)
+            os.rename(temp_path, constants.APP_INI_PATH) # atomic on posix
+        except (IOError, OSError):
+            tools.debug_output(__name__, 'write_config', 'Writing ini ('+constants.APP_INI_PATH+') failed', 3)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        _CONFIG = config
+        _CONFIG_STAMP = get_ini_stamp() # our own write should not trigger a re-parse
+        _CONFIG_LAST_CHECK = time.time()
+
+
+def register_change_callback(callback):
+    """Registers a function which gets called as callback(section_name, key_name, value) after an ini value changed.
+    All arguments are None if the ini file was modified from outside and got parsed again.
+    Callbacks might be called from a background thread (statistics flush)"""
+    if callback not in _CHANGE_CALLBACKS:
+        _CHANGE_CALLBACKS.append(callback)
+
+
+def unregister_change_callback(callback):
+    """Removes a function registered via register_change_callback"""
+    if callback in _CHANGE_CALLBACKS:
+        _CHANGE_CALLBACKS.remove(callback)
+
+
+def notify_change(section_name, key_name, value):
+    """Informs all registered callbacks about a changed ini value"""
+    for callback in list(_CHANGE_CALLBACKS):
+        callback(section_name, key_name, value)
+
+
+def read_int_ini_value(section_name, key_name):
+    """Reads a single value from the configuration file and returns it as integer"""
+    return int(read_single_ini_value(section_name, key_name))
+
+
+def read_bool_ini_value(section_name, key_name):
+    """Reads a single value from the configuration file and returns it as boolean"""
+    return read_single_ini_value(section_name, key_name) == 'True'
+
+
 def read_single_ini_value(section_name, key_name):
     """Method to read a single value from the configuration file apparat.ini"""
 
-    config = ConfigParser.ConfigParser()
-    config.read(constants.APP_INI_PATH)
+    config = get_config()
     try:
         value = config.get(section_name, key_name)
         tools.debug_output(__name__, 'read_single_ini_value', 'Section: '+section_name+' - Key: '+key_name+' - Value: '+value, 1)
@@ -40,6 +142,10 @@ def read_single_ini_value(section_name, key_name):
             value = '128'
         elif (key_name == 'transparency'):
             value = '255'
+        elif (key_name == 'search_debounce'):
+            value = '100'
+        elif (key_name == 'search_local_exclude'):
+            value = ''
         elif (key_name == 'lang'):
             value = 'EN'
         elif key_name.startswith('plugin'): # any plugin
@@ -55,15 +161,31 @@ def read_single_ini_value(section_name, key_name):
 def write_single_ini_value(section_name, key_name, value):
     """Method to write a single value to the configuration file apparat.ini"""
     try:
-        config = ConfigParser.ConfigParser()
-        config.read(constants.APP_INI_PATH)
-        config.set(section_name, key_name, value)
-        tools.debug_output(__name__, 'write_single_ini_value', 'Section: '+section_name+' - Key: '+key_name+' - Value: '+str(value), 1)
-        with open(constants.APP_INI_PATH, 'wb') as configfile:
-            config.write(configfile)
+        with _CONFIG_LOCK:
+            config = get_config()
+            config.set(section_name, key_name, value)
+            tools.debug_output(__name__, 'write_single_ini_value', 'Section: '+section_name+' - Key: '+key_name+' - Value: '+str(value), 1)
+            write_config(config)
     except ConfigParser.NoSectionError:
         tools.debug_output(__name__, 'write_single_ini_value', 'Section '+section_name+' does not exist.', 3)
         return
+    notify_change(section_name, key_name, str(value))
+
+
+def write_multiple_ini_values(section_name, values):
+    """Writes several key/value pairs (dict) of one section with a single write of the ini file"""
+    try:
+        with _CONFIG_LOCK:
+            config = get_config()
+            for key_name, value in values.items():
+                config.set(section_name, key_name, value)
+                tools.debug_output(__name__, 'write_multiple_ini_values', 'Section: '+section_name+' - Key: '+key_name+' - Value: '+str(value), 1)
+            write_config(config)
+    except ConfigParser.NoSectionError:
+        tools.debug_output(__name__, 'write_multiple_ini_values', 'Section '+section_name+' does not exist.', 3)
+        return
+    for key_name, value in values.items():
+        notify_change(section_name, key_name, str(value))
 
 
 def check_if_ini_exists():
@@ -89,6 +211,8 @@ def check_if_ini_exists():
             f.write('hide_ui_after_command_execution = True\n')
             f.write('icon_size = 128\n')
             f.write('transparency = 255\n')
+            f.write('search_debounce = 100\n')
+            f.write('search_local_exclude = \n')
             f.write('[Statistics]\n')
             f.write('apparat_started = 0\n')
             f.write('command_executed = 0\n')
@@ -99,6 +223,7 @@ def check_if_ini_exists():
             f.write('plugin_nautilus = False\n')
             f.write('plugin_passwordgen = False\n')
             f.write('plugin_screenshot = False\n')
+            f.write('plugin_search_content = False\n')
             f.write('plugin_search_internet = False\n')
             f.write('plugin_search_local = False\n')
             f.write('plugin_session = False\n')
@@ -119,7 +244,7 @@ def validate():
 
     ## Section: General
     SECTIONS = ['General']
-    OPTIONS = ['hide_ui_after_command_execution', 'icon_size', 'transparency']
+    OPTIONS = ['hide_ui_after_command_execution', 'icon_size', 'transparency', 'search_debounce', 'search_local_exclude']
     validate_single_section(SECTIONS, OPTIONS)
 
     ## Section: Statistics
@@ -129,7 +254,7 @@ def validate():
 
     ## Section: Plugins
     SECTIONS = ['Plugins']
-    OPTIONS = ['plugin_kill', 'plugin_misc', 'plugin_nautilus', 'plugin_passwordgen', 'plugin_screenshot', 'plugin_search_internet', 'plugin_search_local', 'plugin_session', 'plugin_shell']
+    OPTIONS = ['plugin_kill', 'plugin_misc', 'plugin_nautilus', 'plugin_passwordgen', 'plugin_screenshot', 'plugin_search_content', 'plugin_search_internet', 'plugin_search_local', 'plugin_session', 'plugin_shell']
     validate_single_section(SECTIONS, OPTIONS)
 
     tools.debug_output(__name__, 'validate', 'Finished validating complete ini ('+constants.APP_INI_PATH+')', 1)
@@ -138,8 +263,7 @@ def validate():
 def validate_single_section(sections, options):
     """Validates a given ini section for a defined amount of options"""
     tools.debug_output(__name__, 'validate_single_section', 'Validating ini ('+constants.APP_INI_PATH+') for section'+str(sections), 1)
-    config = ConfigParser.ConfigParser()
-    config.read(constants.APP_INI_PATH)
+    config = get_config()
 
     for section in sections:
         ## sections
@@ -151,8 +275,7 @@ def validate_single_section(sections, options):
             # create the missing section
             config.add_section(section)
             tools.debug_output(__name__, 'validate_single_section', 'Created new section '+section, 1)
-            with open(constants.APP_INI_PATH, 'wb') as configfile:
-                config.write(configfile)
+            write_config(config)
         ## options
         for candidate in options:
             has_option = config.has_option(section, candidate)
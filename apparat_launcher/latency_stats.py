@@ -0,0 +1,150 @@
+#!/usr/bin/python
+"""Hot path latency histograms (HDR-style log buckets) - p50/p95/p99 per metric, memory only"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import contextlib
+import functools
+import threading
+import time
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+SUB_BUCKETS = 16 # linear sub-buckets per power of two - max. relative error 1/16
+PERCENTILES = (50, 95, 99)
+
+timer = getattr(time, 'monotonic', time.time) # python 2 has no monotonic clock
+
+_LOCK = threading.Lock()
+_HISTOGRAMS = {} # metric: Histogram
+_ORDER = [] # metrics in order of their first recording
+
+
+# -----------------------------------------------------------------------------------------------
+# CLASSES
+# -----------------------------------------------------------------------------------------------
+class Histogram(object):
+
+    """Counts values (microseconds) in logarithmic buckets - constant memory, percentiles with ~6% precision"""
+
+    def __init__(self):
+        """Creates an empty histogram"""
+        self.buckets = {} # bucket index: count
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+
+
+    @staticmethod
+    def get_bucket_index(value):
+        """Returns the bucket of value: exact below SUB_BUCKETS, then SUB_BUCKETS buckets per power of two"""
+        if value < SUB_BUCKETS:
+            return value
+        exponent = value.bit_length() - SUB_BUCKETS.bit_length() # keeps the top 5 bits (16..31)
+        return (exponent + 1) * SUB_BUCKETS + (value >> exponent) - SUB_BUCKETS
+
+
+    @staticmethod
+    def get_bucket_value(index):
+        """Returns the highest value of a bucket"""
+        if index < SUB_BUCKETS * 2:
+            return index
+        exponent = index // SUB_BUCKETS - 1
+        return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << exponent) - 1
+
+
+    def record(self, value):
+        """Adds a value (microseconds)"""
+        value = max(int(value), 0)
+        index = self.get_bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+
+    def get_percentile(self, percentile):
+        """Returns the value (microseconds) below which percentile % of all values are"""
+        if self.count == 0:
+            return 0
+        threshold = self.count * percentile / 100.0
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= threshold:
+                return min(self.get_bucket_value(index), self.maximum)
+        return self.maximum
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def record(metric, seconds):
+    """Adds a duration to the histogram of metric (thread safe)"""
+    with _LOCK:
+        histogram = _HISTOGRAMS.get(metric)
+        if histogram is None:
+            histogram = _HISTOGRAMS[metric] = Histogram()
+            _ORDER.append(metric)
+        histogram.record(seconds * 1000000)
+
+
+def record_since(metric, start):
+    """Adds the time since start (a timer() value) to the histogram of metric"""
+    record(metric, timer() - start)
+
+
+@contextlib.contextmanager
+def measure(metric):
+    """Measures the duration of a with-block"""
+    start = timer()
+    try:
+        yield
+    finally:
+        record_since(metric, start)
+
+
+def timed(metric):
+    """Decorator - measures every call of the function"""
+    def decorator(function):
+        """Wraps function"""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            """Calls function & records its duration"""
+            with measure(metric):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def reset():
+    """Drops all histograms"""
+    with _LOCK:
+        _HISTOGRAMS.clear()
+        del _ORDER[:]
+
+
+def get_summary():
+    """Returns [(metric, count, p50, p95, p99, max)] with durations in milliseconds"""
+    summary = []
+    with _LOCK:
+        for metric in _ORDER:
+            histogram = _HISTOGRAMS[metric]
+            percentiles = [histogram.get_percentile(percentile) / 1000.0 for percentile in PERCENTILES]
+            summary.append(tuple([metric, histogram.count] + percentiles + [histogram.maximum / 1000.0]))
+    return summary
+
+
+def format_report():
+    """Returns the histograms as a text table"""
+    lines = ['%-28s %7s %9s %9s %9s %9s' % ('Metric (ms)', 'Count', 'p50', 'p95', 'p99', 'Max')]
+    for metric, count, p50, p95, p99, maximum in get_summary():
+        lines.append('%-28s %7d %9.2f %9.2f %9.2f %9.2f' % (metric, count, p50, p95, p99, maximum))
+    if len(lines) == 1:
+        lines.append('No measurements yet')
+    return '\n'.join(lines)
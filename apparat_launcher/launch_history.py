@@ -0,0 +1,172 @@
+#!/usr/bin/python
+"""Append-only launch history - frecency (frequency & recency with exponential decay) of executed commands and plugin triggers"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import io
+import math
+import os
+import threading
+import time
+
+## apparat
+import constants
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+HISTORY_PATH = constants.APP_INI_FOLDER+'launch_history.log'
+HALF_LIFE = 7 * 24 * 60 * 60 # seconds until a launch counts half
+COMPACT_LINES = 2000 # the log gets compacted once it grows beyond this amount of lines
+MAX_ENTRIES = 500 # names kept by a compaction (best frecency first)
+MIN_FRECENCY = 0.05 # names below are dropped by a compaction (~ a single launch 30 days ago)
+BONUS_WEIGHT = 4 # scoring points per doubling of the frecency (a full word boundary match scores ~50)
+
+KIND_COMMAND = 'command'
+KIND_PLUGIN = 'plugin'
+
+_LOCK = threading.Lock()
+_PENDING = [] # (timestamp, kind, name) of launches which are not yet appended to the log
+_FRECENCIES = None # (kind, name): (frecency, reference time) - None = log not read yet
+_LINE_COUNT = 0 # lines in the log file
+_GENERATION = 0 # increases with every launch (for dependent caches)
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def decay(frecency, since, now, half_life=HALF_LIFE):
+    """Returns the frecency of reference time since at time now"""
+    return frecency * 0.5 ** (max(now - since, 0) / float(half_life))
+
+
+def add_launch(frecencies, kind, name, timestamp, weight=1.0):
+    """Adds a launch (or an aggregated weight) to frecencies - decays the old value to the new reference time"""
+    old = frecencies.get((kind, name))
+    if old is not None:
+        if old[1] > timestamp: # log lines are not necessarily ordered (i.e. clock changes)
+            weight, timestamp = decay(weight, timestamp, old[1]), old[1]
+        else:
+            weight += decay(old[0], old[1], timestamp)
+    frecencies[(kind, name)] = (weight, timestamp)
+
+
+def format_line(timestamp, weight, kind, name):
+    """Returns a log line: timestamp, weight, kind & name separated by tabs"""
+    return u'%.0f\t%.4g\t%s\t%s\n' % (timestamp, weight, kind, name)
+
+
+def read_log():
+    """Returns (frecencies, line count) of the log file"""
+    frecencies = {}
+    line_count = 0
+    try:
+        with io.open(HISTORY_PATH, 'r', encoding='utf-8') as history_file:
+            for line in history_file:
+                line_count += 1
+                fields = line.rstrip('\n').split('\t', 3)
+                try:
+                    add_launch(frecencies, fields[2], fields[3], float(fields[0]), float(fields[1]))
+                except (IndexError, ValueError):
+                    continue # skip damaged lines (i.e. an interrupted write)
+    except (IOError, OSError):
+        pass
+    return frecencies, line_count
+
+
+def load():
+    """Reads the log (lazily - on the first frecency lookup or flush)"""
+    global _FRECENCIES, _LINE_COUNT # pylint:disable=global-statement
+    with _LOCK:
+        if _FRECENCIES is not None:
+            return
+        frecencies, line_count = read_log()
+        for timestamp, kind, name in _PENDING: # launches before the first lookup
+            add_launch(frecencies, kind, name, timestamp)
+        _FRECENCIES = frecencies
+        _LINE_COUNT = line_count
+        tools.debug_output(__name__, 'load', 'Read '+str(line_count)+' launches of '+str(len(frecencies))+' commands', 1)
+
+
+def record(name, kind=KIND_COMMAND):
+    """Records a launch - memory only, it is appended to the log by the next flush"""
+    global _GENERATION # pylint:disable=global-statement
+    timestamp = time.time()
+    with _LOCK:
+        _PENDING.append((timestamp, kind, name))
+        if _FRECENCIES is not None:
+            add_launch(_FRECENCIES, kind, name, timestamp)
+        _GENERATION += 1
+
+
+def compact():
+    """Rewrites the log with a single aggregated line per name - drops the least frecent names (write & rename)"""
+    global _LINE_COUNT # pylint:disable=global-statement
+    now = time.time()
+    with _LOCK:
+        current = sorted(((decay(frecency, since, now), kind, name) for (kind, name), (frecency, since) in _FRECENCIES.items()), reverse=True)
+        current = [entry for entry in current[:MAX_ENTRIES] if entry[0] >= MIN_FRECENCY]
+        temp_path = HISTORY_PATH+'.tmp'
+        try:
+            with io.open(temp_path, 'w', encoding='utf-8') as history_file:
+                for frecency, kind, name in current:
+                    history_file.write(format_line(now, frecency, kind, name))
+            os.rename(temp_path, HISTORY_PATH)
+        except (IOError, OSError):
+            tools.debug_output(__name__, 'compact', 'Unable to write '+HISTORY_PATH, 3)
+            return
+        tools.debug_output(__name__, 'compact', 'Compacted '+str(_LINE_COUNT)+' lines to '+str(len(current)), 1)
+        _LINE_COUNT = len(current)
+        for key in set(_FRECENCIES) - set((kind, name) for _, kind, name in current):
+            del _FRECENCIES[key]
+
+
+def flush(background=False):
+    """Appends the pending launches to the log & compacts it if it got too long - called when idle (hide, exit)"""
+    global _LINE_COUNT # pylint:disable=global-statement
+    if background is True:
+        flush_thread = threading.Thread(target=flush, name='launch_history_flush')
+        flush_thread.daemon = True
+        flush_thread.start()
+        return
+
+    load()
+    with _LOCK:
+        pending = list(_PENDING)
+        del _PENDING[:]
+        if pending:
+            try:
+                with io.open(HISTORY_PATH, 'a', encoding='utf-8') as history_file:
+                    history_file.write(u''.join(format_line(timestamp, 1, kind, name) for timestamp, kind, name in pending))
+                _LINE_COUNT += len(pending)
+            except (IOError, OSError):
+                tools.debug_output(__name__, 'flush', 'Writing the launch history failed, keeping it for the next try', 3)
+                _PENDING[:0] = pending
+                return
+    if _LINE_COUNT > COMPACT_LINES:
+        compact()
+
+
+def get_frecency(name, kind=KIND_COMMAND):
+    """Returns the current frecency of name (0 if it was never launched)"""
+    if _FRECENCIES is None:
+        load()
+    entry = _FRECENCIES.get((kind, name))
+    if entry is None:
+        return 0.0
+    return decay(entry[0], entry[1], time.time())
+
+
+def get_bonus(name):
+    """Returns the ranking bonus of command name - grows logarithmically with its frecency"""
+    return BONUS_WEIGHT * math.log(1 + get_frecency(name), 2)
+
+
+def get_generation():
+    """Returns a number which changes with every launch (for dependent caches)"""
+    return _GENERATION
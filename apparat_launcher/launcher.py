@@ -0,0 +1,84 @@
+#!/usr/bin/python
+"""Starts programs detached from the launcher (own session, no shell), reaps them and measures the spawn latency"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import errno
+import os
+import shlex
+import signal
+import subprocess
+import threading
+
+## apparat
+import latency_stats
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+_CHILDREN = set() # pids of launched programs which are not reaped yet
+_CHILDREN_LOCK = threading.RLock() # re-entrant: the SIGCHLD handler might interrupt the main thread while it holds the lock
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def split_parameter(parameter):
+    """Tokenises a parameter string like a shell would (quotes, escapes) - without starting one"""
+    try:
+        return shlex.split(parameter)
+    except ValueError: # i.e. unbalanced quotes - pass it on as it is
+        return [parameter]
+
+
+def reap():
+    """Collects the exit status of all terminated programs - they would stay zombies until the launcher exits otherwise"""
+    with _CHILDREN_LOCK:
+        for pid in list(_CHILDREN):
+            try:
+                reaped_pid, _ = os.waitpid(pid, os.WNOHANG)
+            except OSError as error:
+                if error.errno != errno.ECHILD:
+                    raise
+                reaped_pid = pid # already reaped (i.e. by subprocess)
+            if reaped_pid == pid:
+                _CHILDREN.discard(pid)
+
+
+def on_sigchld(signum, frame): # pylint:disable=unused-argument
+    """SIGCHLD handler"""
+    reap()
+
+
+def install_reaper():
+    """Reaps terminated programs on SIGCHLD - must be called from the main thread"""
+    signal.signal(signal.SIGCHLD, on_sigchld)
+    signal.siginterrupt(signal.SIGCHLD, False) # restart interrupted system calls (i.e. socket accept)
+
+
+def launch(executable_path, parameter='', single_parameter=False, fixed_arguments=()):
+    """Starts executable_path with fixed_arguments (i.e. of an Exec= line) & the (shlex tokenised) parameter string in its own session.
+    single_parameter passes parameter as one argument (i.e. paths containing spaces). Returns the pid or None if the program could not be started"""
+    reap() # the SIGCHLD handler runs only when the main loop hands control to python - catch up here
+    arguments = [executable_path] + list(fixed_arguments)
+    if parameter != '':
+        arguments.extend([parameter] if single_parameter else split_parameter(parameter))
+
+    start = latency_stats.timer()
+    try:
+        process = subprocess.Popen(arguments, close_fds=True, preexec_fn=os.setsid) # own session - survives the launcher, gets no signals of its terminal
+    except OSError as error:
+        tools.debug_output(__name__, 'launch', 'Unable to start '+str(arguments)+': '+str(error), 3)
+        return None
+    latency = latency_stats.timer() - start
+
+    latency_stats.record('launch', latency) # shown by !stats
+    with _CHILDREN_LOCK:
+        _CHILDREN.add(process.pid)
+    tools.debug_output(__name__, 'launch', 'Started '+str(arguments)+' (pid: '+str(process.pid)+', spawn latency: '+str(round(latency * 1000, 2))+' ms)', 1)
+    return process.pid
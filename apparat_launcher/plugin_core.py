@@ -1,11 +1,11 @@
 #!/usr/bin/python
 """plugin: core (always enabled)"""
 
-## general
-import wx
-
 ## apparat
+import bitmap_cache
 import ini
+import plugin_registry
+import prefs
 import tools
 
 
@@ -13,19 +13,7 @@ import tools
 # -----------------------------------------------------------------------------------------------
 # CONSTANTS
 # -----------------------------------------------------------------------------------------------
-TRIGGER = ('!help', '!preferences', '!prefs',)
-
-PLUGINS = (
-    'plugin_kill',
-    'plugin_misc',
-    'plugin_nautilus',
-    'plugin_passwordgen',
-    'plugin_screenshot',
-    'plugin_search_internet',
-    'plugin_search_local',
-    'plugin_session',
-    'plugin_shell',
-)
+TRIGGER = plugin_registry.get_triggers('plugin_core') # see plugin manifest
 
 # -----------------------------------------------------------------------------------------------
 # FUNCTIONS
@@ -45,8 +33,8 @@ def parse(current_search_string, main_window):
         tools.debug_output(__name__, 'parse', 'Case: Help', 1)
 
         # show icon for really fast users
-        main_window.ui__bt_command_img = wx.Image('gfx/plugins/core/'+icon_size+'/help.png', wx.BITMAP_TYPE_PNG)
-        main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+        main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/core/'+icon_size+'/help.png')
+        main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
         main_window.ui__bt_command.SetToolTipString('Open help')
 
         main_window.open_app_url()
@@ -64,13 +52,26 @@ def parse(current_search_string, main_window):
         tools.debug_output(__name__, 'parse', 'Case: Preferences', 1)
 
         # show icon for really fast users
-        main_window.ui__bt_command_img = wx.Image('gfx/plugins/core/'+icon_size+'/preferences.png', wx.BITMAP_TYPE_PNG)
-        main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+        main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/core/'+icon_size+'/preferences.png')
+        main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
         main_window.ui__bt_command.SetToolTipString('Open preferences')
 
         main_window.open_preference_window()
         main_window.reset_ui()
 
+    ## Statistics (latency histograms)
+    #
+    elif current_search_string == '!stats': # opens the statistics tab of the preferences
+        tools.debug_output(__name__, 'parse', 'Case: Statistics', 1)
+
+        # show icon for really fast users
+        main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/core/'+icon_size+'/preferences.png')
+        main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
+        main_window.ui__bt_command.SetToolTipString('Open statistics')
+
+        main_window.open_preference_window(prefs.TAB_STATISTICS)
+        main_window.reset_ui()
+
     ## Invalid
     #
     else:
@@ -0,0 +1,114 @@
+#!/usr/bin/python
+"""Routes the user input to the matching plugin using a precompiled trigger table - built from the plugin manifest, plugins get imported on first use"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## apparat
+import ini
+import plugin_registry
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+_EXACT_TRIGGERS = {} # trigger: handler
+_PREFIX_TRIGGERS = None # TriggerTrie
+_ENABLED_TRIGGERS = () # all triggers of the enabled plugins (for the plugin-command-search)
+
+
+# -----------------------------------------------------------------------------------------------
+# CLASSES
+# -----------------------------------------------------------------------------------------------
+class TriggerTrie(object):
+
+    """Character trie for prefix triggers - returns the handler of the longest matching trigger"""
+
+    def __init__(self):
+        """Creates an empty trie"""
+        self.root = {}
+
+
+    def add(self, trigger, handler):
+        """Adds a prefix trigger"""
+        node = self.root
+        for char in trigger:
+            node = node.setdefault(char, {})
+        node[None] = handler # None marks the end of a trigger
+
+
+    def longest_prefix_match(self, text):
+        """Returns the handler of the longest trigger which is a prefix of text (or None)"""
+        node = self.root
+        handler = None
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                handler = node[None]
+        return handler
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def rebuild():
+    """Builds the trigger tables from the currently enabled plugins"""
+    global _EXACT_TRIGGERS, _PREFIX_TRIGGERS, _ENABLED_TRIGGERS # pylint:disable=global-statement
+    tools.debug_output(__name__, 'rebuild', 'Building plugin dispatch table', 1)
+
+    exact_triggers = {}
+    prefix_triggers = TriggerTrie()
+    enabled_triggers = ()
+
+    for plugin_name in ('plugin_core',) + plugin_registry.PLUGINS: # core first as it can not be disabled
+        if plugin_name != 'plugin_core' and ini.read_bool_ini_value('Plugins', plugin_name) is False:
+            continue
+
+        plugin = plugin_registry.get_plugin(plugin_name)
+        handler = plugin_registry.get_handler(plugin_name) # imports the plugin on its first call
+        for trigger in plugin.exact:
+            exact_triggers[trigger] = handler
+        for trigger in plugin.prefix:
+            prefix_triggers.add(trigger, handler)
+
+        if not plugin.hidden:
+            for trigger in plugin_registry.get_triggers(plugin_name):
+                if trigger not in enabled_triggers:
+                    enabled_triggers = enabled_triggers + (trigger,)
+
+    ## swap the tables in one go
+    _EXACT_TRIGGERS = exact_triggers
+    _PREFIX_TRIGGERS = prefix_triggers
+    _ENABLED_TRIGGERS = enabled_triggers
+    tools.debug_output(__name__, 'rebuild', 'Got '+str(len(enabled_triggers))+' enabled plugin commands', 1)
+
+
+def route(current_search_string):
+    """Returns the handler of the plugin responsible for the user input (or None). Exact triggers win over prefix triggers"""
+    if _PREFIX_TRIGGERS is None:
+        rebuild()
+
+    handler = _EXACT_TRIGGERS.get(current_search_string)
+    if handler is None:
+        handler = _PREFIX_TRIGGERS.longest_prefix_match(current_search_string)
+    return handler
+
+
+def get_enabled_triggers():
+    """Returns all triggers of the enabled plugins (used by the plugin-command-search)"""
+    if _PREFIX_TRIGGERS is None:
+        rebuild()
+    return _ENABLED_TRIGGERS
+
+
+def on_ini_value_changed(section_name, key_name, value): # pylint:disable=unused-argument
+    """Rebuild the tables if the ini got modified from outside"""
+    if section_name is None and _PREFIX_TRIGGERS is not None:
+        rebuild()
+
+
+ini.register_change_callback(on_ini_value_changed)
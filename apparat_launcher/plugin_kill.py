@@ -1,11 +1,10 @@
 #!/usr/bin/python
 """plugin: kill (optional)"""
 
-## general
-import wx
-
 ## apparat
+import bitmap_cache
 import ini
+import plugin_registry
 import tools
 
 
@@ -13,7 +12,7 @@ import tools
 # CONSTANTS
 # -----------------------------------------------------------------------------------------------
 
-TRIGGER = ('!kill', '!xkill',)
+TRIGGER = plugin_registry.get_triggers('plugin_kill') # see plugin manifest
 
 
 # -----------------------------------------------------------------------------------------------
@@ -29,14 +28,14 @@ def parse(main_window):
     icon_size = ini.read_single_ini_value('General', 'icon_size') # get preference value
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/kill/'+icon_size+'/kill.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/kill/'+icon_size+'/kill.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Kill application by selecting a window with your cursor')
     main_window.ui__txt_command.SetValue('xkill')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Start rampage')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('')
 
@@ -3,10 +3,11 @@
 
 ## general
 import os
-import wx
 
 ## apparat
+import bitmap_cache
 import ini
+import plugin_registry
 import tools
 
 
@@ -14,7 +15,7 @@ import tools
 # -----------------------------------------------------------------------------------------------
 # CONSTANTS
 # -----------------------------------------------------------------------------------------------
-TRIGGER = ('!open',)
+TRIGGER = plugin_registry.get_triggers('plugin_misc') # see plugin manifest
 
 
 # -----------------------------------------------------------------------------------------------
@@ -46,15 +47,15 @@ def prepare_plugin_misc_open(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Misc (Open)') ## update plugin info
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/misc/'+icon_size+'/open.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/misc/'+icon_size+'/open.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Open')
 
     if(len(main_window.ui__cb_search.GetValue()) > 6) and  (main_window.ui__cb_search.GetValue()[6:] != ''):
         ## parameter button
         main_window.ui__bt_parameter.SetToolTipString('Open')
-        main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-        main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+        main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+        main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
 
         ## set parameter
         if (main_window.ui__cb_search.GetValue()[6:7] == '~'):
@@ -3,16 +3,17 @@
 
 # general
 import os
-import wx
 
 # apparat
+import bitmap_cache
 import ini
+import plugin_registry
 import tools
 
 # -----------------------------------------------------------------------------------------------
 # CONSTANTS
 # -----------------------------------------------------------------------------------------------
-TRIGGER = ('!goto', '!recent', '!trash', '!network', '!net',)
+TRIGGER = plugin_registry.get_triggers('plugin_nautilus') # see plugin manifest
 
 
 # -----------------------------------------------------------------------------------------------
@@ -59,15 +60,15 @@ def prepare_plugin_nautilus_goto(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Nautilus (GoTo)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/nautilus/'+icon_size+'/goto.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/nautilus/'+icon_size+'/goto.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Go to folder')
     main_window.ui__txt_command.SetValue('nautilus')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Open')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     ## set parameter txt
     if (main_window.ui__cb_search.GetValue()[6:7] == '~'):
         tools.debug_output(__name__, 'prepare_plugin_nautilus_goto', 'Replacing ~', 1)
@@ -85,15 +86,15 @@ def prepare_plugin_nautilus_show_network_devices(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Nautilus (Network)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/nautilus/'+icon_size+'/network.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/nautilus/'+icon_size+'/network.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Show network devices')
     main_window.ui__txt_command.SetValue('nautilus')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Open')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('network://')
 
 
@@ -105,15 +106,15 @@ def prepare_plugin_nautilus_show_recent(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Nautilus (Recent)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/nautilus/'+icon_size+'/recent.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/nautilus/'+icon_size+'/recent.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Show recent files')
     main_window.ui__txt_command.SetValue('nautilus')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Open')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('recent://')
 
 
@@ -125,13 +126,13 @@ def prepare_plugin_nautilus_open_trash(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Nautilus (Trash)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/nautilus/'+icon_size+'/trash.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/nautilus/'+icon_size+'/trash.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Open Trash')
     main_window.ui__txt_command.SetValue('nautilus')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Open')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('trash://')
@@ -9,15 +9,18 @@ import wx
 
 
 ## apparat
+import bitmap_cache
 import ini
+import plugin_registry
 import tools
+import usage_statistics
 
 
 
 # -----------------------------------------------------------------------------------------------
 # CONSTANTS
 # -----------------------------------------------------------------------------------------------
-TRIGGER = ('!pw', '!password',)
+TRIGGER = plugin_registry.get_triggers('plugin_passwordgen') # see plugin manifest
 
 
 # -----------------------------------------------------------------------------------------------
@@ -49,14 +52,14 @@ def prepare_plugin_passwordgen(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Password Generator') ## update plugin info
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/passwordgen/'+icon_size+'/password.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/passwordgen/'+icon_size+'/password.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Password Generator')
 
     ## parameter button
     main_window.ui__bt_parameter.SetToolTipString('Generate')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
 
     tools.debug_output(__name__, 'prepare_plugin_passwordgen', 'Finished preparing password UI', 1)
 
@@ -109,9 +112,7 @@ def execute_password_generation(main_window):
             wx.MessageBox('Choose from the following:\n\n'+generated_passwords, 'Password Generator', wx.OK | wx.ICON_INFORMATION)
 
             ## update usage-statistics
-            tools.debug_output(__name__, 'execute_password_generation', 'Updating statistics (plugin_executed)', 1)
-            current_plugin_executed_count = ini.read_single_ini_value('Statistics', 'plugin_executed') # get current value from ini
-            ini.write_single_ini_value('Statistics', 'plugin_executed', int(current_plugin_executed_count)+1) # update ini +1
+            usage_statistics.increment('plugin_executed')
 
         except ValueError:
             tools.debug_output(__name__, 'execute', 'Password length entered by user was not a number', 3)
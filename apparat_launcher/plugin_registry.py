@@ -0,0 +1,107 @@
+#!/usr/bin/python
+"""Plugin manifest (triggers, requirements, entry points) - plugin modules get imported on the first use of one of their triggers"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import collections
+import importlib
+
+## apparat
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+Plugin = collections.namedtuple('Plugin', [
+    'exact', # triggers matching the complete input
+    'prefix', # triggers matching the start of the input (they accept a parameter)
+    'requirements', # executables which need to be installed
+    'entry', # function handling the input
+    'arguments', # argument names of the entry function
+    'hidden', # triggers are not offered in the plugin-command-search
+])
+
+SEARCH_STRING_FIRST = ('current_search_string', 'main_window')
+MAIN_WINDOW_FIRST = ('main_window', 'current_search_string')
+
+MANIFEST = {
+    'plugin_core': Plugin((), ('!help', '!preferences', '!prefs', '!stats'), (), 'parse', SEARCH_STRING_FIRST, False),
+    'plugin_kill': Plugin(('!kill', '!xkill'), (), ('xkill',), 'parse', ('main_window',), False),
+    'plugin_misc': Plugin((), ('!open',), ('xdg-open',), 'parse', SEARCH_STRING_FIRST, False),
+    'plugin_nautilus': Plugin(('!goto', '!recent', '!trash', '!network', '!net'), ('!goto',), (), 'parse', SEARCH_STRING_FIRST, False), # goto = special case as it accepts parameter
+    'plugin_passwordgen': Plugin(('!pw', '!password'), (), (), 'parse', SEARCH_STRING_FIRST, False),
+    'plugin_screenshot': Plugin(('!ss', '!fs'), (), (), 'parse', SEARCH_STRING_FIRST, False),
+    'plugin_search_internet': Plugin((), (
+        '!am', '!au', '!bc', '!dd', '!fb', '!fe', '!fl', '!gh', '!gi', '!gk', '!gm', '!gn',
+        '!gs', '!la', '!re', '!sc', '!se', '!so', '!tu', '!tw', '!vi', '!wi', '!yt',
+    ), (), 'parse', MAIN_WINDOW_FIRST, False), # order matches plugin_search_internet.URLS
+    'plugin_search_content': Plugin((), ('??',), ('xdg-open',), 'search_file_contents', MAIN_WINDOW_FIRST, True),
+    'plugin_search_local': Plugin((), ('?',), ('xdg-open',), 'search_user_files', MAIN_WINDOW_FIRST, True),
+    'plugin_session': Plugin(('!hibernate', '!sleep', '!lock', '!logout', '!reboot', '!restart', '!shutdown', '!halt', '!screensaver', '!saver'), (), ('gnome-screensaver-command', 'gnome-session-quit', 'systemctl'), 'parse', SEARCH_STRING_FIRST, False),
+    'plugin_shell': Plugin((), ('!sh',), (), 'parse', SEARCH_STRING_FIRST, False),
+}
+
+## optional plugins (can be enabled/disabled in [Plugins])
+PLUGINS = (
+    'plugin_kill',
+    'plugin_misc',
+    'plugin_nautilus',
+    'plugin_passwordgen',
+    'plugin_screenshot',
+    'plugin_search_content',
+    'plugin_search_internet',
+    'plugin_search_local',
+    'plugin_session',
+    'plugin_shell',
+)
+
+_MODULES = {} # plugin name: imported module
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def get_plugin(plugin_name):
+    """Returns the manifest entry of a plugin"""
+    return MANIFEST[plugin_name]
+
+
+def get_triggers(plugin_name):
+    """Returns all triggers of a plugin (exact & prefix, without duplicates) - no plugin code gets imported"""
+    plugin = MANIFEST[plugin_name]
+    return plugin.exact + tuple(trigger for trigger in plugin.prefix if trigger not in plugin.exact)
+
+
+def get_requirements(plugin_name):
+    """Returns the executables a plugin needs"""
+    return MANIFEST[plugin_name].requirements
+
+
+def load(plugin_name):
+    """Returns the plugin module - imports it on the first call"""
+    module = _MODULES.get(plugin_name)
+    if module is None:
+        tools.debug_output(__name__, 'load', 'Importing '+plugin_name, 1)
+        module = importlib.import_module(plugin_name)
+        _MODULES[plugin_name] = module
+    return module
+
+
+def get_handler(plugin_name):
+    """Returns handler(current_search_string, main_window) for the plugin - the module gets imported when the handler is called first"""
+    plugin = MANIFEST[plugin_name]
+
+    def handler(current_search_string, main_window):
+        """Import the plugin (if needed) & call its entry function"""
+        values = {'current_search_string': current_search_string, 'main_window': main_window}
+        return getattr(load(plugin_name), plugin.entry)(*[values[argument] for argument in plugin.arguments])
+    return handler
+
+
+def get_loaded_plugins():
+    """Returns the names of all plugins which got imported so far"""
+    return sorted(_MODULES)
@@ -3,17 +3,18 @@
 
 # general
 import os
-import wx
 
 # apparat
+import bitmap_cache
 import ini
+import plugin_registry
 import tools
 
 
 # -----------------------------------------------------------------------------------------------
 # CONSTANTS
 # -----------------------------------------------------------------------------------------------
-TRIGGER = ('!ss', '!fs',)
+TRIGGER = plugin_registry.get_triggers('plugin_screenshot') # see plugin manifest
 
 
 # -----------------------------------------------------------------------------------------------
@@ -57,15 +58,15 @@ def prepare_selective_screenshot(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Screenshot (Selective)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/screenshot/'+icon_size+'/screenshot_selective.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/screenshot/'+icon_size+'/screenshot_selective.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Selective Screenshot')
     main_window.ui__txt_command.SetValue('import')
 
     ## parameter button
     main_window.ui__bt_parameter.SetToolTipString('Do')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     ## parameter txt
     current_timestamp = tools.generate_timestamp()
     parameter = os.environ['HOME']+'/'+current_timestamp+'_selection.png'
@@ -80,15 +81,15 @@ def prepare_full_screenshot(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Screenshot (Full)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/screenshot/'+icon_size+'/screenshot_full.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/screenshot/'+icon_size+'/screenshot_full.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Full Screenshot')
     main_window.ui__txt_command.SetValue('import')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Do')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     ## parameter txt
     current_timestamp = tools.generate_timestamp()
     parameter = '-window root '+os.environ['HOME']+'/'+current_timestamp+'_full.png'
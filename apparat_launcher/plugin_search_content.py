@@ -0,0 +1,77 @@
+#!/usr/bin/python
+"""plugin: search-content (optional)"""
+
+## apparat
+import bitmap_cache
+import content_index
+import ini
+import latency_stats
+import plugin_registry
+import plugin_search_local
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+
+TRIGGER = plugin_registry.get_triggers('plugin_search_content') # see plugin manifest
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+@latency_stats.timed('search (file contents)')
+def find_file_contents(current_search_string):
+    """Returns (ranked paths, match count) of the text files containing all words of the search string - looked up in the content index"""
+    content_index.start_watcher() # builds the index in the background & keeps it fresh - only once the plugin is used
+    return content_index.search(current_search_string)
+
+
+def search_file_contents(main_window, current_search_string):
+    """Search inside of user files"""
+    tools.debug_output(__name__, 'search_file_contents', 'starting', 1)
+
+    # Reset status notification back to OK
+    main_window.status_notification_reset()
+
+    icon_size = ini.read_single_ini_value('General', 'icon_size') # get preference value
+
+    ## reset combobox
+    search_results = []
+    main_window.ui__cb_search.SetItems(search_results) # update combobox
+
+    ## update plugin info
+    main_window.plugin__update_general_ui_information('Content Search')
+
+    ## command button & txt
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/search_local/'+icon_size+'/search.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
+    main_window.ui__bt_command.SetToolTipString('Search inside of local user files')
+    main_window.ui__txt_command.SetValue('xdg-open')
+
+    ## parameter button & txt
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/blank.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
+    main_window.ui__bt_parameter.SetToolTipString('Search inside of local user files')
+    main_window.ui__txt_parameter.SetValue('')
+
+    if(len(current_search_string) > 5) and current_search_string.startswith('?? '):
+        current_search_string = current_search_string[3:] # get the real search term without trigger
+        tools.debug_output(__name__, 'search_file_contents', 'Searching file contents for: '+current_search_string, 1)
+
+        if(len(current_search_string) > 2): # if search string is long enough
+            main_window.search_scheduler.schedule(
+                'search_content',
+                lambda: find_file_contents(current_search_string),
+                lambda result: show_file_contents(main_window, icon_size, *result))
+        else:
+            tools.debug_output(__name__, 'search_file_contents', 'aborting search (string too short)', 2)
+            main_window.ui__txt_result_counter.SetValue('0')
+
+
+def show_file_contents(main_window, icon_size, search_results, match_count):
+    """Updates the UI with the results of a content search - flags them as incomplete while the index gets built"""
+    plugin_search_local.show_user_files(main_window, icon_size, search_results, match_count)
+    if content_index.is_updating():
+        main_window.status_notification_display_info('Indexing file contents... - results are incomplete')
@@ -3,42 +3,20 @@
 
 # general
 import webbrowser
-import wx
 
 # apparat
+import bitmap_cache
 import ini
+import plugin_registry
 import tools
+import usage_statistics
 
 
 # -----------------------------------------------------------------------------------------------
 # CONSTANTS
 # -----------------------------------------------------------------------------------------------
 
-TRIGGER = (
-    '!am',
-    '!au',
-    '!bc',
-    '!dd',
-    '!fb',
-    '!fe',
-    '!fl',
-    '!gh',
-    '!gi',
-    '!gk',
-    '!gm',
-    '!gn',
-    '!gs',
-    '!la',
-    '!re',
-    '!sc',
-    '!se',
-    '!so',
-    '!tu',
-    '!tw',
-    '!vi',
-    '!wi',
-    '!yt',
-)
+TRIGGER = plugin_registry.get_triggers('plugin_search_internet') # see plugin manifest
 
 URLS = (
     'https://www.amazon.de/s/field-keywords=',
@@ -159,17 +137,17 @@ def parse(main_window, current_search_string):
     description = DESCRIPTIONS[index]
 
     # update UI with icon and description
-    main_window.ui__bt_command_img = wx.Image(icon, wx.BITMAP_TYPE_PNG)
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap(icon)
     main_window.plugin__update_general_ui_information(description)
 
     ## command button
     main_window.ui__bt_command.Enable(True)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
 
     ## parameter button
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/search.png', wx.BITMAP_TYPE_PNG)
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/search.png')
     main_window.ui__bt_parameter.Enable(True)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__bt_parameter.SetToolTipString('Search')
 
 
@@ -191,9 +169,7 @@ def execute_internet_search(main_window, command, parameter):
     webbrowser.open(remote_url)
 
     ## update usage-statistics
-    tools.debug_output(__name__, 'execute_internet_search', 'Updating statistics (plugin_executed)', 1)
-    current_plugin_executed_count = ini.read_single_ini_value('Statistics', 'plugin_executed') # get current value from ini
-    ini.write_single_ini_value('Statistics', 'plugin_executed', int(current_plugin_executed_count)+1) # update ini +1
+    usage_statistics.increment('plugin_executed')
 
     # reset the UI
     main_window.reset_ui()
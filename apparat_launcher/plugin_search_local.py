@@ -2,26 +2,136 @@
 """plugin: search-local (optional)"""
 
 ## general
-import difflib # for intelligent list sort
-import fnmatch
 import os
-import wx
+import re
+import time
 
 ## apparat
+import bitmap_cache
+import file_index
 import ini
+import latency_stats
+import plugin_registry
+import scoring
+import search_cache
 import tools
+import trigram_index
 
 
 # -----------------------------------------------------------------------------------------------
 # CONSTANTS
 # -----------------------------------------------------------------------------------------------
 
-TRIGGER = ('?',)
+TRIGGER = plugin_registry.get_triggers('plugin_search_local') # see plugin manifest
+
+SEARCH_SESSION = search_cache.QuerySession(min_narrow_length=trigram_index.GRAM_LENGTH)
+
+FILTER_PATTERN = re.compile(r'^(ext|modified|size|type):(.+)$') # i.e. ext:pdf,doc  type:dir  size:>1M  modified:<7d  modified:>2017-06-01
+SIZE_PATTERN = re.compile(r'^([<>])(\d+(?:\.\d+)?)([kmgt]?)b?$', re.IGNORECASE)
+AGE_PATTERN = re.compile(r'^([<>])(\d+(?:\.\d+)?)([hdwy])$')
+DATE_PATTERN = re.compile(r'^([<>])(\d{4}-\d{2}-\d{2})$')
+SIZE_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3, 't': 1024 ** 4}
+AGE_UNITS = {'h': 3600, 'd': 86400, 'w': 7 * 86400, 'y': 365 * 86400}
+TYPES = {'f': False, 'file': False, 'd': True, 'dir': True, 'directory': True, 'folder': True}
 
 
 # -----------------------------------------------------------------------------------------------
 # FUNCTIONS
 # -----------------------------------------------------------------------------------------------
+def narrow_range(filters, column, minimum, maximum):
+    """Intersects the (min, max) range of a filter with minimum & maximum (None = open)"""
+    old_minimum, old_maximum = filters.get(column, (None, None))
+    if minimum is None or (old_minimum is not None and old_minimum > minimum):
+        minimum = old_minimum
+    if maximum is None or (old_maximum is not None and old_maximum < maximum):
+        maximum = old_maximum
+    filters[column] = (minimum, maximum)
+
+
+def parse_filters(current_search_string):
+    """Splits the search string into (name query, metadata filters for file_index.search). Raises ValueError for a filter with an invalid value.
+    ext:pdf,doc = extension, type:file|dir, size:>1M|<10k = size bounds, modified:<7d|>2w = age in h/d/w/y (< is newer), modified:>2017-06-01 = after a date"""
+    words = []
+    filters = {}
+    for word in current_search_string.split():
+        match = FILTER_PATTERN.match(word)
+        if match is None:
+            words.append(word)
+            continue
+        name, value = match.groups()
+        if name == 'ext':
+            extensions = set(extension.lstrip('.').lower() for extension in value.split(',') if extension.lstrip('.'))
+            if not extensions:
+                raise ValueError('Invalid filter: '+word)
+            filters.setdefault('extension', set()).update(extensions) # one of them
+        elif name == 'type':
+            if value.lower() not in TYPES:
+                raise ValueError('Invalid filter: '+word)
+            filters['is_dir'] = TYPES[value.lower()]
+        elif name == 'size':
+            match = SIZE_PATTERN.match(value)
+            if match is None:
+                raise ValueError('Invalid filter: '+word)
+            size = float(match.group(2)) * SIZE_UNITS[match.group(3).lower()]
+            narrow_range(filters, 'size', *((size, None) if match.group(1) == '>' else (None, size)))
+        else: # modified
+            match = AGE_PATTERN.match(value)
+            if match is not None:
+                timestamp = time.time() - float(match.group(2)) * AGE_UNITS[match.group(3)]
+                newer = match.group(1) == '<'
+            else:
+                match = DATE_PATTERN.match(value)
+                try:
+                    timestamp = time.mktime(time.strptime(match.group(2), '%Y-%m-%d'))
+                except (AttributeError, ValueError): # no date
+                    raise ValueError('Invalid filter: '+word)
+                newer = match.group(1) == '>'
+            narrow_range(filters, 'mtime', *((timestamp, None) if newer else (None, timestamp)))
+
+    if not filters:
+        return current_search_string, filters
+    return ' '.join(words), filters
+
+
+@latency_stats.timed('search (local files)')
+def find_user_files(current_search_string, filters=None):
+    """Returns all files & directories in the home directory whose name contains the search string (case insensitive) and which pass the filters - looked up in the file index"""
+    return file_index.search(current_search_string, filters)
+
+
+def stream_user_files(current_search_string, filters, is_cancelled):
+    """Yields (ranked results, match count) - once from the session (or the filtered index) if the file index is loaded.
+    While it gets built, every batch of matches is merged into the ranked results (the result count grows)"""
+    file_index.start_watcher() # keeps the index fresh - only once the plugin is used
+    if file_index.is_loaded():
+        if filters: # no session - a longer filter value does not narrow the results of a shorter one (ext:p vs. ext:pdf)
+            yield rank_user_files(current_search_string, find_user_files(current_search_string, filters))
+        else:
+            yield SEARCH_SESSION.search(current_search_string, find_user_files, filter_user_files, rank_user_files, generation=file_index.get_generation())
+        return
+
+    search_results = []
+    match_count = 0
+    for paths in file_index.stream_search(current_search_string, is_cancelled, filters):
+        if is_cancelled():
+            return
+        batch_results, batch_count = rank_user_files(current_search_string, paths)
+        search_results, _ = rank_user_files(current_search_string, search_results + batch_results) # merge - the best of both are among their top results
+        match_count += batch_count
+        yield search_results, match_count
+
+
+def filter_user_files(current_search_string, candidates):
+    """Returns all candidates (paths) whose file name contains the search string (case insensitive)"""
+    current_search_string = current_search_string.lower()
+    return [path for path in candidates if current_search_string in os.path.basename(path).lower()]
+
+
+@latency_stats.timed('ranking (local files)')
+def rank_user_files(current_search_string, candidates):
+    """Ranks the candidates by file name & keeps only the best ones"""
+    return scoring.top_k(current_search_string, candidates, key=os.path.basename)
+
 
 def search_user_files(main_window, current_search_string):
     """Search for user files"""
@@ -40,68 +150,74 @@ def search_user_files(main_window, current_search_string):
     main_window.plugin__update_general_ui_information('Local Search')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/search_local/'+icon_size+'/search.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/search_local/'+icon_size+'/search.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Search local user files')
     main_window.ui__txt_command.SetValue('xdg-open')
 
     ## parameter button & txt
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/blank.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/blank.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__bt_parameter.SetToolTipString('Search local user files')
     main_window.ui__txt_parameter.SetValue('')
 
     if(len(current_search_string) > 4) and current_search_string.startswith('? '):
         current_search_string = current_search_string[2:] # get the real search term without trigger
         tools.debug_output(__name__, 'search_user_files', 'Searching local files for: '+current_search_string, 1)
-        root = os.environ['HOME']
-        pattern = '*'+current_search_string+'*'
 
-        search_results = []
-
-        if(len(current_search_string) > 2): # if search string is long enough
-            tools.debug_output(__name__, 'search_user_files', 'Searching local user files for the following string: '+current_search_string, 1)
-
-            exclude = set(['.cache', '.dbus', '.dropbox', '.dropbox-dist', '.local/share/Trash']) # exclude list for file search in home dir
-            for root, dirs, files in os.walk(root):
-                dirs[:] = [d for d in dirs if d not in exclude]
-                for filename in fnmatch.filter(files, pattern):
-                    result = os.path.join(root, filename) # append to list
-                    search_results.append(result)
+        try:
+            current_search_string, filters = parse_filters(current_search_string)
+        except ValueError as error:
+            main_window.status_notification_display_error(str(error))
+            main_window.ui__txt_result_counter.SetValue('0')
+            return
+
+        if(len(current_search_string) > 2) or filters: # if search string is long enough - or filters narrow the search
+            tools.debug_output(__name__, 'search_user_files', 'Searching local user files for the following string: '+current_search_string+' (filters: '+str(filters)+')', 1)
+
+            ## search the file index on the search worker only if no shorter query was cached - otherwise narrow its results
+            ## results are streamed while the index gets built - the next keystroke stops the stream
+            scheduler = main_window.search_scheduler
+            scheduler.schedule(
+                'search_local',
+                lambda: stream_user_files(current_search_string, filters, scheduler.is_cancelled),
+                lambda result: show_user_files(main_window, icon_size, *result),
+                stream=True)
+        else:
+            tools.debug_output(__name__, 'search_user_files', 'aborting search (string too short)', 2)
+            main_window.ui__txt_result_counter.SetValue('0')
 
-            tools.debug_output(__name__, 'search_user_files', 'Got '+(str(len(search_results)))+' Results', 1)
 
-            ## sort search results
-            search_results = sorted(search_results, key=lambda x: difflib.SequenceMatcher(None, x, current_search_string).ratio(), reverse=True) # better sorting
+@latency_stats.timed('widget update (local files)')
+def show_user_files(main_window, icon_size, search_results, match_count):
+    """Updates the UI with the results of a local file search"""
+    tools.debug_output(__name__, 'show_user_files', 'Got '+(str(match_count))+' Results', 1)
 
-            # update result count
-            main_window.ui__txt_result_counter.SetValue(str(len(search_results)))
+    # update result count
+    main_window.ui__txt_result_counter.SetValue(str(match_count))
 
-            if(len(search_results) > 1):
-                ## command button
-                main_window.ui__bt_command_img = wx.Image('gfx/plugins/search_local/'+icon_size+'/files.png', wx.BITMAP_TYPE_PNG)
-                main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    if(len(search_results) > 1):
+        ## command button
+        main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/search_local/'+icon_size+'/files.png')
+        main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
 
-            elif(len(search_results) == 1):
-                ## command button & txt
-                main_window.ui__bt_command_img = wx.Image('gfx/plugins/search_local/'+icon_size+'/file.png', wx.BITMAP_TYPE_PNG)
-                main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
-                main_window.ui__txt_command.SetValue('xdg-open')
+    elif(len(search_results) == 1):
+        ## command button & txt
+        main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/search_local/'+icon_size+'/file.png')
+        main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
+        main_window.ui__txt_command.SetValue('xdg-open')
 
-                ## parameter button & txt
-                main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-                main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
-                main_window.ui__txt_parameter.SetValue(search_results[0])
+        ## parameter button & txt
+        main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+        main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
+        main_window.ui__txt_parameter.SetValue(search_results[0])
 
-            else: ## no results
-                main_window.ui__txt_result_counter.SetValue('0') # overwrite
+    else: ## no results
+        main_window.ui__txt_result_counter.SetValue('0') # overwrite
 
-                ## update application button
-                main_window.ui__bt_command_img = wx.Image('gfx/core/'+icon_size+'/blank.png', wx.BITMAP_TYPE_PNG)
-                main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+        ## update application button
+        main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/blank.png')
+        main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
 
-            ## update combobox
-            main_window.ui__cb_search.SetItems(search_results) # update combobox
-        else:
-            tools.debug_output(__name__, 'search_user_files', 'aborting search (string too short)', 2)
-            main_window.ui__txt_result_counter.SetValue('0')
+    ## update combobox
+    main_window.ui__cb_search.SetItems(search_results) # update combobox
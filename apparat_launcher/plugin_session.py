@@ -1,17 +1,16 @@
 #!/usr/bin/python
 """plugin: session  (optional)"""
 
-# general
-import wx
-
 # apparat
+import bitmap_cache
 import ini
+import plugin_registry
 import tools
 
 
 
 # Plugin: Session
-TRIGGER = ('!hibernate', '!sleep', '!lock', '!logout', '!reboot', '!restart', '!shutdown', '!halt', '!screensaver', '!saver',)
+TRIGGER = plugin_registry.get_triggers('plugin_session') # see plugin manifest
 
 
 def parse(current_search_string, main_window):
@@ -61,15 +60,15 @@ def prepare_plugin_session_hibernate(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Session (Hibernate)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/session/'+icon_size+'/hibernate.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/session/'+icon_size+'/hibernate.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Hibernate machine')
     main_window.ui__txt_command.SetValue('systemctl')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Launch')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('suspend')
 
 
@@ -81,15 +80,15 @@ def prepare_plugin_session_lock(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Session (Lock)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/session/'+icon_size+'/lock.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/session/'+icon_size+'/lock.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Lock Session')
     main_window.ui__txt_command.SetValue('gnome-screensaver-command')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Launch')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('--lock')
 
 
@@ -101,15 +100,15 @@ def prepare_plugin_session_logout(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Session (Logout)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/session/'+icon_size+'/logout.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/session/'+icon_size+'/logout.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Logout Session')
     main_window.ui__txt_command.SetValue('gnome-session-quit')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Launch')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('--logout')
 
 
@@ -121,15 +120,15 @@ def prepare_plugin_session_shutdown(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Session (Shutdown)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/session/'+icon_size+'/shutdown.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/session/'+icon_size+'/shutdown.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Shutdown machine')
     main_window.ui__txt_command.SetValue('gnome-session-quit')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Launch')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('--power-off')
 
 
@@ -141,15 +140,15 @@ def prepare_plugin_session_reboot(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Session (Reboot)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/session/'+icon_size+'/reboot.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/session/'+icon_size+'/reboot.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Reboot machine')
     main_window.ui__txt_command.SetValue('gnome-session-quit')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Launch')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('--reboot')
 
 
@@ -162,13 +161,13 @@ def prepare_plugin_session_screensaver(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Session (Screensaver)')
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/session/'+icon_size+'/screensaver.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/session/'+icon_size+'/screensaver.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Start screensaver')
     main_window.ui__txt_command.SetValue('xdg-screensaver')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Launch')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('activate')
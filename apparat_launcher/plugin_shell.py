@@ -1,11 +1,10 @@
 #!/usr/bin/python
 """plugin: shell (optional)"""
 
-## general
-import wx
-
 ## apparat
+import bitmap_cache
 import ini
+import plugin_registry
 import tools
 
 
@@ -13,7 +12,7 @@ import tools
 # CONSTANTS
 # -----------------------------------------------------------------------------------------------
 
-TRIGGER = ('!sh',)
+TRIGGER = plugin_registry.get_triggers('plugin_shell') # see plugin manifest
 
 
 # -----------------------------------------------------------------------------------------------
@@ -49,13 +48,13 @@ def prepare_plugin_shell(main_window, icon_size):
     main_window.plugin__update_general_ui_information('Shell') # update plugin info
 
     ## command button & txt
-    main_window.ui__bt_command_img = wx.Image('gfx/plugins/shell/'+icon_size+'/shell.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img.ConvertToBitmap())
+    main_window.ui__bt_command_img = bitmap_cache.get_bitmap('gfx/plugins/shell/'+icon_size+'/shell.png')
+    main_window.ui__bt_command.SetBitmap(main_window.ui__bt_command_img)
     main_window.ui__bt_command.SetToolTipString('Execute terminal command')
     main_window.ui__txt_command.SetValue('x-terminal-emulator')
 
     ## parameter button & txt
     main_window.ui__bt_parameter.SetToolTipString('Run')
-    main_window.ui__bt_parameter_img = wx.Image('gfx/core/'+icon_size+'/execute.png', wx.BITMAP_TYPE_PNG)
-    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img.ConvertToBitmap())
+    main_window.ui__bt_parameter_img = bitmap_cache.get_bitmap('gfx/core/'+icon_size+'/execute.png')
+    main_window.ui__bt_parameter.SetBitmap(main_window.ui__bt_parameter_img)
     main_window.ui__txt_parameter.SetValue('-e '+main_window.ui__cb_search.GetValue()[4:])
@@ -11,19 +11,24 @@ import wx
 ## apparat
 import constants
 import ini
+import latency_stats
+import plugin_dispatcher
 import requirements
 import tools
+import usage_statistics
 
 
 # -----------------------------------------------------------------------------------------------
 # PREFERENCE WINDOW
 # -----------------------------------------------------------------------------------------------
+TAB_STATISTICS = 2 # page index of the statistics tab
+
 class PreferenceWindow(wx.Frame):
 
     """Class for Preference Window"""
 
-    def __init__(self, parent, idd):
-        """Initialize the preference window"""
+    def __init__(self, parent, idd, page=0):
+        """Initialize the preference window (page = index of the selected tab)"""
         ## define style of preference window
         pref_window_style = (wx.SYSTEM_MENU | wx.CAPTION | wx.CLOSE_BOX | wx.CLIP_CHILDREN | wx.STAY_ON_TOP | wx.FRAME_NO_TASKBAR)
         wx.Frame.__init__(self, parent, idd, constants.APP_NAME+' - Preferences', size=(500, 600), style=pref_window_style)
@@ -41,6 +46,7 @@ class PreferenceWindow(wx.Frame):
         nb.AddPage(tab1, "General ")
         nb.AddPage(tab2, "Plugins ")
         nb.AddPage(tab3, "Statistics ")
+        nb.SetSelection(page)
 
         ## Set noteboook in a sizer to create the layout
         sizer = wx.BoxSizer()
@@ -188,16 +194,20 @@ class UITabStatistics(wx.Panel):
         wx.Panel.__init__(self, parent)
 
         ## show app start counter
-        cur_ini_value_for_apparat_started = ini.read_single_ini_value('Statistics', 'apparat_started') # get current value from ini
-        txt_stats__apparat_started = wx.StaticText(self, -1, "Apparat started:\t\t\t"+cur_ini_value_for_apparat_started, (20, 20))
+        cur_value_for_apparat_started = usage_statistics.get_value('apparat_started') # ini value + pending increments
+        txt_stats__apparat_started = wx.StaticText(self, -1, "Apparat started:\t\t\t"+str(cur_value_for_apparat_started), (20, 20))
 
         ## show execute counter
-        cur_ini_value_for_command_executed = ini.read_single_ini_value('Statistics', 'command_executed') # get current value from ini
-        txt_stats__command_executed = wx.StaticText(self, -1, "Command executed:\t\t"+cur_ini_value_for_command_executed, (20, 40))
+        cur_value_for_command_executed = usage_statistics.get_value('command_executed') # ini value + pending increments
+        txt_stats__command_executed = wx.StaticText(self, -1, "Command executed:\t\t"+str(cur_value_for_command_executed), (20, 40))
 
         ## show plugin trigger count
-        cur_ini_value_for_plugin_executed = ini.read_single_ini_value('Statistics', 'plugin_executed') # get current value from ini
-        txt_stats__plugin_executed = wx.StaticText(self, -1, "Plugins executed:\t\t\t"+cur_ini_value_for_plugin_executed, (20, 60))
+        cur_value_for_plugin_executed = usage_statistics.get_value('plugin_executed') # ini value + pending increments
+        txt_stats__plugin_executed = wx.StaticText(self, -1, "Plugins executed:\t\t\t"+str(cur_value_for_plugin_executed), (20, 60))
+
+        ## show latency histograms of this session (input -> results)
+        txt_stats__latency = wx.StaticText(self, -1, latency_stats.format_report())
+        txt_stats__latency.SetFont(wx.Font(9, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL, False)) # monospace - keeps the columns aligned
 
         ## Layout
         statistics_sizer = wx.BoxSizer(wx.VERTICAL) # define layout container
@@ -207,6 +217,8 @@ class UITabStatistics(wx.Panel):
         statistics_sizer.Add(txt_stats__command_executed, 0, wx.ALL, border=10)
         statistics_sizer.AddSpacer(10)
         statistics_sizer.Add(txt_stats__plugin_executed, 0, wx.ALL, border=10)
+        statistics_sizer.AddSpacer(20)
+        statistics_sizer.Add(txt_stats__latency, 0, wx.ALL, border=10)
         self.SetSizer(statistics_sizer)
 
 
@@ -225,12 +237,12 @@ class UITabPluginCommands(wx.Panel):
         ##
         cb_enable_plugin_core = wx.CheckBox(self, -1, 'Core', (20, 60))
         cb_enable_plugin_core.SetLabel('core')
-        cb_enable_plugin_core.SetToolTipString(u'Offers !help !prefs and !preferences.Plugin can not be disabled.')
+        cb_enable_plugin_core.SetToolTipString(u'Offers !help !prefs !preferences and !stats.Plugin can not be disabled.')
         cb_enable_plugin_core.SetValue(True)
         cb_enable_plugin_core.Bind(wx.EVT_CHECKBOX, self.on_plugin_checkbox_click) # changing the checkbox change
         cb_enable_plugin_core.Enable(False)
         ## Plugin description
-        txt_plugin_core = wx.StaticText(self, -1, "Offers !help !prefs and !preferences", (20, 40))
+        txt_plugin_core = wx.StaticText(self, -1, "Offers !help !prefs !preferences and !stats", (20, 40))
         txt_plugin_core.SetForegroundColour('#7f8c8d')
         #txt_plugin_core.SetFont(font)
 
@@ -331,6 +343,22 @@ class UITabPluginCommands(wx.Panel):
         txt_plugin_internet_search.SetForegroundColour('#7f8c8d')
         txt_plugin_internet_search.SetFont(font)
 
+        ## Plugin: Content search
+        ##
+        cb_enable_plugin_content_search = wx.CheckBox(self, -1, 'Content-Search', (20, 60))
+        cb_enable_plugin_content_search.SetLabel('search_content')
+        cb_enable_plugin_content_search.SetToolTipString(u'Enables full-text search inside of text files in users home directory')
+        cur_ini_value_for_plugin_search_content = ini.read_single_ini_value('Plugins', 'plugin_search_content') # get current value from ini
+        if cur_ini_value_for_plugin_search_content == 'True':
+            cb_enable_plugin_content_search.SetValue(True)
+        else:
+            cb_enable_plugin_content_search.SetValue(False)
+        cb_enable_plugin_content_search.Bind(wx.EVT_CHECKBOX, self.on_plugin_checkbox_change) # changing the checkbox change
+        ## Plugin description
+        txt_plugin_content_search = wx.StaticText(self, -1, "Enables full-text search inside of text files in users home directory", (20, 40))
+        txt_plugin_content_search.SetForegroundColour('#7f8c8d')
+        txt_plugin_content_search.SetFont(font)
+
         ## Plugin: Local search
         ##
         cb_enable_plugin_local_search = wx.CheckBox(self, -1, 'Local-Search', (20, 60))
@@ -426,6 +454,12 @@ class UITabPluginCommands(wx.Panel):
         screenshotSizer.Add(txt_plugin_screenshot, 0, wx.ALL, border=10) # preferences icon button
         pref_sizer.Add(screenshotSizer, 0, wx.EXPAND)
 
+        ## search content
+        searchcontentSizer = wx.BoxSizer(wx.HORIZONTAL)
+        searchcontentSizer.Add(cb_enable_plugin_content_search, 0, wx.ALL, border=10) # status icon button
+        searchcontentSizer.Add(txt_plugin_content_search, 0, wx.ALL, border=10) # preferences icon button
+        pref_sizer.Add(searchcontentSizer, 0, wx.EXPAND)
+
         ## search internet
         searchinternetSizer = wx.BoxSizer(wx.HORIZONTAL)
         searchinternetSizer.Add(cb_enable_plugin_internet_search, 0, wx.ALL, border=10) # status icon button
@@ -485,3 +519,5 @@ class UITabPluginCommands(wx.Panel):
         else:
             tools.debug_output(__name__, 'on_plugin_checkbox_change', 'Disabled Plugin: '+btn, 1)
             ini.write_single_ini_value('Plugins', 'plugin_'+btn, 'False')
+
+        plugin_dispatcher.rebuild() # update the trigger table of the main window
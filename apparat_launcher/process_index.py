@@ -0,0 +1,99 @@
+#!/usr/bin/python
+"""Snapshot of the process table (name -> pids) - refreshed in the background, lookups never touch /proc"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import threading
+import time
+import psutil
+
+## apparat
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+TTL = 3 # seconds a snapshot is considered fresh
+ATTRS = ['pid', 'name', 'cmdline']
+
+_LOCK = threading.Lock()
+_PIDS = {} # name: [pids]
+_CMDLINES = {} # pid: cmdline
+_TIMESTAMP = None # time of the current snapshot - None = no snapshot yet
+_REFRESHING = False # a background refresh is running
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def iter_processes():
+    """Yields the ATTRS dict of every process"""
+    try:
+        processes = psutil.process_iter(attrs=ATTRS) # psutil >= 5.3 - reads the attributes in one go
+    except TypeError:
+        processes = None
+    if processes is not None:
+        for process in processes:
+            yield process.info
+        return
+
+    for process in psutil.process_iter(): # older psutil
+        try:
+            yield process.as_dict(attrs=ATTRS)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+
+def refresh():
+    """Takes a new snapshot of the process table"""
+    global _PIDS, _CMDLINES, _TIMESTAMP # pylint:disable=global-statement
+    pids = {}
+    cmdlines = {}
+    for info in iter_processes():
+        if info.get('name'):
+            pids.setdefault(info['name'], []).append(info['pid'])
+        cmdlines[info['pid']] = info.get('cmdline') or []
+
+    ## swap in one go
+    _PIDS = pids
+    _CMDLINES = cmdlines
+    _TIMESTAMP = time.time()
+
+
+def refresh_in_background():
+    """Takes a new snapshot on a daemon thread (unless one is already being taken)"""
+    global _REFRESHING # pylint:disable=global-statement
+    with _LOCK:
+        if _REFRESHING:
+            return
+        _REFRESHING = True
+
+    def run_refresh():
+        """Refresh & clear the flag"""
+        global _REFRESHING # pylint:disable=global-statement
+        try:
+            refresh()
+        except Exception as error: # pylint:disable=broad-except
+            tools.debug_output(__name__, 'refresh_in_background', 'Reading the process table failed: '+str(error), 3)
+        finally:
+            _REFRESHING = False
+
+    refresh_thread = threading.Thread(target=run_refresh, name='process_index')
+    refresh_thread.daemon = True
+    refresh_thread.start()
+
+
+def get_pids(name):
+    """Returns the pids of all processes called name - from the current snapshot (a dictionary lookup). A stale snapshot gets refreshed in the background"""
+    if _TIMESTAMP is None or time.time() - _TIMESTAMP > TTL:
+        refresh_in_background()
+    return _PIDS.get(name, [])
+
+
+def get_cmdline(pid):
+    """Returns the command line of pid from the current snapshot"""
+    return _CMDLINES.get(pid, [])
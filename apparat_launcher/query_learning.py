@@ -0,0 +1,137 @@
+#!/usr/bin/python
+"""Learns which result the user picks for a query (i.e. ff -> firefox) - learned choices are served before any fuzzy scoring"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import collections
+import json
+import os
+import threading
+import time
+
+## apparat
+import constants
+import launch_history
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+LEARNING_PATH = constants.APP_INI_FOLDER+'query_learning.json'
+LEARNING_VERSION = 1
+HALF_LIFE = 30 * 24 * 60 * 60 # seconds until a choice counts half
+MAX_QUERIES = 1000 # least recently used queries get dropped
+MAX_CHOICES = 3 # learned choices per query
+MIN_WEIGHT = 0.25 # choices below are forgotten
+WEIGHT_EXECUTED = 1.0 # the user launched the result
+WEIGHT_SELECTED = 0.5 # the user picked the result in the list
+
+_LOCK = threading.Lock()
+_QUERIES = None # OrderedDict (least recently used first) of query: {choice: (weight, timestamp)} - None = not loaded yet
+_DIRTY = False # unsaved changes
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def load():
+    """Reads the learned choices (lazily - on the first lookup)"""
+    global _QUERIES # pylint:disable=global-statement
+    with _LOCK:
+        if _QUERIES is not None:
+            return
+        queries = collections.OrderedDict()
+        try:
+            with open(LEARNING_PATH, 'r') as learning_file:
+                data = json.load(learning_file)
+            if data.get('version') == LEARNING_VERSION:
+                for query, choices in data['queries']:
+                    queries[query] = dict((choice, (weight, timestamp)) for choice, weight, timestamp in choices)
+        except (IOError, ValueError, KeyError, TypeError):
+            pass
+        _QUERIES = queries
+        tools.debug_output(__name__, 'load', 'Loaded learned choices for '+str(len(queries))+' queries', 1)
+
+
+def learn(query, choice, weight=WEIGHT_EXECUTED):
+    """Strengthens the association of query with choice (memory only - written by the next flush)"""
+    global _DIRTY # pylint:disable=global-statement
+    if query == '' or query == choice:
+        return
+    load()
+    now = time.time()
+    with _LOCK:
+        choices = _QUERIES.pop(query, {})
+        old = choices.get(choice)
+        if old is not None:
+            weight += launch_history.decay(old[0], old[1], now, HALF_LIFE)
+        choices[choice] = (weight, now)
+
+        ## keep the strongest choices only
+        ranked = sorted(choices, key=lambda c: launch_history.decay(choices[c][0], choices[c][1], now, HALF_LIFE), reverse=True)
+        for dropped in ranked[MAX_CHOICES:]:
+            del choices[dropped]
+
+        _QUERIES[query] = choices # (re-)insert as most recently used
+        while len(_QUERIES) > MAX_QUERIES:
+            _QUERIES.popitem(last=False)
+        _DIRTY = True
+    tools.debug_output(__name__, 'learn', 'Learned: '+query+' -> '+choice, 1)
+
+
+def get_choices(query):
+    """Returns the learned choices for query - strongest first (a dictionary lookup)"""
+    if _QUERIES is None:
+        load()
+    now = time.time()
+    with _LOCK:
+        choices = _QUERIES.get(query)
+        if not choices:
+            return []
+        _QUERIES[query] = _QUERIES.pop(query) # mark as recently used
+        weights = [(launch_history.decay(weight, timestamp, now, HALF_LIFE), choice) for choice, (weight, timestamp) in choices.items()]
+    return [choice for weight, choice in sorted(weights, reverse=True) if weight >= MIN_WEIGHT]
+
+
+def forget(query, choice):
+    """Drops a learned choice (i.e. the executable got uninstalled)"""
+    global _DIRTY # pylint:disable=global-statement
+    with _LOCK:
+        if _QUERIES is not None and choice in _QUERIES.get(query, {}):
+            del _QUERIES[query][choice]
+            _DIRTY = True
+
+
+def flush(background=False):
+    """Writes the learned choices if they changed (write & rename) - called when idle (hide, exit)"""
+    global _DIRTY # pylint:disable=global-statement
+    if background is True:
+        flush_thread = threading.Thread(target=flush, name='query_learning_flush')
+        flush_thread.daemon = True
+        flush_thread.start()
+        return
+
+    now = time.time()
+    with _LOCK:
+        if not _DIRTY:
+            return
+        queries = []
+        for query, choices in _QUERIES.items():
+            choices = [[choice, weight, timestamp] for choice, (weight, timestamp) in choices.items() if launch_history.decay(weight, timestamp, now, HALF_LIFE) >= MIN_WEIGHT]
+            if choices:
+                queries.append([query, choices])
+
+        ## written under the lock - a choice learned meanwhile must not be marked as saved
+        temp_path = LEARNING_PATH+'.tmp'
+        try:
+            with open(temp_path, 'w') as learning_file:
+                json.dump({'version': LEARNING_VERSION, 'queries': queries}, learning_file, separators=(',', ':'))
+            os.rename(temp_path, LEARNING_PATH)
+        except (IOError, OSError):
+            tools.debug_output(__name__, 'flush', 'Unable to write '+LEARNING_PATH+', keeping the changes for the next try', 3)
+            return
+        _DIRTY = False
@@ -0,0 +1,149 @@
+#!/usr/bin/python
+"""Remote control of a running apparat_launcher instance via a unix domain socket (--toggle, --show, --query TEXT)"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+## general - keep this module light, the client runs before wx gets imported
+import os
+import socket
+import threading
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+CLIENT_ARGUMENTS = {'--toggle': 'toggle', '--show': 'show', '--query': 'query'}
+COMMANDS = ('toggle', 'show', 'query')
+CLIENT_TIMEOUT = 1.0 # seconds
+
+_SERVER = None # listening socket
+_STARTUP_COMMAND = None # (command, argument) which could not be forwarded - to be applied by the new instance
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def get_socket_path():
+    """Returns the path of the control socket (inside $XDG_RUNTIME_DIR if available)"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'apparat_launcher.sock')
+    return '/tmp/apparat_launcher-'+str(os.getuid())+'.sock'
+
+
+def parse_client_arguments(arguments):
+    """Returns (command, argument) for the remote control arguments in arguments (sys.argv) or None"""
+    if len(arguments) < 2 or arguments[1] not in CLIENT_ARGUMENTS:
+        return None
+    command = CLIENT_ARGUMENTS[arguments[1]]
+    if command == 'query':
+        return command, ' '.join(arguments[2:])
+    return command, ''
+
+
+def send_command(command, argument=''):
+    """Sends a command to the running instance. Returns True if it was accepted"""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(CLIENT_TIMEOUT)
+    try:
+        client.connect(get_socket_path())
+        client.sendall((command+' '+argument).strip().encode('utf-8')+b'\n')
+        return client.recv(16).strip() == b'ok'
+    except (socket.error, socket.timeout):
+        return False
+    finally:
+        client.close()
+
+
+def run_client(arguments):
+    """Forwards the remote control arguments (if any) to a running instance. Returns True if the request got delivered"""
+    global _STARTUP_COMMAND # pylint:disable=global-statement
+    request = parse_client_arguments(arguments)
+    if request is None:
+        return False
+    if send_command(*request):
+        return True
+    if request[0] == 'toggle': # the new instance is shown & focused - toggling would hide it right away
+        request = ('show', '')
+    _STARTUP_COMMAND = request # no running instance - the new instance handles it after startup
+    return False
+
+
+def get_startup_command():
+    """Returns the (command, argument) the new instance was started with (or None)"""
+    return _STARTUP_COMMAND
+
+
+def handle_connection(connection, handler):
+    """Reads a single command from a client and passes it to the handler"""
+    try:
+        connection.settimeout(CLIENT_TIMEOUT)
+        request = connection.recv(4096).decode('utf-8').strip()
+        command, _, argument = request.partition(' ')
+        if command in COMMANDS:
+            connection.sendall(b'ok\n')
+            handler(command, argument)
+        else:
+            connection.sendall(b'error\n')
+    except (socket.error, socket.timeout, UnicodeDecodeError):
+        pass
+    finally:
+        connection.close()
+
+
+def start_server(handler):
+    """Listens for commands of remote control clients. handler(command, argument) gets called on the server thread"""
+    global _SERVER # pylint:disable=global-statement
+    import tools # not needed by the client
+
+    socket_path = get_socket_path()
+    if os.path.exists(socket_path):
+        if send_command('show'): # should not happen - wx.SingleInstanceChecker prevents a second instance
+            tools.debug_output(__name__, 'start_server', 'Another instance is listening on '+socket_path, 3)
+            return
+        os.unlink(socket_path) # left over from a crashed instance
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077) # socket is accessible for the user only
+    try:
+        server.bind(socket_path)
+    except socket.error as error:
+        tools.debug_output(__name__, 'start_server', 'Unable to bind '+socket_path+': '+str(error), 3)
+        server.close()
+        return
+    finally:
+        os.umask(old_umask)
+    server.listen(5)
+    _SERVER = server
+
+    def serve():
+        """Accept loop"""
+        while True:
+            try:
+                connection, _ = server.accept()
+            except socket.error: # socket got closed
+                return
+            handle_connection(connection, handler)
+
+    server_thread = threading.Thread(target=serve, name='remote_control')
+    server_thread.daemon = True
+    server_thread.start()
+    tools.debug_output(__name__, 'start_server', 'Listening for remote control commands on '+socket_path, 1)
+
+
+def stop_server():
+    """Stops listening & removes the socket"""
+    global _SERVER # pylint:disable=global-statement
+    if _SERVER is None:
+        return
+    try:
+        _SERVER.shutdown(socket.SHUT_RDWR)
+    except socket.error:
+        pass
+    _SERVER.close()
+    _SERVER = None
+    try:
+        os.unlink(get_socket_path())
+    except OSError:
+        pass
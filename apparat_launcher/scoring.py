@@ -0,0 +1,115 @@
+#!/usr/bin/python
+"""Fuzzy scorer (fzf-like) and bounded top-K selection for search results"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import heapq
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+DEFAULT_LIMIT = 100 # max amount of ranked results
+
+SCORE_MATCH = 16 # every matched char
+BONUS_PREFIX = 24 # first query char matches the first char of the candidate
+BONUS_BOUNDARY = 10 # match right after a separator or at a camelCase hump
+BONUS_CONSECUTIVE = 8 # match directly after the previous match
+PENALTY_GAP_START = 3 # first skipped char between two matches
+PENALTY_GAP_EXTENSION = 1 # every further skipped char
+
+SEPARATORS = frozenset(' /\\-_.:+')
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def is_boundary(candidate, position):
+    """Checks if position is the start of a word inside candidate"""
+    if position == 0:
+        return True
+    previous_char = candidate[position-1]
+    return previous_char in SEPARATORS or (previous_char.islower() and candidate[position].isupper())
+
+
+def score_positions(candidate, positions):
+    """Calculates the score for a given set of match positions"""
+    score = 0
+    previous_position = None
+    for position in positions:
+        score += SCORE_MATCH
+        if position == 0:
+            score += BONUS_PREFIX
+        elif is_boundary(candidate, position):
+            score += BONUS_BOUNDARY
+
+        if previous_position is not None:
+            if position == previous_position + 1:
+                score += BONUS_CONSECUTIVE
+            else:
+                score -= PENALTY_GAP_START + PENALTY_GAP_EXTENSION * (position - previous_position - 2)
+        previous_position = position
+    return score
+
+
+def score(query, candidate):
+    """Scores candidate for query (lowercase). Returns (score, match positions) or None if query is not a subsequence of candidate"""
+    query_length = len(query)
+    if query_length == 0:
+        return 0, []
+    candidate_lower = candidate.lower()
+
+    ## forward scan: find the end of the first complete match (str.find runs in C)
+    end = -1
+    for char in query:
+        end = candidate_lower.find(char, end + 1)
+        if end < 0:
+            return None
+
+    ## backward scan: find the tightest start for this end
+    start = end + 1
+    for char in reversed(query):
+        start = candidate_lower.rfind(char, 0, start)
+
+    positions = []
+    position = start - 1
+    for char in query:
+        position = candidate_lower.find(char, position + 1)
+        positions.append(position)
+    best_score = score_positions(candidate, positions)
+
+    ## a contiguous match elsewhere (i.e. at a word boundary) might be better
+    substring_start = candidate_lower.find(query)
+    if substring_start >= 0 and substring_start != start:
+        substring_positions = list(range(substring_start, substring_start + query_length))
+        substring_score = score_positions(candidate, substring_positions)
+        if substring_score > best_score:
+            return substring_score, substring_positions
+
+    return best_score, positions
+
+
+def top_k(query, candidates, limit=DEFAULT_LIMIT, key=None, bonus=None):
+    """Returns (the best limit candidates - best first, amount of matching candidates).
+    key(candidate) selects the text to score, bonus(candidate) adds an extra score (i.e. popularity). Ties: shorter text first, then alphabetical.
+    Uses a bounded heap (heapq.nsmallest) - O(N log K) instead of sorting all matches"""
+    match_count = [0]
+
+    def get_matches():
+        """Yields (-score, length of the scored text, candidate) of all matching candidates - smallest = best"""
+        for candidate in candidates:
+            text = candidate if key is None else key(candidate)
+            result = score(query, text)
+            if result is None:
+                continue
+            match_count[0] += 1
+            candidate_score = result[0]
+            if bonus is not None:
+                candidate_score += bonus(candidate)
+            yield (-candidate_score, len(text), candidate)
+
+    best = heapq.nsmallest(limit, get_matches()) # the heap keeps the same order as the result - ties beyond limit drop the alphabetically last
+    return [entry[2] for entry in best], match_count[0]
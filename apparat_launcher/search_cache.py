@@ -0,0 +1,93 @@
+#!/usr/bin/python
+"""Query session cache - narrows previous candidate sets and memoizes ranked results of recent queries"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import collections
+import threading
+import time
+
+## apparat
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+DEFAULT_MAX_ENTRIES = 32 # amount of recent queries kept in the LRU
+
+
+# -----------------------------------------------------------------------------------------------
+# CLASSES
+# -----------------------------------------------------------------------------------------------
+class QuerySession(object):
+
+    """LRU of query -> (candidates, ranked result). A query which extends a cached query only filters the cached candidates"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_age=None, min_narrow_length=1):
+        """max_age (seconds) limits the lifetime of entries for sources without change tracking.
+        min_narrow_length: shortest cached query whose candidates may be narrowed (i.e. if short queries match differently)"""
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.min_narrow_length = min_narrow_length
+        self.entries = collections.OrderedDict() # query: (timestamp, candidates, result)
+        self.generation = None
+        self.lock = threading.Lock()
+
+
+    def clear(self):
+        """Drops all cached queries"""
+        with self.lock:
+            self.entries.clear()
+
+
+    def get_entry(self, query):
+        """Returns a valid cache entry for query (or None) and marks it as recently used"""
+        entry = self.entries.pop(query, None)
+        if entry is None:
+            return None
+        if self.max_age is not None and time.time() - entry[0] > self.max_age:
+            return None # expired
+        self.entries[query] = entry # re-insert as most recently used
+        return entry
+
+
+    def search(self, query, full_search, narrow, rank, generation=None): # pylint:disable=too-many-arguments
+        """Returns rank(query, candidates) for query.
+        full_search(query) returns the candidates from the complete data source,
+        narrow(query, candidates) filters the candidates of a shorter cached query.
+        generation invalidates the session whenever the data source changed"""
+        with self.lock:
+            if generation != self.generation:
+                self.entries.clear()
+                self.generation = generation
+
+            ## exact hit - i.e. backspace or re-typed query
+            entry = self.get_entry(query)
+            if entry is not None:
+                tools.debug_output(__name__, 'search', 'Cache hit for: '+query, 1)
+                return entry[2]
+
+            ## longest cached prefix of query - filter its candidates only
+            base_entry = None
+            for length in range(len(query) - 1, self.min_narrow_length - 1, -1):
+                base_entry = self.get_entry(query[:length])
+                if base_entry is not None:
+                    break
+
+        if base_entry is not None:
+            tools.debug_output(__name__, 'search', 'Narrowing '+str(len(base_entry[1]))+' cached candidates for: '+query, 1)
+            candidates = narrow(query, base_entry[1])
+        else:
+            candidates = full_search(query)
+        result = rank(query, candidates)
+
+        with self.lock:
+            if generation == self.generation:
+                self.entries[query] = (time.time(), candidates, result)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False) # drop least recently used
+        return result
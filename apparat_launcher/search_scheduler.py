@@ -0,0 +1,182 @@
+#!/usr/bin/python
+"""Debounced background search - runs searches on a worker thread and delivers only the latest result to the UI"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import threading
+import time
+import wx
+
+## apparat
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+DEFAULT_DEBOUNCE = 100 # milliseconds - keystrokes within this window are coalesced into one search
+
+
+# -----------------------------------------------------------------------------------------------
+# CLASSES
+# -----------------------------------------------------------------------------------------------
+class SearchCancelled(Exception):
+
+    """Raised by long running searches which noticed that their result is not needed anymore"""
+
+
+class SearchScheduler(object): # pylint:disable=too-many-instance-attributes
+
+    """Coalesces search requests within the debounce window and computes them on a worker thread.
+    Every request gets a generation number - results of outdated generations are dropped"""
+
+    def __init__(self, debounce=DEFAULT_DEBOUNCE):
+        """Starts the worker thread. debounce is given in milliseconds"""
+        self.debounce = debounce / 1000.0
+        self.generation = 0 # generation of the latest request
+        self.request = None # (generation, name, compute, apply) - latest request which is not applied yet
+        self.is_pending = False # request is waiting for the worker
+        self.running_generation = None # generation the worker is computing right now
+        self.last_schedule = 0
+        self.is_stopped = False
+        self.condition = threading.Condition()
+
+        self.worker = threading.Thread(target=self.run, name='search_scheduler')
+        self.worker.daemon = True
+        self.worker.start()
+
+
+    def set_debounce(self, debounce):
+        """Updates the debounce window (milliseconds)"""
+        self.debounce = debounce / 1000.0
+
+
+    def schedule(self, name, compute, apply, stream=False):
+        """Requests a search. compute() runs on the worker thread and must not touch the UI,
+        apply(result) runs on the UI thread - only for the latest request.
+        stream: compute() returns a generator - every result it yields gets applied (progressive results), the next request stops it"""
+        with self.condition:
+            self.generation += 1
+            self.request = (self.generation, name, compute, apply, stream)
+            self.is_pending = True
+            self.last_schedule = time.time()
+            self.condition.notify()
+
+
+    def cancel(self):
+        """Drops the pending request and the result of a running search (i.e. on UI reset)"""
+        with self.condition:
+            self.generation += 1
+            self.request = None
+            self.is_pending = False
+
+
+    def flush(self):
+        """Computes & applies the latest request right now (on the calling UI thread) - i.e. if Enter was pressed within the debounce window"""
+        with self.condition:
+            request = self.request
+            if request is None or request[4]: # a streaming search keeps running on the worker - it would block the UI
+                return
+            self.generation += 1 # results of the worker for this request are not needed anymore
+            self.request = None
+            self.is_pending = False
+
+        generation, name, compute, apply, _ = request
+        tools.debug_output(__name__, 'flush', 'Computing search '+name+' ('+str(generation)+') on the UI thread', 1)
+        try:
+            result = compute()
+        except SearchCancelled:
+            return
+        apply(result)
+
+
+    def is_cancelled(self):
+        """Checks if the search the worker is computing right now got outdated (for long running searches)"""
+        return self.running_generation != self.generation
+
+
+    def check_cancelled(self):
+        """Raises SearchCancelled if the search the worker is computing right now got outdated"""
+        if threading.current_thread() is self.worker and self.is_cancelled():
+            raise SearchCancelled()
+
+
+    def stop(self):
+        """Stops the worker thread"""
+        with self.condition:
+            self.is_stopped = True
+            self.request = None
+            self.is_pending = False
+            self.condition.notify()
+
+
+    def wait_for_request(self):
+        """Blocks until a request is pending & the debounce window passed. Returns the request (or None if stopped)"""
+        with self.condition:
+            while True:
+                while not self.is_pending and not self.is_stopped:
+                    self.condition.wait()
+                if self.is_stopped:
+                    return None
+
+                ## wait until no further keystroke arrived within the debounce window
+                remaining = self.last_schedule + self.debounce - time.time()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+
+                self.is_pending = False
+                self.running_generation = self.request[0]
+                return self.request
+
+
+    def run(self):
+        """Worker loop"""
+        while True:
+            request = self.wait_for_request()
+            if request is None:
+                return
+
+            generation, name, compute, apply, stream = request
+            start_time = time.time()
+            try:
+                if stream:
+                    self.run_stream(generation, compute, apply)
+                    continue
+                result = compute()
+            except SearchCancelled:
+                tools.debug_output(__name__, 'run', 'Search '+name+' ('+str(generation)+') got cancelled', 1)
+                continue
+            except Exception as error: # pylint:disable=broad-except
+                tools.debug_output(__name__, 'run', 'Search '+name+' ('+str(generation)+') failed: '+str(error), 3)
+                continue
+            finally:
+                self.running_generation = None
+
+            tools.debug_output(__name__, 'run', 'Search '+name+' ('+str(generation)+') took '+str(int((time.time() - start_time) * 1000))+'ms', 1)
+            wx.CallAfter(self.deliver, generation, apply, result)
+
+
+    def run_stream(self, generation, compute, apply):
+        """Hands every result of the generator returned by compute() to the UI thread - until a newer request arrives"""
+        results = compute()
+        try:
+            for result in results:
+                if self.is_cancelled():
+                    raise SearchCancelled()
+                wx.CallAfter(self.deliver, generation, apply, result)
+        finally:
+            results.close() # stops a generator which got cancelled
+
+
+    def deliver(self, generation, apply, result):
+        """Applies a result on the UI thread - if it still belongs to the latest request"""
+        with self.condition:
+            if generation != self.generation:
+                tools.debug_output(__name__, 'deliver', 'Dropping outdated result ('+str(generation)+')', 1)
+                return
+            self.request = None
+        apply(result)
@@ -0,0 +1,74 @@
+#!/usr/bin/python
+"""Startup instrumentation - timestamps the startup phases (--profile-startup [FILE] prints a table, FILE gets cProfile/pstats data)"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+## general - keep this module light, it is imported before anything else
+import sys
+import time
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+ARGUMENT = '--profile-startup'
+
+_START = time.time() # imported first by apparat_launcher - everything before is interpreter startup
+_PHASES = [] # (phase name, start, end) in order
+_LAST_MARK = _START
+_ENABLED = len(sys.argv) > 1 and sys.argv[1] == ARGUMENT
+_PSTATS_PATH = sys.argv[2] if _ENABLED and len(sys.argv) > 2 else None
+_PROFILER = None
+
+if _PSTATS_PATH is not None:
+    import cProfile
+    _PROFILER = cProfile.Profile()
+    _PROFILER.enable()
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def is_enabled():
+    """Checks if apparat_launcher was started with --profile-startup"""
+    return _ENABLED
+
+
+def mark(phase_name):
+    """Ends a startup phase - it started with the previous mark (cheap, does nothing if profiling is disabled)"""
+    global _LAST_MARK # pylint:disable=global-statement
+    if not _ENABLED:
+        return
+    now = time.time()
+    _PHASES.append((phase_name, _LAST_MARK, now))
+    _LAST_MARK = now
+
+
+def format_report(notes=()):
+    """Returns the per-phase table followed by the notes (lines)"""
+    total = (_LAST_MARK - _START) * 1000
+    lines = ['Startup profile (total: %.1f ms)' % total, '%-45s %10s %12s %7s' % ('Phase', 'Start ms', 'Duration ms', '%')]
+    for phase_name, start, end in _PHASES:
+        duration = (end - start) * 1000
+        lines.append('%-45s %10.1f %12.1f %6.1f%%' % (phase_name, (start - _START) * 1000, duration, duration / total * 100 if total else 0))
+    return '\n'.join(lines + list(notes))
+
+
+def finish(notes=()):
+    """Ends the profiling (main loop is up) - prints the table & the notes (i.e. plugins imported during startup), writes the pstats file"""
+    global _ENABLED, _PROFILER # pylint:disable=global-statement
+    if not _ENABLED:
+        return
+    mark('main loop running')
+    _ENABLED = False
+    print(format_report(notes))
+
+    if _PROFILER is not None:
+        _PROFILER.disable()
+        try:
+            _PROFILER.dump_stats(_PSTATS_PATH)
+            print('cProfile data written to: '+_PSTATS_PATH+' (python -m pstats '+_PSTATS_PATH+')')
+        except (IOError, OSError) as error:
+            print('Unable to write '+_PSTATS_PATH+': '+str(error))
+        _PROFILER = None
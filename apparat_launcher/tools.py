@@ -8,14 +8,16 @@
 ## general
 import datetime # for timestamp in debug output
 import os
-import subprocess # for checking if cmd_exists
 import sys
 import syslog
-import psutil # check for running processes
+import threading # for background tasks
 
 
 ## apparat
 import constants
+import executable_index # resolves commands via the $PATH index
+import process_index # check for running processes
+import remote_control
 import version
 
 
@@ -27,13 +29,19 @@ DEBUG = False
 def cmd_exists(cmd):
     """Method to check if a command exists."""
     debug_output(__name__, 'cmd_exists', 'starting', 1)
-    return subprocess.call('type ' + cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE) == 0
+    return which(cmd) is not None
 
 
 def check_arguments():
     """Checks if apparat_launcher was started with arguments or not"""
     global DEBUG # pylint:disable=global-statement
-    if len(sys.argv) > 2: # too much arguments
+    if remote_control.parse_client_arguments(sys.argv) is not None: # remote control request which could not be forwarded - handled after startup
+        pass
+
+    elif sys.argv[1:2] == ['--profile-startup'] and len(sys.argv) <= 3: # optional parameter: pstats file
+        pass
+
+    elif len(sys.argv) > 2: # too much arguments
         print('Error: Unsupported amount of parameters')
         show_help()
         sys.exit()
@@ -101,6 +109,25 @@ def debug_output(source_script, source_function, message, message_type=1):
 
 
 
+def start_background_task(task_name, interval, function):
+    """Runs function every interval seconds in a daemon thread. Returns a threading.Event - set it to stop the task"""
+    stop_event = threading.Event()
+
+    def run_task():
+        """Loop until the stop event gets set"""
+        while not stop_event.wait(interval):
+            try:
+                function()
+            except Exception as error: # pylint:disable=broad-except
+                debug_output(__name__, 'start_background_task', 'Background task '+task_name+' failed: '+str(error), 3)
+
+    task_thread = threading.Thread(target=run_task, name=task_name)
+    task_thread.daemon = True
+    task_thread.start()
+    debug_output(__name__, 'start_background_task', 'Started background task '+task_name+' (interval: '+str(interval)+'s)', 1)
+    return stop_event
+
+
 def generate_timestamp():
     """Generates and returns a timestamp in the format: YYYYMMDD__HHMMSS"""
     timestamp = '{:%Y%m%d__%H%M%S}'.format(datetime.datetime.now())
@@ -123,25 +150,10 @@ def check_general_requirements():
 
 
 def which(program):
-    """Method to check if executable exists"""
-    def is_exe(fpath):
-        """is_exe"""
-        return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
-
-    fpath, fname = os.path.split(program)
-    debug_output(__name__, 'which', 'fpath: '+fpath, 1)
-    debug_output(__name__, 'which', 'fname: '+fname, 1)
-    if fpath:
-        if is_exe(program):
-            return program
-    else:
-        for path in os.environ["PATH"].split(os.pathsep):
-            path = path.strip('"')
-            exe_file = os.path.join(path, program)
-            if is_exe(exe_file):
-                return exe_file
-    debug_output(__name__, 'which', 'finished', 1)
-    return None
+    """Method to check if executable exists - returns its absolute path (or None)"""
+    exe_file = executable_index.resolve(program) # memoized name->path table of $PATH
+    debug_output(__name__, 'which', program+' -> '+str(exe_file), 1)
+    return exe_file
 
 
 def show_version():
@@ -155,6 +167,11 @@ def show_help():
     print("\t-d / --debug\tShow debug output")
     print("\t-h / --help\tShow help")
     print("\t-v / --version\tShow version")
+    print("\t--profile-startup [FILE]\tPrint the duration of all startup phases. Writes cProfile data to FILE (optional)")
+    print("\nRemote control (starts apparat_launcher if it is not running):")
+    print("\t--toggle\tShow or hide the main window")
+    print("\t--show\t\tShow the main window")
+    print("\t--query TEXT\tShow the main window and search for TEXT")
 
 
 def check_platform():
@@ -182,23 +199,18 @@ def trunc_at(s, d, n=3):
 def check_running_processes_by_name(application_name):
     """checks if there are already existing instances/processes of an given app - to decide if launching or focusing makes more sense"""
     debug_output(__name__, 'check_running_processes_by_name', "Checking for existing instances of: "+application_name, 1)
-    for pid in psutil.pids():
-        try:
-            p = psutil.Process(pid)
-            if p.name() == application_name:
-                debug_output(__name__, 'check_running_processes_by_name', 'Found instance of: '+ str(p.cmdline())+' ### Details: '+str(p), 1)
-                debug_output(__name__, 'check_running_processes_by_name', 'Name: '+str(p.name()), 1)
-                debug_output(__name__, 'check_running_processes_by_name', 'PID: '+str(p.pid), 1)
-                return
-
-                ## Try to set focus to the already running app instance
-                #isubprocess.Popen(['wmctrl', '-R', application_name]) # works in general - but is not useable like that as launcher is loosing focus hehe
-                #
-                ## focus app
-                #subprocess.Popen(["xdotool search --pid "+str(p.pid)+" --name "+str(p.name())+" windowactivate"], shell=True)
-                #subprocess.Popen(["xdotool search --pid "+str(p.pid)+" windowactivate"], shell=True)
-                #subprocess.Popen(["xdotool search --name "+str(p.name())+" windowactivate"], shell=True)
-        except psutil.NoSuchProcess:
-            debug_output(__name__, 'check_running_processes_by_name', 'Problems detected while finding running processes, error catched', 3)
+    for pid in process_index.get_pids(application_name): # snapshot of the process table - no /proc access on the UI thread
+        debug_output(__name__, 'check_running_processes_by_name', 'Found instance of: '+ str(process_index.get_cmdline(pid)), 1)
+        debug_output(__name__, 'check_running_processes_by_name', 'Name: '+application_name, 1)
+        debug_output(__name__, 'check_running_processes_by_name', 'PID: '+str(pid), 1)
+        return
+
+        ## Try to set focus to the already running app instance
+        #isubprocess.Popen(['wmctrl', '-R', application_name]) # works in general - but is not useable like that as launcher is loosing focus hehe
+        #
+        ## focus app
+        #subprocess.Popen(["xdotool search --pid "+str(p.pid)+" --name "+str(p.name())+" windowactivate"], shell=True)
+        #subprocess.Popen(["xdotool search --pid "+str(p.pid)+" windowactivate"], shell=True)
+        #subprocess.Popen(["xdotool search --name "+str(p.name())+" windowactivate"], shell=True)
 
     debug_output(__name__, 'check_running_processes_by_name', 'No matching process found for application_name: "'+application_name+'"', 1)
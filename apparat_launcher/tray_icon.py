@@ -12,9 +12,11 @@ import wx
 
 ## apparat
 import constants
+import launch_history
+import query_learning
 import tools
+import usage_statistics
 import version
-import prefs
 
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -84,6 +86,9 @@ class TaskBarIcon(wx.TaskBarIcon): # pylint:disable=too-many-ancestors
         else: # if main window is shown
             tools.debug_output(__name__, 'execute_tray_icon_left_click', 'MainWindow is now hidden/minimized', 1)
             self.frame.Iconize(True)
+            usage_statistics.flush(background=True) # good moment to write pending statistics
+            launch_history.flush(background=True) # ... and to compact the launch history
+            query_learning.flush(background=True)
 
 
     def on_tray_popup_left_show(self, event):
@@ -134,6 +139,7 @@ class TaskBarIcon(wx.TaskBarIcon): # pylint:disable=too-many-ancestors
     def open_preference_window(self):
         """Opens the preference window"""
         tools.debug_output(__name__, 'open_preference_window', 'starting', 1)
+        import prefs # not needed for the startup
         self.prefWindow = prefs.PreferenceWindow(parent=None, idd=-1)
         self.prefWindow.Show()
 
@@ -0,0 +1,170 @@
+#!/usr/bin/python
+"""Trigram posting list index for fast substring search (prefix index for queries shorter than 3 chars)"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import array
+import base64
+import bisect
+import collections
+import re
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+GRAM_LENGTH = 3 # shorter queries use the prefix index
+TYPECODE = 'I' # unsigned int postings
+
+## word starts for the prefix index: after a separator or at a camelCase hump (see scoring.is_boundary)
+WORD_START = re.compile(r'(?<=[ /\\\-_.:+])[^ /\\\-_.:+]|(?<=[a-z])[A-Z]')
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def get_trigrams(text):
+    """Returns the set of all trigrams of text"""
+    return {text[i:i+GRAM_LENGTH] for i in range(len(text) - GRAM_LENGTH + 1)}
+
+
+def contains(postings, document_id):
+    """Checks if the sorted postings contain document_id (binary search)"""
+    position = bisect.bisect_left(postings, document_id)
+    return position < len(postings) and postings[position] == document_id
+
+
+def matches(query, text):
+    """Checks if text matches query the way TrigramIndex.search does (case insensitive) - without an index, i.e. for texts which are not indexed yet"""
+    query = query.lower()
+    lower_text = text.lower()
+    if len(query) >= GRAM_LENGTH or query == '':
+        return query in lower_text
+    return lower_text.startswith(query) or any(lower_text.startswith(query, match.start()) for match in WORD_START.finditer(text))
+
+
+def encode_array(values):
+    """Serializes an array to a (json friendly) string"""
+    return base64.b64encode(values.tostring()).decode('ascii')
+
+
+def decode_array(data):
+    """Deserializes an array from encode_array"""
+    values = array.array(TYPECODE)
+    values.fromstring(base64.b64decode(data))
+    return values
+
+
+# -----------------------------------------------------------------------------------------------
+# CLASSES
+# -----------------------------------------------------------------------------------------------
+class TrigramIndex(object):
+
+    """Maps every trigram to the sorted ids of all texts containing it. Texts are searched in lower case"""
+
+    def __init__(self, texts=None):
+        """Builds the index for texts (list of strings - the position in the list is the id)"""
+        self.texts = []
+        self.postings = {} # trigram: array of text ids
+        self.prefix_ids = array.array(TYPECODE) # prefix index: (text id, word start offset) sorted by the text from the offset
+        self.prefix_offsets = array.array(TYPECODE)
+        if texts is not None:
+            self.build(texts)
+
+
+    def build(self, texts):
+        """Builds posting lists & prefix index"""
+        self.texts = [text.lower() for text in texts]
+
+        postings = collections.defaultdict(list)
+        word_starts = []
+        for text_id, text in enumerate(texts):
+            for trigram in get_trigrams(self.texts[text_id]):
+                postings[trigram].append(text_id) # ids are ascending - postings stay sorted
+            word_starts.append((self.texts[text_id], text_id, 0))
+            for match in WORD_START.finditer(text):
+                word_starts.append((self.texts[text_id][match.start():], text_id, match.start()))
+
+        self.postings = dict((trigram, array.array(TYPECODE, ids)) for trigram, ids in postings.items())
+        word_starts.sort()
+        self.prefix_ids = array.array(TYPECODE, [word_start[1] for word_start in word_starts])
+        self.prefix_offsets = array.array(TYPECODE, [word_start[2] for word_start in word_starts])
+
+
+    def get_prefix(self, position, length):
+        """Returns the first length chars of the word start at position of the prefix index"""
+        offset = self.prefix_offsets[position]
+        return self.texts[self.prefix_ids[position]][offset:offset+length]
+
+
+    def find_prefix_position(self, query, include_equal):
+        """Binary search in the prefix index: first position whose prefix is >= query (> query if include_equal)"""
+        length = len(query)
+        low, high = 0, len(self.prefix_ids)
+        while low < high:
+            middle = (low + high) // 2
+            prefix = self.get_prefix(middle, length)
+            if prefix < query or (include_equal and prefix == query):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+    def search_prefix(self, query):
+        """Returns the sorted ids of all texts with a word starting with query"""
+        start = self.find_prefix_position(query, False)
+        end = self.find_prefix_position(query, True)
+        return sorted(set(self.prefix_ids[start:end]))
+
+
+    def search(self, query):
+        """Returns the sorted ids of all texts containing query (queries shorter than 3 chars: texts with a word starting with query)"""
+        query = query.lower()
+        if query == '':
+            return list(range(len(self.texts)))
+        if len(query) < GRAM_LENGTH:
+            return self.search_prefix(query)
+
+        ## intersect the posting lists - starting with the shortest one
+        posting_lists = []
+        for trigram in get_trigrams(query):
+            postings = self.postings.get(trigram)
+            if postings is None:
+                return []
+            posting_lists.append(postings)
+        posting_lists.sort(key=len)
+
+        candidates = posting_lists[0]
+        for postings in posting_lists[1:]:
+            if len(candidates) * 16 < len(postings): # few candidates - binary search in the long list
+                candidates = [text_id for text_id in candidates if contains(postings, text_id)]
+            else: # similar lengths - set intersection (runs in C)
+                candidates = sorted(set(candidates).intersection(postings))
+
+        ## trigrams might appear in a different order - verify
+        return [text_id for text_id in candidates if query in self.texts[text_id]]
+
+
+    def to_dict(self):
+        """Serializes the index (i.e. for json)"""
+        return {
+            'texts': self.texts,
+            'postings': dict((trigram, encode_array(postings)) for trigram, postings in self.postings.items()),
+            'prefix_ids': encode_array(self.prefix_ids),
+            'prefix_offsets': encode_array(self.prefix_offsets),
+        }
+
+
+    @classmethod
+    def from_dict(cls, data):
+        """Deserializes an index from to_dict"""
+        index = cls()
+        index.texts = data['texts']
+        index.postings = dict((trigram, decode_array(postings)) for trigram, postings in data['postings'].items())
+        index.prefix_ids = decode_array(data['prefix_ids'])
+        index.prefix_offsets = decode_array(data['prefix_offsets'])
+        return index
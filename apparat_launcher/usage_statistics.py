@@ -0,0 +1,92 @@
+#!/usr/bin/python
+"""Keeps the usage statistics counters in memory and writes them to the ini in batches"""
+
+# -----------------------------------------------------------------------------------------------
+# IMPORTS
+# -----------------------------------------------------------------------------------------------
+
+## general
+import threading
+
+## apparat
+import ini
+import tools
+
+
+# -----------------------------------------------------------------------------------------------
+# CONSTANTS
+# -----------------------------------------------------------------------------------------------
+FLUSH_INTERVAL = 60 # seconds between two automatic flushes
+
+_PENDING = {} # counter increments which are not yet written to the ini
+_PENDING_LOCK = threading.Lock()
+_FLUSH_LOCK = threading.Lock()
+_FLUSH_TIMER = None
+
+
+# -----------------------------------------------------------------------------------------------
+# FUNCTIONS
+# -----------------------------------------------------------------------------------------------
+def increment(key_name, amount=1):
+    """Increments a statistics counter in memory - no disk I/O"""
+    tools.debug_output(__name__, 'increment', 'Updating statistics ('+key_name+')', 1)
+    with _PENDING_LOCK:
+        _PENDING[key_name] = _PENDING.get(key_name, 0) + amount
+
+
+def get_value(key_name):
+    """Returns the current value of a statistics counter (ini value plus not yet flushed increments)"""
+    with _PENDING_LOCK:
+        pending = _PENDING.get(key_name, 0)
+    return int(ini.read_single_ini_value('Statistics', key_name)) + pending
+
+
+def flush(background=False):
+    """Writes all pending counter increments to the ini using a single (atomic) write"""
+    if background is True:
+        flush_thread = threading.Thread(target=flush, name='usage_statistics_flush')
+        flush_thread.daemon = True
+        flush_thread.start()
+        return
+
+    with _FLUSH_LOCK:
+        with _PENDING_LOCK:
+            pending = dict(_PENDING)
+            _PENDING.clear()
+        if not pending:
+            return
+
+        tools.debug_output(__name__, 'flush', 'Writing statistics: '+str(pending), 1)
+        try:
+            values = {}
+            for key_name, amount in pending.items():
+                values[key_name] = int(ini.read_single_ini_value('Statistics', key_name)) + amount
+            ini.write_multiple_ini_values('Statistics', values)
+        except (IOError, OSError):
+            tools.debug_output(__name__, 'flush', 'Writing statistics failed, keeping them for the next try', 3)
+            with _PENDING_LOCK: # re-queue the increments
+                for key_name, amount in pending.items():
+                    _PENDING[key_name] = _PENDING.get(key_name, 0) + amount
+
+
+def start_flush_timer(interval=FLUSH_INTERVAL):
+    """Starts a background timer which flushes the pending counters periodically"""
+    global _FLUSH_TIMER # pylint:disable=global-statement
+
+    def on_flush_timer():
+        """Flush and re-arm the timer"""
+        flush()
+        if _FLUSH_TIMER is not None: # timer was not stopped in the meantime
+            start_flush_timer(interval)
+
+    _FLUSH_TIMER = threading.Timer(interval, on_flush_timer)
+    _FLUSH_TIMER.daemon = True
+    _FLUSH_TIMER.start()
+
+
+def stop_flush_timer():
+    """Stops the periodic flush timer"""
+    global _FLUSH_TIMER # pylint:disable=global-statement
+    if _FLUSH_TIMER is not None:
+        _FLUSH_TIMER.cancel()
+        _FLUSH_TIMER = None
@@ -39,8 +39,7 @@ setup(
 
     install_requires=[
         #'wx>=3.0.0',
-        #'psutil>=5.0.0',
-        #'pyxdg>=0.25'
+        #'psutil>=5.0.0'
     ],
 
     ## See https://pypi.python.org/pypi?%3Aaction=list_classifiers
@@ -0,0 +1,56 @@
+#!/usr/bin/python
+"""Benchmark: difflib based ranking vs. scoring.top_k (usage: python tests/benchmark_scoring.py)"""
+
+import difflib
+import fnmatch
+import os
+import random
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'apparat_launcher'))
+import scoring # pylint:disable=wrong-import-position
+
+QUERIES = ('e', 'fi', 'fire', 'gnome', 'xdg-o')
+WORDS = ('gnome', 'fire', 'fox', 'terminal', 'xdg', 'open', 'config', 'settings', 'session', 'python', 'edit', 'view', 'tool', 'daemon')
+
+
+def generate_candidates(amount):
+    """Generates executable-like names (mix of known words and random chars)"""
+    rnd = random.Random(42)
+    candidates = set()
+    while len(candidates) < amount:
+        parts = [rnd.choice(WORDS) for _ in range(rnd.randint(1, 3))]
+        parts.append(''.join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(0, 6))))
+        candidates.add(rnd.choice(('-', '_', '.', '')).join(p for p in parts if p))
+    return sorted(candidates)
+
+
+def rank_difflib(query, candidates):
+    """Current implementation: filter + sort all matches by difflib ratio"""
+    results = fnmatch.filter(candidates, '*'+query+'*')
+    return sorted(results, key=lambda x: difflib.SequenceMatcher(None, x, query).ratio(), reverse=True)
+
+
+def rank_scoring(query, candidates):
+    """New implementation: filter + bounded top-K"""
+    results = fnmatch.filter(candidates, '*'+query+'*')
+    return scoring.top_k(query, results)[0]
+
+
+def main():
+    """Runs the benchmark"""
+    print('{:>8} {:>8} {:>9} {:>12} {:>12} {:>8}'.format('N', 'query', 'matches', 'difflib ms', 'top_k ms', 'speedup'))
+    for amount in (5000, 100000):
+        candidates = generate_candidates(amount)
+        for query in QUERIES:
+            matches = len(fnmatch.filter(candidates, '*'+query+'*'))
+            repeat = 3 if amount > 5000 else 10
+            time_difflib = min(timeit.repeat(lambda: rank_difflib(query, candidates), number=1, repeat=repeat)) * 1000
+            time_scoring = min(timeit.repeat(lambda: rank_scoring(query, candidates), number=1, repeat=repeat)) * 1000
+            print('{:>8} {:>8} {:>9} {:>12.1f} {:>12.1f} {:>7.1f}x'.format(amount, query, matches, time_difflib, time_scoring, time_difflib / time_scoring))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/python
+"""Tests: content index cache (paths which are no utf-8)"""
+
+import collections
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'apparat_launcher'))
+import content_index # pylint:disable=wrong-import-position
+
+
+class TestSaveCache(unittest.TestCase):
+
+    """content_index.save_cache & load_cache"""
+
+    def setUp(self):
+        """Points the cache to a temporary directory & starts with an empty index"""
+        self.directory = tempfile.mkdtemp()
+        self.cache_path = content_index.CACHE_PATH
+        content_index.CACHE_PATH = os.path.join(self.directory, 'content.index')
+        content_index._DOCUMENTS = [] # pylint:disable=protected-access
+        content_index._DOCUMENT_IDS = {} # pylint:disable=protected-access
+        content_index._POSTINGS = collections.defaultdict(dict) # pylint:disable=protected-access
+
+
+    def tearDown(self):
+        """Removes the temporary directory"""
+        content_index.CACHE_PATH = self.cache_path
+        shutil.rmtree(self.directory)
+
+
+    def test_path_no_utf8(self):
+        """A path which is no utf-8 is left out - the other documents are written & no temporary file stays behind"""
+        content_index.add_document('/home/user/notes.txt', 1.5, 10, {u'apparat': 2, u'launcher': 1})
+        content_index.add_document(b'/home/user/caf\xe9.txt', 2.5, 20, {u'apparat': 1})
+        content_index.save_cache()
+        self.assertEqual(os.listdir(self.directory), ['content.index'])
+
+        self.assertTrue(content_index.load_cache())
+        self.assertEqual(content_index.search('apparat'), (['/home/user/notes.txt'], 1))
+        self.assertEqual(content_index.search('launcher'), (['/home/user/notes.txt'], 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/python
+"""Tests: fuzzy scorer & bounded top-K selection"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'apparat_launcher'))
+import scoring # pylint:disable=wrong-import-position
+
+
+class TestTopK(unittest.TestCase):
+
+    """scoring.top_k"""
+
+    def test_best_first(self):
+        """Prefix & consecutive matches beat scattered ones, non-matching candidates are counted out"""
+        results, match_count = scoring.top_k('fire', ['xfxixrxe', 'firefox', 'gnome-terminal', 'wireshark'])
+        self.assertEqual(results, ['firefox', 'xfxixrxe'])
+        self.assertEqual(match_count, 2)
+
+
+    def test_ties_beyond_limit(self):
+        """Equally scored candidates are kept in the order of the result - shortest, then alphabetical"""
+        self.assertEqual(scoring.top_k('a', ['ae', 'ad', 'ac', 'ab'], limit=2), (['ab', 'ac'], 4))
+        self.assertEqual(scoring.top_k('', ['abc', 'zz', 'ab', 'b'], limit=3), (['b', 'ab', 'zz'], 4))
+
+
+    def test_ties_by_scored_text(self):
+        """The length tie-break uses the scored text (key), not the candidate"""
+        candidates = ['/a/very/long/path/b.pdf', '/x/abc.pdf', '/a.pdf']
+        self.assertEqual(scoring.top_k('', candidates, limit=2, key=os.path.basename)[0], ['/a.pdf', '/a/very/long/path/b.pdf'])
+
+
+    def test_bonus(self):
+        """The bonus lifts a candidate over an equally scored one"""
+        results, _ = scoring.top_k('a', ['ab', 'ac'], bonus=lambda candidate: 5 if candidate == 'ac' else 0)
+        self.assertEqual(results, ['ac', 'ab'])
+
+
+if __name__ == '__main__':
+    unittest.main()
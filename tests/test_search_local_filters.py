@@ -0,0 +1,173 @@
+#!/usr/bin/python
+"""Tests: metadata filters of the local search (filter parsing, typed index columns, delta index of rescans, refresh of files written in place)"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'apparat_launcher'))
+import file_crawler # pylint:disable=wrong-import-position
+import file_index # pylint:disable=wrong-import-position
+import plugin_search_local # pylint:disable=wrong-import-position
+import trigram_index # pylint:disable=wrong-import-position
+
+HOME = '/home/user'
+NOW = time.time()
+DAY = 86400
+OLD_MTIME = int(NOW - 400 * DAY) # whole seconds - utime is not exact for fractions
+
+
+def build_directories():
+    """Returns a directory table {directory: [mtime, [subdirectory names], [file names], [file sizes], [file mtimes]]} - no filesystem needed"""
+    return {
+        HOME: [NOW, ['docs'], ['notes.txt'], [10], [NOW - 2 * DAY]],
+        HOME+'/docs': [NOW - 30 * DAY, ['reports'], ['Report.PDF', 'big.pdf', 'report_old.pdf'], [2048, 5 * 1024 ** 2, 512], [NOW - DAY, NOW - 3 * DAY, NOW - 400 * DAY]],
+        HOME+'/docs/reports': [NOW - 10 * DAY, [], [], [], []],
+    }
+
+
+class TestParseFilters(unittest.TestCase):
+
+    """plugin_search_local.parse_filters"""
+
+    def test_example_query(self):
+        """Name query & all filters of the example in the README"""
+        name, filters = plugin_search_local.parse_filters('report ext:pdf modified:<7d size:>1M')
+        self.assertEqual(name, 'report')
+        self.assertEqual(filters['extension'], set(['pdf']))
+        self.assertEqual(filters['size'], (1024 ** 2, None))
+        self.assertIsNone(filters['mtime'][1])
+        self.assertAlmostEqual(filters['mtime'][0], time.time() - 7 * DAY, delta=60)
+
+
+    def test_without_filters(self):
+        """A search string without filters stays as it is"""
+        self.assertEqual(plugin_search_local.parse_filters('my  file:name'), ('my  file:name', {}))
+
+
+    def test_ranges_intersect(self):
+        """Several bounds of the same column narrow each other, extensions add up, type & dates are parsed"""
+        name, filters = plugin_search_local.parse_filters('size:>1k size:<1M size:>2k ext:.PDF,doc ext:txt type:dir modified:>2017-06-01')
+        self.assertEqual(name, '')
+        self.assertEqual(filters['size'], (2048, 1024 ** 2))
+        self.assertEqual(filters['extension'], set(['pdf', 'doc', 'txt']))
+        self.assertTrue(filters['is_dir'])
+        self.assertEqual(filters['mtime'], (time.mktime(time.strptime('2017-06-01', '%Y-%m-%d')), None))
+
+
+    def test_invalid_filters(self):
+        """Filters with an invalid value raise ValueError"""
+        for search_string in ('size:1M', 'size:>1X', 'type:link', 'modified:<7m', 'modified:>2017-13-01', 'ext:,'):
+            self.assertRaises(ValueError, plugin_search_local.parse_filters, search_string)
+
+
+class TestFilterIds(unittest.TestCase):
+
+    """file_index.build_lookup_tables, update_lookup_tables & filter_ids (via file_index.search)"""
+
+    def setUp(self):
+        """Builds the index from the directory table"""
+        file_index.build_lookup_tables(build_directories())
+
+
+    def search(self, query, filters):
+        """Returns the sorted matches (relative to HOME)"""
+        return sorted(os.path.relpath(path, HOME) for path in file_index.search(query, filters))
+
+
+    def test_columns(self):
+        """The columns are typed arrays aligned with the paths - the root of the index is no entry"""
+        (paths, _, columns, _, owners), _, _ = file_index._FILES # pylint:disable=protected-access
+        self.assertEqual(len(owners), len(paths))
+        self.assertEqual(len(paths), 6)
+        for column, typecode in file_index.COLUMNS.items():
+            self.assertEqual(columns[column].typecode, typecode)
+            self.assertEqual(len(columns[column]), len(paths))
+        self.assertEqual(columns['size'][paths.index(HOME+'/docs/big.pdf')], 5 * 1024 ** 2)
+        self.assertEqual(columns['is_dir'][paths.index(HOME+'/docs')], 1)
+
+
+    def test_filters(self):
+        """Every filter alone & combined"""
+        self.assertEqual(self.search('report', {}), ['docs/Report.PDF', 'docs/report_old.pdf', 'docs/reports'])
+        self.assertEqual(self.search('report', {'extension': set(['pdf'])}), ['docs/Report.PDF', 'docs/report_old.pdf'])
+        self.assertEqual(self.search('report', {'is_dir': True}), ['docs/reports'])
+        self.assertEqual(self.search('', {'size': (1024 ** 2, None)}), ['docs/big.pdf'])
+        self.assertEqual(self.search('', {'is_dir': False, 'mtime': (NOW - 7 * DAY, None)}), ['docs/Report.PDF', 'docs/big.pdf', 'notes.txt'])
+        self.assertEqual(self.search('', {'extension': set(['pdf']), 'size': (None, 4096), 'mtime': (NOW - 7 * DAY, None)}), ['docs/Report.PDF'])
+        self.assertEqual(self.search('report', {'extension': set(['doc'])}), [])
+
+
+    def test_delta(self):
+        """Changed & removed directories replace their rows of the base index - the base index is not rebuilt"""
+        base = file_index._FILES[0] # pylint:disable=protected-access
+        directories = build_directories()
+        directories[HOME+'/docs'] = [NOW, [], ['Report.PDF', 'report_new.pdf'], [4096, 100], [NOW, NOW]]
+        del directories[HOME+'/docs/reports']
+        file_index.update_lookup_tables(directories, set([HOME+'/docs', HOME+'/docs/reports']))
+        self.assertIs(file_index._FILES[0], base) # pylint:disable=protected-access
+        self.assertEqual(self.search('report', {}), ['docs/Report.PDF', 'docs/report_new.pdf'])
+        self.assertEqual(self.search('', {'size': (4000, 5000)}), ['docs/Report.PDF'])
+        self.assertEqual(sorted(file_index.get_files()), [(HOME+'/docs/Report.PDF', 4096, NOW), (HOME+'/docs/report_new.pdf', 100, NOW), (HOME+'/notes.txt', 10, NOW - 2 * DAY)])
+
+        directories[HOME+'/docs/new'] = [NOW, [], [], [], []]
+        directories[HOME+'/docs'][1].append('new')
+        file_index.update_lookup_tables(directories, set([HOME+'/docs', HOME+'/docs/new'])) # pending directories add up
+        self.assertEqual(self.search('', {'is_dir': True}), ['docs', 'docs/new'])
+        self.assertEqual(self.search('report', {}), ['docs/Report.PDF', 'docs/report_new.pdf'])
+
+
+class TestStreamMatching(unittest.TestCase):
+
+    """trigram_index.matches - the streaming search during the initial crawl matches like the index"""
+
+    def test_same_as_index(self):
+        """Short queries match word starts (separators & camelCase), longer ones substrings"""
+        names = ['report_old.pdf', 'Report.PDF', 'myReport.txt', 'sport.txt', 'notes.txt', 'a-b c.md']
+        index = trigram_index.TrigramIndex(names)
+        for query in ('', 'r', 'RE', 'po', 'pd', 'b', 'c', 'port', 'ORT.', 'xyz'):
+            self.assertEqual([name for name in names if trigram_index.matches(query, name)], [names[name_id] for name_id in index.search(query)], query)
+
+
+class TestCrawlRefresh(unittest.TestCase):
+
+    """file_crawler.crawl - files written in place do not change the mtime of their directory"""
+
+    def setUp(self):
+        """Creates a directory with a file"""
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'old_report.pdf')
+        with open(self.path, 'w') as test_file:
+            test_file.write('x')
+        os.utime(self.path, (OLD_MTIME, OLD_MTIME))
+        os.utime(self.root, (OLD_MTIME, OLD_MTIME))
+
+
+    def tearDown(self):
+        """Removes the directory"""
+        shutil.rmtree(self.root)
+
+
+    def test_file_written_in_place(self):
+        """A rescan selecting the directory (restat) picks up the new size & mtime of a file although the directory was not listed again"""
+        directories, _ = file_crawler.crawl(self.root, {}, lambda path: False)
+        self.assertEqual(directories[self.root][3:], [[1], [OLD_MTIME]])
+        self.assertEqual(file_crawler.crawl(self.root, directories, lambda path: False)[1], set())
+
+        with open(self.path, 'a') as test_file:
+            test_file.write('more')
+        os.utime(self.root, (OLD_MTIME, OLD_MTIME)) # as if written in place
+
+        self.assertEqual(file_crawler.crawl(self.root, directories, lambda path: False)[0][self.root][3], [1]) # not selected for an lstat - unchanged directories are not listed again
+        refreshed, changed = file_crawler.crawl(self.root, directories, lambda path: False, restat=lambda directory: True)
+        self.assertEqual(changed, set([self.root]))
+        self.assertEqual(refreshed[self.root][3], [5])
+        self.assertGreater(refreshed[self.root][4][0], NOW - DAY)
+        self.assertEqual(directories[self.root][3], [1]) # the old table stays untouched
+
+
+if __name__ == '__main__':
+    unittest.main()